@@ -0,0 +1,14 @@
+"""
+Focus Buddy benchmarks.
+
+Run from the repository root, e.g. `python -m benchmarks.bench_parse`.
+The agent modules live in src/ and import each other by bare name, so
+that directory is put on sys.path here.
+"""
+
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
@@ -0,0 +1,94 @@
+"""
+End-to-end agent benchmark against the local ScriptedModel (no network).
+
+Runs whole plans through main.run_focus_buddy and the real ADK runner, with
+the stub model standing in for Gemini at a fixed latency per model turn.
+Reports p50/p95/p99 plan latency and throughput at each concurrency level,
+model turns per plan, and runner overhead (plan time not spent in the model).
+
+    python -m benchmarks.bench_agent [--sessions 50] [--concurrency 1 8 32] [--latency-ms 50]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import time
+
+from benchmarks import SRC_DIR  # noqa: F401  (puts src/ on sys.path)
+from benchmarks.harness import latency_summary
+from stub_model import STUB_MODEL_NAME
+
+import main
+
+os.environ.setdefault("FOCUS_BUDDY_MODEL", STUB_MODEL_NAME)
+
+BACKLOG = """
+- Review pull requests (20 min)
+- Write unit tests for auth module
+- Update documentation due: today
+- Reply to 3 urgent emails (15 min)
+- Plan sprint retrospective
+"""
+
+
+async def _plan(mode: str, n: int) -> float:
+    start = time.perf_counter()
+    await main.run_focus_buddy(BACKLOG, available_minutes=30, fast_path=(mode == "fast"),
+                               session_id=f"bench-{mode}-{n}")
+    return time.perf_counter() - start
+
+
+async def _level(mode: str, sessions: int, concurrency: int):
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one(n: int) -> float:
+        async with limit:
+            return await _plan(mode, n)
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(one(n) for n in range(sessions)))
+    return latencies, time.perf_counter() - start
+
+
+def _model_turns() -> int:
+    """Model turns taken so far, counting turns coalesced by the gateway
+    (identical concurrent plans share one upstream call)."""
+    gateway = main.get_gateway()
+    return gateway.upstream_calls + gateway.coalesced
+
+
+async def _run(sessions: int, concurrency, latency_ms: float) -> dict:
+    results = {}
+    for mode in ("agent", "fast"):
+        for level in concurrency:
+            calls_before = _model_turns()
+            with contextlib.redirect_stdout(io.StringIO()):
+                latencies, wall = await _level(mode, sessions, level)
+            turns = (_model_turns() - calls_before) / sessions
+            summary = latency_summary(latencies)
+            summary["throughput_plans_per_sec"] = sessions / wall
+            summary["model_turns_per_plan"] = turns
+            summary["runner_overhead_ms"] = summary["mean_ms"] - turns * latency_ms
+            results[f"{mode}_c{level}"] = summary
+    return results
+
+
+def run(sessions: int = 50, concurrency=(1, 8, 32), latency_ms: float = 50.0) -> dict:
+    main.get_model().latency_seconds = latency_ms / 1000
+    return asyncio.run(_run(sessions, concurrency, latency_ms))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+    print(f"{'case':10s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} {'plans/s':>8s} "
+          f"{'turns':>6s} {'overhead ms':>12s}")
+    for case, r in run(args.sessions, args.concurrency, args.latency_ms).items():
+        print(f"{case:10s} {r['p50_ms']:8.1f} {r['p95_ms']:8.1f} {r['p99_ms']:8.1f} "
+              f"{r['throughput_plans_per_sec']:8.1f} {r['model_turns_per_plan']:6.1f} "
+              f"{r['runner_overhead_ms']:12.2f}")
@@ -0,0 +1,78 @@
+"""
+Batch planning throughput at 1, 4 and 16 worker processes.
+
+Writes a JSONL file of synthetic per-user backlogs and runs batch.run_batch
+over it, once with the local pipeline only and once with the stub model
+phrasing every plan (needs google-adk; each model turn takes --latency-ms).
+The plan cache is cleared before each run so every plan is phrased.
+
+    python -m benchmarks.bench_batch [--records 5000] [--workers 1 4 16] [--latency-ms 50]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+
+from benchmarks import SRC_DIR  # noqa: F401  (puts src/ on sys.path)
+from benchmarks.bench_shortlist import make_backlog
+
+import batch
+import main
+
+# stub_model.STUB_MODEL_NAME; not imported, so the local runs work without google-adk
+os.environ.setdefault("FOCUS_BUDDY_MODEL", "stub-focus-buddy")
+
+
+def write_records(path: str, n: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        for i in range(n):
+            record = {"user": f"user{i % 1000}", "raw_text": make_backlog(rng.randint(3, 30), seed=i),
+                      "available_minutes": rng.choice((30, 60, 120, 240))}
+            f.write(json.dumps(record) + "\n")
+
+
+def run(records: int = 5_000, workers=(1, 4, 16), latency_ms: float = 50.0,
+        model_concurrency: int = 32, present_records: int = 500) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = [("local", records, False)]
+        try:
+            main.get_model().latency_seconds = latency_ms / 1000
+            cases.append(("present", present_records, True))
+        except ImportError as e:
+            print(f"skipping present: {e}")
+        for mode, n, present in cases:
+            input_path = os.path.join(tmp, f"{mode}.jsonl")
+            write_records(input_path, n)
+            for level in workers:
+                output_path = os.path.join(tmp, f"{mode}-{level}.out.jsonl")
+                main.get_plan_cache().clear()
+                stats = asyncio.run(batch.run_batch(input_path, output_path, workers=level,
+                                                    present=present, model_concurrency=model_concurrency))
+                results[f"{mode}_w{level}"] = {
+                    "records": n,
+                    "seconds": stats.seconds,
+                    "records_per_sec": stats.records_per_sec,
+                    "errors": stats.errors,
+                }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=5_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--model-concurrency", type=int, default=32)
+    parser.add_argument("--present-records", type=int, default=500,
+                        help="records in the model-phrased runs")
+    args = parser.parse_args()
+    print(f"{os.cpu_count()} CPUs")
+    print(f"{'case':12s} {'records':>8s} {'seconds':>8s} {'records/s':>10s} {'errors':>7s}")
+    for case, r in run(args.records, args.workers, args.latency_ms, args.model_concurrency,
+                       args.present_records).items():
+        print(f"{case:12s} {r['records']:8d} {r['seconds']:8.2f} {r['records_per_sec']:10.0f} {r['errors']:7d}")
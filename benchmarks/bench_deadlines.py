@@ -0,0 +1,75 @@
+"""
+Deadline resolution throughput and the cost of deadline-first ordering.
+
+Resolves a large batch of deadline tokens (relative words, weekdays, clock
+times, dates and junk, in a realistic mix) through the memoized
+resolve_deadline and through a resolver built fresh for every token (no
+lookup table reuse), then times prioritize_tasks with order="score", "edf"
+and "slack" on a List[Task] and a TaskTable.
+
+    python -m benchmarks.bench_deadlines [--tokens 1000000] [--tasks 100000]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime
+
+from benchmarks import SRC_DIR  # noqa: F401  (puts src/ on sys.path)
+from deadlines import DeadlineResolver, resolve_deadline
+from task_table import TaskTable
+from tools import Task, prioritize_tasks
+
+TOKENS = (
+    ["today"] * 6 + ["tomorrow"] * 4 + ["asap", "eod", "soon", "next"]
+    + ["Monday", "friday", "Wed", "thurs."] * 2
+    + ["5pm", "9:30am", "17:00", "2026-11-01", "10/31", "whenever", "Q4"]
+)
+
+
+def make_tokens(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [rng.choice(TOKENS) for _ in range(n)]
+
+
+def _per_sec(n: int, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return n / (time.perf_counter() - start)
+
+
+def run(n_tokens: int = 1_000_000, n_tasks: int = 100_000) -> dict:
+    now = datetime.now()
+    tokens = make_tokens(n_tokens)
+    fresh = tokens[:n_tokens // 10]
+    results = {
+        "resolve": {
+            "memoized_tokens_per_sec": _per_sec(
+                n_tokens, lambda: [resolve_deadline(t, now) for t in tokens]),
+            "fresh_resolver_tokens_per_sec": _per_sec(
+                len(fresh), lambda: [DeadlineResolver(now.date()).resolve(t, now) for t in fresh]),
+        }
+    }
+
+    rng = random.Random(1)
+    deadlines = [""] * 4 + TOKENS
+    tasks = [Task(title=f"Task {i}", deadline=rng.choice(deadlines),
+                  estimated_minutes=rng.choice((5, 10, 15, 30, 60)))
+             for i in range(n_tasks)]
+    table = TaskTable.from_tasks(tasks)
+    for order in ("score", "edf", "slack"):
+        results[f"prioritize_{order}"] = {
+            "list_tasks_per_sec": _per_sec(n_tasks, lambda: prioritize_tasks(tasks, order=order, now=now)),
+            "table_tasks_per_sec": _per_sec(n_tasks, lambda: prioritize_tasks(table, order=order, now=now)),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=1_000_000)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    args = parser.parse_args()
+    for case, metrics in run(args.tokens, args.tasks).items():
+        for name, value in metrics.items():
+            print(f"{case:18s} {name:32s} {value:>14,.0f}")
@@ -0,0 +1,176 @@
+"""
+Near-duplicate merging: MinHash/LSH speed and accuracy on a synthetic backlog.
+
+Builds a backlog in which some tasks are reworded copies of others (case,
+"the", punctuation, plurals, typos) with known ground-truth groups, then
+times duplicate_groups and reports pair precision/recall against the
+truth. On a subset it also runs the O(n^2) all-pairs comparison, to show
+what the LSH candidate stage misses and to extrapolate its cost.
+
+    python -m benchmarks.bench_dedup [--tasks 100000] [--brute-force 2000]
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+
+from benchmarks import SRC_DIR  # noqa: F401  (puts src/ on sys.path)
+from dedup import (DEFAULT_DEDUPE_THRESHOLD, DEFAULT_NUM_PERM, duplicate_groups, lsh_bands, same_words,
+                   shingles, title_numbers, title_words)
+
+VERBS = ("Review", "Update", "Fix", "Write", "Deploy", "Reply to", "Plan", "Prepare",
+         "Refactor", "Test", "Draft", "Schedule", "Clean up", "Document", "Investigate")
+OBJECTS = ("login bug", "billing service", "auth module", "release notes", "Q4 roadmap",
+           "onboarding flow", "search index", "pull requests", "design doc", "sprint retro",
+           "customer email", "slide deck", "budget sheet", "API docs", "error alerts",
+           "cache layer", "mobile build", "data export", "team survey", "hiring plan")
+QUALIFIERS = ("for Sarah", "for the demo", "before Friday", "with Sam", "for marketing",
+              "for the board", "in staging", "for mobile", "for v2", "with design",
+              "for finance", "for support", "on the wiki", "for legal", "in prod")
+
+
+def _variant(title: str, rng: random.Random) -> str:
+    words = title.split()
+    for _ in range(rng.randint(1, 2)):
+        edit = rng.randrange(5)
+        if edit == 0:
+            words = [w.lower() for w in words]
+        elif edit == 1 and "the" not in words:
+            words.insert(1, "the")
+        elif edit == 2:
+            words[-1] += rng.choice((".", "!", " asap"))
+        elif edit == 3 and not words[-1].endswith("s"):
+            words[-1] += "s"
+        else:
+            i = rng.randrange(len(words))
+            word = words[i]
+            if len(word) > 3:
+                j = rng.randrange(1, len(word) - 1)
+                words[i] = word[:j] + word[j + 1] + word[j] + word[j + 2:]
+    return " ".join(words)
+
+
+def make_titles(n: int, duplicate_rate: float = 0.3, seed: int = 0):
+    """n titles and their ground-truth group ids; about duplicate_rate of
+    them are reworded copies of an earlier title."""
+    rng = random.Random(seed)
+    titles, truth = [], []
+    bases = []
+    for _ in range(n):
+        if bases and rng.random() < duplicate_rate:
+            group = rng.randrange(len(bases))
+            titles.append(_variant(bases[group], rng))
+        else:
+            group = len(bases)
+            # A ticket number keeps unrelated bases with the same words apart
+            bases.append(f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(QUALIFIERS)} "
+                         f"#{rng.randrange(10 * n)}")
+            titles.append(bases[group])
+        truth.append(group)
+    return titles, truth
+
+
+def brute_force_groups(titles, threshold: float = DEFAULT_DEDUPE_THRESHOLD):
+    """Every pair compared directly: the exact answer duplicate_groups approximates."""
+    sets = [shingles(t) for t in titles]
+    numbers = [title_numbers(t) for t in titles]
+    words = [title_words(t) for t in titles]
+    parent = list(range(len(titles)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(len(titles)):
+        for j in range(i):
+            a, b = sets[i], sets[j]
+            if (numbers[i] == numbers[j] and len(a & b) >= threshold * len(a | b)
+                    and same_words(words[i], words[j])):
+                parent[find(i)] = find(j)
+    groups = {}
+    for i in range(len(titles)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+def _pairs(sizes) -> int:
+    return sum(n * (n - 1) // 2 for n in sizes)
+
+
+def pair_scores(groups, truth) -> dict:
+    """Precision and recall over the pairs of titles placed in one group."""
+    label = {}
+    for g, members in enumerate(groups):
+        for i in members:
+            label[i] = g
+    predicted = _pairs(len(members) for members in groups)
+    actual = _pairs(Counter(truth[i] for i in label).values())
+    both = _pairs(Counter((label[i], truth[i]) for i in label).values())
+    return {
+        "precision": both / predicted if predicted else 1.0,
+        "recall": both / actual if actual else 1.0,
+    }
+
+
+def run(n_tasks: int = 100_000, brute_force: int = 2_000,
+        thresholds=(0.5, DEFAULT_DEDUPE_THRESHOLD, 0.7, 0.8), num_perm: int = DEFAULT_NUM_PERM) -> dict:
+    titles, truth = make_titles(n_tasks)
+    results = {}
+    for threshold in thresholds:
+        start = time.perf_counter()
+        groups = duplicate_groups(titles, threshold, num_perm)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        bands, rows = lsh_bands(threshold, num_perm)
+        results[f"threshold_{threshold}"] = {
+            "ms": elapsed_ms,
+            "bands": bands,
+            "rows": rows,
+            "tasks_after": len(groups),
+            **pair_scores(groups, truth),
+        }
+
+    sub_titles, sub_truth = titles[:brute_force], truth[:brute_force]
+    start = time.perf_counter()
+    exact = brute_force_groups(sub_titles)
+    exact_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    approx = duplicate_groups(sub_titles)
+    approx_ms = (time.perf_counter() - start) * 1000
+    exact_pairs = _pairs(len(g) for g in exact)
+    # LSH recall relative to the exact all-pairs answer (same similarity rule)
+    label = {i: g for g, members in enumerate(approx) for i in members}
+    found = _pairs(Counter((label[i], g) for g, members in enumerate(exact) for i in members).values())
+    results["brute_force"] = {
+        "tasks": brute_force,
+        "ms": exact_ms,
+        "lsh_ms": approx_ms,
+        "lsh_recall_vs_exact": found / exact_pairs if exact_pairs else 1.0,
+        "exact_truth": pair_scores(exact, sub_truth),
+        "extrapolated_ms": exact_ms * (n_tasks / brute_force) ** 2,
+    }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--brute-force", type=int, default=2_000,
+                        help="subset size for the all-pairs comparison")
+    parser.add_argument("--num-perm", type=int, default=DEFAULT_NUM_PERM)
+    args = parser.parse_args()
+    results = run(args.tasks, args.brute_force, num_perm=args.num_perm)
+    exact = results.pop("brute_force")
+    print(f"{args.tasks:,} tasks, {args.num_perm} hashes")
+    print(f"{'threshold':>9s} {'bands x rows':>12s} {'ms':>9s} {'tasks after':>11s} "
+          f"{'precision':>9s} {'recall':>7s}")
+    for case, r in results.items():
+        print(f"{case[10:]:>9s} {r['bands']:>6d} x {r['rows']:<3d} {r['ms']:9.1f} "
+              f"{r['tasks_after']:>11,} {r['precision']:9.3f} {r['recall']:7.3f}")
+    print(f"\nall pairs on {exact['tasks']:,} tasks: {exact['ms']:.0f} ms "
+          f"(LSH {exact['lsh_ms']:.0f} ms, finds {exact['lsh_recall_vs_exact']:.1%} of the same pairs); "
+          f"about {exact['extrapolated_ms'] / 1000:,.0f} s for all {args.tasks:,}")
+    print(f"all pairs vs truth: precision {exact['exact_truth']['precision']:.3f}, "
+          f"recall {exact['exact_truth']['recall']:.3f}")
@@ -0,0 +1,118 @@
+"""
+Model gateway: upstream calls saved by coalescing, and queue waits by priority.
+
+    coalesce  N concurrent identical calls (and N distinct ones for contrast)
+              through model_gateway.ModelGateway to a fake upstream that
+              counts its calls and streams a few chunks
+    priority  a burst of batch calls, then interactive calls arriving behind
+              them, under a token-bucket limit; interactive calls should
+              wait far less than the batch calls ahead of them
+    stub      N concurrent presenter runs of the same plan through the real
+              ADK runner, counted by the stub model's call counter (needs
+              google-adk)
+
+    python -m benchmarks.bench_gateway [--calls 100] [--rpm 1200] [--batch 60] [--interactive 10]
+"""
+
+import argparse
+import asyncio
+import os
+import uuid
+
+from benchmarks import SRC_DIR  # noqa: F401  (puts src/ on sys.path)
+
+import main
+from model_gateway import BATCH, INTERACTIVE, ModelGateway, model_priority
+
+# stub_model.STUB_MODEL_NAME; not imported, so the pure gateway runs work without google-adk
+os.environ.setdefault("FOCUS_BUDDY_MODEL", "stub-focus-buddy")
+
+PLAN = "1. 09:00-09:20 Review pull requests (20 min)\n2. 09:20-09:35 Reply to urgent emails (15 min)"
+
+
+class CountingUpstream:
+    """Fake streaming model: counts calls, answers in chunks after a delay."""
+
+    def __init__(self, latency_seconds: float = 0.05, chunks: int = 3):
+        self.latency_seconds = latency_seconds
+        self.chunks = chunks
+        self.calls = 0
+
+    async def generate(self, prompt: str):
+        self.calls += 1
+        await asyncio.sleep(self.latency_seconds)
+        for i in range(self.chunks):
+            yield f"{prompt} chunk {i}"
+
+
+async def _collect(gateway: ModelGateway, upstream: CountingUpstream, prompt: str, priority: int):
+    with model_priority(priority):
+        return [item async for item in gateway.call(prompt, lambda: upstream.generate(prompt))]
+
+
+async def _coalesce(calls: int, latency_ms: float) -> dict:
+    results = {}
+    for case in ("identical", "distinct"):
+        gateway, upstream = ModelGateway(), CountingUpstream(latency_ms / 1000)
+        prompts = ["same prompt" if case == "identical" else f"prompt {n}" for n in range(calls)]
+        answers = await asyncio.gather(*(_collect(gateway, upstream, p, INTERACTIVE) for p in prompts))
+        complete = all(len(answer) == upstream.chunks for answer in answers)
+        results[case] = {"callers": calls, "upstream_calls": upstream.calls,
+                         "coalesced": gateway.coalesced, "all_answered": complete}
+    return results
+
+
+async def _priority(rpm: float, batch: int, interactive: int) -> dict:
+    gateway, upstream = ModelGateway(requests_per_minute=rpm, burst=1), CountingUpstream(0.0, 1)
+    tasks = [asyncio.ensure_future(_collect(gateway, upstream, f"batch {n}", BATCH)) for n in range(batch)]
+    await asyncio.sleep(0.1)  # let the batch calls queue up first
+    tasks += [asyncio.ensure_future(_collect(gateway, upstream, f"interactive {n}", INTERACTIVE))
+              for n in range(interactive)]
+    await asyncio.gather(*tasks)
+    return gateway.stats()["queue_wait"]
+
+
+async def _stub(calls: int) -> dict:
+    model = main.get_model()
+    runner = main.get_presenter_runner()
+    prompt = main.presenter_prompt(PLAN, 35, "medium")
+    gateway = main.get_gateway()
+    before, coalesced_before = model.calls, gateway.coalesced
+    answers = await asyncio.gather(*(main.run_prompt(runner, prompt, "bench", uuid.uuid4().hex)
+                                     for _ in range(calls)))
+    return {"callers": calls, "upstream_calls": model.calls - before,
+            "coalesced": gateway.coalesced - coalesced_before, "all_answered": all(answers)}
+
+
+def run(calls: int = 100, latency_ms: float = 50.0, rpm: float = 1200, batch: int = 60,
+        interactive: int = 10) -> dict:
+    results = asyncio.run(_coalesce(calls, latency_ms))
+    results.update(asyncio.run(_priority(rpm, batch, interactive)))
+    try:
+        main.get_model().latency_seconds = latency_ms / 1000
+    except ImportError as e:
+        print(f"skipping stub: {e}")
+    else:
+        results["stub"] = asyncio.run(_stub(calls))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100, help="concurrent callers in coalesce/stub")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="upstream latency per call")
+    parser.add_argument("--rpm", type=float, default=1200, help="rate limit in the priority run")
+    parser.add_argument("--batch", type=int, default=60)
+    parser.add_argument("--interactive", type=int, default=10)
+    args = parser.parse_args()
+    results = run(args.calls, args.latency_ms, args.rpm, args.batch, args.interactive)
+    print(f"{'case':12s} {'callers':>8s} {'upstream':>9s} {'coalesced':>10s} {'answered':>9s}")
+    for case in ("identical", "distinct", "stub"):
+        if case in results:
+            r = results[case]
+            print(f"{case:12s} {r['callers']:8d} {r['upstream_calls']:9d} {r['coalesced']:10d} "
+                  f"{str(r['all_answered']):>9s}")
+    print(f"\n{'priority':12s} {'count':>6s} {'p50 ms':>8s} {'p95 ms':>8s} {'max ms':>8s}")
+    for name in ("interactive", "batch"):
+        r = results[name]
+        print(f"{name:12s} {r['count']:6d} {r['p50_ms']:8.1f} {r['p95_ms']:8.1f} {r['max_ms']:8.1f}")
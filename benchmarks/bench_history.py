@@ -0,0 +1,101 @@
+"""
+History store: write throughput, request-path cost and indexed query latency.
+
+Writes plans (5 tasks each) and completions for many users through
+HistoryStore into a temporary directory, then times the check-in queries.
+Reports the caller-side cost of record_plan (a queue put), rows indexed per
+second by the background writer, and p50/p99 latency of carried_over and
+estimate_accuracy for single users at the final table size.
+
+    python -m benchmarks.bench_history [--rows 1000000] [--users 2000]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+
+from benchmarks import SRC_DIR  # noqa: F401  (puts src/ on sys.path)
+from benchmarks.harness import latency_summary
+from history_store import HistoryStore
+from tools import Task, ScheduledBlock
+
+TASKS_PER_PLAN = 5
+TITLES = 500  # distinct titles per user, so titles recur across sessions
+DURATIONS = (5, 10, 15, 20, 30, 45)
+
+
+class _Clock:
+    """Fake clock: each plan happens a few minutes after the previous one."""
+
+    def __init__(self):
+        self.now = time.time() - 365 * 86400
+
+    def __call__(self) -> float:
+        self.now += 180
+        return self.now
+
+
+def run(rows: int = 1_000_000, users: int = 2_000, queries: int = 200, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    plans = max(1, rows // TASKS_PER_PLAN)
+    put_times = []
+    with tempfile.TemporaryDirectory() as path:
+        # Room for every record, so none are dropped while the writer catches up
+        store = HistoryStore(path, batch_size=5_000, max_pending=2 * plans, clock=_Clock())
+        start = time.perf_counter()
+        for n in range(plans):
+            user_id = f"user{rng.randrange(users)}"
+            tasks = [Task(title=f"Task {rng.randrange(TITLES)}", estimated_minutes=rng.choice(DURATIONS))
+                     for _ in range(TASKS_PER_PLAN)]
+            schedule = [ScheduledBlock(0, tasks[0].estimated_minutes, tasks[0].title)]
+            t0 = time.perf_counter()
+            store.record_plan(user_id, f"s{n}", tasks, schedule, 25)
+            put_times.append(time.perf_counter() - t0)
+            if rng.random() < 0.5:
+                done = tasks[0]
+                store.record_completion(user_id, f"s{n}", done.title, done.estimated_minutes,
+                                        done.estimated_minutes + rng.randint(-3, 15))
+        enqueued = time.perf_counter() - start
+        store.flush()
+        written = time.perf_counter() - start
+        dropped = store.dropped
+
+        carried, accuracy = [], []
+        for _ in range(queries):
+            user_id = f"user{rng.randrange(users)}"
+            t0 = time.perf_counter()
+            store.carried_over(user_id, min_sessions=3)
+            carried.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            store.estimate_accuracy(user_id)
+            accuracy.append(time.perf_counter() - t0)
+        store.close()
+
+    return {
+        "record_plan": latency_summary(put_times),
+        "write": {
+            "task_rows": plans * TASKS_PER_PLAN,
+            "enqueue_s": enqueued,
+            "indexed_s": written,
+            "rows_per_sec": plans * TASKS_PER_PLAN / written,
+            "dropped": dropped,
+        },
+        "carried_over": latency_summary(carried),
+        "estimate_accuracy": latency_summary(accuracy),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=2_000)
+    args = parser.parse_args()
+    results = run(args.rows, args.users)
+    write = results.pop("write")
+    print(f"{write['task_rows']:,} task rows indexed in {write['indexed_s']:.1f}s "
+          f"({write['rows_per_sec']:,.0f} rows/s; enqueue finished at {write['enqueue_s']:.1f}s, "
+          f"{write['dropped']} records dropped)")
+    print(f"{'case':18s} {'p50 ms':>8s} {'p99 ms':>8s}")
+    for case, r in results.items():
+        print(f"{case:18s} {r['p50_ms']:8.3f} {r['p99_ms']:8.3f}")
@@ -0,0 +1,56 @@
+"""
+Import-time cost of the entry points, measured in fresh interpreters.
+
+"import main" is what a worker or test pays now that ADK, the model, the
+agents and the runners are built lazily. "eager build" imports main and then
+builds everything, which is what the old module-level setup did on import.
+
+    python -m benchmarks.bench_import [--repeats 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks import SRC_DIR
+
+CASES = {
+    "interpreter": "pass",
+    "import tools": "import tools",
+    "import main": "import main",
+    "import demo": "import demo",
+    "eager build": "import main; main.get_runner(); main.get_presenter_runner()",
+}
+
+
+def _time_snippet(code: str, repeats: int) -> float:
+    env = dict(os.environ, FOCUS_BUDDY_MODEL=os.environ.get("FOCUS_BUDDY_MODEL", "stub-focus-buddy"))
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def run(repeats: int = 5) -> dict:
+    results = {}
+    for name, code in CASES.items():
+        try:
+            results[name] = {"median_ms": _time_snippet(code, repeats) * 1000}
+        except subprocess.CalledProcessError as e:
+            results[name] = {"error": e.stderr.decode(errors="replace").strip().splitlines()[-1]}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    for name, r in run(args.repeats).items():
+        value = f"{r['median_ms']:8.1f} ms" if "median_ms" in r else r["error"]
+        print(f"{name:14s} {value}")
@@ -0,0 +1,86 @@
+"""
+Incremental re-planning vs. re-running prioritize + schedule from scratch.
+
+For each backlog size, times IncrementalPlanner.complete / insert /
+update_duration on a 60-minute window against the full recompute they
+replace (prioritize_tasks + create_focus_schedule over every pending task).
+
+    python -m benchmarks.bench_incremental [--ops 2000]
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks import SRC_DIR  # noqa: F401  (puts src/ on sys.path)
+from benchmarks.harness import latency_summary
+from incremental_planner import IncrementalPlanner
+from tools import Task, create_focus_schedule, prioritize_tasks
+
+SIZES = (100, 10_000, 100_000)
+DURATIONS = (5, 10, 10, 15, 20, 30, 45, 60)
+WINDOW = 60
+
+
+def make_tasks(n: int, rng: random.Random, start: int = 0):
+    return [Task(title=f"Task {i}", estimated_minutes=rng.choice(DURATIONS),
+                 deadline=rng.choice(["", "", "today", "tomorrow"]))
+            for i in range(start, start + n)]
+
+
+def _time_ops(planner: IncrementalPlanner, ops: int, rng: random.Random, n: int) -> dict:
+    timings = {"complete": [], "insert": [], "update_duration": []}
+    next_title = n
+    for _ in range(ops):
+        op = rng.choice(list(timings))
+        if op == "complete":
+            # The user finishes whatever is first in the remaining plan
+            blocks = planner.schedule[len(planner.completed):]
+            if not blocks:
+                continue
+            title = blocks[0].task_title.removesuffix(" (partial)")
+            start = time.perf_counter()
+            planner.complete(title, rng.choice(DURATIONS))
+            if planner.now >= WINDOW:  # next session
+                planner.now = 0
+                planner.completed.clear()
+        elif op == "insert":
+            task = make_tasks(1, rng, next_title)[0]
+            next_title += 1
+            start = time.perf_counter()
+            planner.insert(task)
+        else:
+            title = f"Task {rng.randrange(next_title)}"
+            start = time.perf_counter()
+            try:
+                planner.update_duration(title, rng.choice(DURATIONS))
+            except KeyError:  # already completed
+                continue
+        timings[op].append(time.perf_counter() - start)
+    return {op: latency_summary(samples) for op, samples in timings.items()}
+
+
+def run(ops: int = 2_000, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    results = {}
+    for n in SIZES:
+        tasks = make_tasks(n, rng)
+        start = time.perf_counter()
+        create_focus_schedule(prioritize_tasks(tasks), WINDOW)
+        full_ms = (time.perf_counter() - start) * 1000
+
+        planner = IncrementalPlanner(tasks, WINDOW)
+        for op, summary in _time_ops(planner, ops, rng, n).items():
+            summary["full_recompute_ms"] = full_ms
+            results[f"{op}_{n}"] = summary
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ops", type=int, default=2_000)
+    args = parser.parse_args()
+    print(f"{'case':24s} {'p50 us':>9s} {'p99 us':>9s} {'full recompute ms':>18s}")
+    for case, r in run(args.ops).items():
+        print(f"{case:24s} {r['p50_ms'] * 1000:9.1f} {r['p99_ms'] * 1000:9.1f} "
+              f"{r['full_recompute_ms']:18.2f}")
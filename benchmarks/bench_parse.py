@@ -0,0 +1,96 @@
+"""
+Parser throughput: the single-pass tokenizer vs. the original multi-regex parser.
+
+    python -m benchmarks.bench_parse [--lines 100000]
+"""
+
+import argparse
+import os
+import random
+import re
+import tempfile
+import time
+
+from benchmarks import SRC_DIR  # noqa: F401  (puts src/ on sys.path)
+from tools import Task, parse_tasks, parse_tasks_iter
+
+TITLES = [
+    "Review pull requests", "Write unit tests for auth module", "Update documentation",
+    "Reply to urgent emails", "Plan sprint retrospective", "Fix login bug",
+    "Prep slides for Friday demo", "Call the bank", "Refactor billing service",
+]
+TIMES = ["", "", " (20 min)", " 15min", " 1hr", " 2 hours", " 45 minutes"]
+DEADLINES = ["", "", "", " due: today", " by Friday", " deadline tomorrow"]
+BULLETS = ["- ", "* ", "• ", "1. ", "2) ", ""]
+
+
+def legacy_parse_tasks(raw_text: str):
+    """The parser as it was before the single-pass tokenizer, kept for comparison."""
+    tasks = []
+    lines = [line.strip() for line in raw_text.split('\n') if line.strip()]
+    for line in lines:
+        clean_line = re.sub(r'^[-*•\d.)\]]+\s*', '', line)
+        time_match = re.search(r'(\d+)\s*(min|hour|hr)', clean_line, re.IGNORECASE)
+        estimated_minutes = 10
+        if time_match:
+            num = int(time_match.group(1))
+            unit = time_match.group(2).lower()
+            estimated_minutes = num if 'min' in unit else num * 60
+            clean_line = re.sub(r'\d+\s*(min|hour|hr)', '', clean_line, flags=re.IGNORECASE)
+        deadline_match = re.search(r'(due|deadline|by)\s*:?\s*(\S+)', clean_line, re.IGNORECASE)
+        deadline = deadline_match.group(2) if deadline_match else ""
+        if deadline_match:
+            clean_line = re.sub(r'(due|deadline|by)\s*:?\s*\S+', '', clean_line, flags=re.IGNORECASE)
+        clean_line = clean_line.strip(' ,-:')
+        if clean_line:
+            tasks.append(Task(title=clean_line, deadline=deadline, estimated_minutes=estimated_minutes))
+    return tasks
+
+
+def make_backlog(n_lines: int, seed: int = 0) -> str:
+    """Build a synthetic tracker export with n_lines task lines."""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(n_lines):
+        lines.append(
+            rng.choice(BULLETS) + rng.choice(TITLES) + f" #{i}"
+            + rng.choice(TIMES) + rng.choice(DEADLINES)
+        )
+    return "\n".join(lines)
+
+
+def _rate(fn, n_lines: int) -> float:
+    start = time.perf_counter()
+    fn()
+    return n_lines / (time.perf_counter() - start)
+
+
+def run(n_lines: int = 100_000) -> dict:
+    text = make_backlog(n_lines)
+    assert parse_tasks(text) == legacy_parse_tasks(text)
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as f:
+        f.write(text)
+        path = f.name
+    try:
+        def stream():
+            with open(path, encoding="utf-8") as fh:
+                for _ in parse_tasks_iter(fh):
+                    pass
+
+        return {
+            "lines": n_lines,
+            "legacy_lines_per_sec": _rate(lambda: legacy_parse_tasks(text), n_lines),
+            "parse_tasks_lines_per_sec": _rate(lambda: parse_tasks(text), n_lines),
+            "parse_tasks_iter_file_lines_per_sec": _rate(stream, n_lines),
+        }
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    args = parser.parse_args()
+    for key, value in run(args.lines).items():
+        print(f"{key:40s} {value:,.0f}")
@@ -0,0 +1,54 @@
+"""
+Scheduling strategies: solve time and minutes used, greedy vs. optimal.
+
+    python -m benchmarks.bench_schedule [--minutes 25]
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks import SRC_DIR  # noqa: F401  (puts src/ on sys.path)
+from tools import Task, create_focus_schedule, prioritize_tasks
+
+SIZES = (10, 100, 1_000)
+DURATIONS = (5, 10, 10, 15, 20, 30, 45, 60)
+
+
+def make_tasks(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    return prioritize_tasks([
+        Task(title=f"Task {i}", estimated_minutes=rng.choice(DURATIONS),
+             deadline=rng.choice(["", "", "today"]))
+        for i in range(n)
+    ])
+
+
+def _minutes_used(schedule) -> int:
+    return sum(b.end_minute - b.start_minute for b in schedule if not b.task_title.endswith("(partial)"))
+
+
+def run(available_minutes: int = 25, repeats: int = 5) -> dict:
+    results = {}
+    for n in SIZES:
+        tasks = make_tasks(n)
+        for strategy in ("greedy", "optimal"):
+            start = time.perf_counter()
+            for _ in range(repeats):
+                schedule = create_focus_schedule(tasks, available_minutes, strategy=strategy)
+            elapsed = (time.perf_counter() - start) / repeats
+            results[f"{strategy}_{n}"] = {
+                "solve_ms": elapsed * 1000,
+                "minutes_used": _minutes_used(schedule),
+                "tasks_scheduled": len(schedule),
+            }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=int, default=25)
+    args = parser.parse_args()
+    print(f"{'case':16s} {'solve ms':>10s} {'minutes':>8s} {'tasks':>6s}  (window {args.minutes} min)")
+    for case, r in run(args.minutes).items():
+        print(f"{case:16s} {r['solve_ms']:10.3f} {r['minutes_used']:8d} {r['tasks_scheduled']:6d}")
@@ -0,0 +1,71 @@
+"""
+Keyword scoring cost as the vocabulary grows: Aho-Corasick vs. per-keyword scans.
+
+    python -m benchmarks.bench_scoring [--titles 5000]
+"""
+
+import argparse
+import random
+import string
+import time
+
+from benchmarks import SRC_DIR  # noqa: F401  (puts src/ on sys.path)
+from scoring import DEFAULT_KEYWORD_GROUPS, PriorityScorer
+
+VOCAB_SIZES = (10, 100, 1_000, 5_000)
+
+
+def _vocabulary(size: int, rng: random.Random):
+    base = [w for _, words in DEFAULT_KEYWORD_GROUPS.values() for w in words]
+    words = set(base)
+    while len(words) < size:
+        words.add("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10))))
+    words = sorted(words)
+    rng.shuffle(words)
+    half = len(words) // 2
+    return {"important": (15.0, words[:half]), "quick": (3.0, words[half:])}
+
+
+def _titles(n: int, rng: random.Random):
+    parts = ["Review", "urgent", "fix", "login", "bug", "write", "docs", "check", "deploy", "quick"]
+    return [" ".join(rng.choice(parts) for _ in range(rng.randint(3, 8))) + f" #{i}" for i in range(n)]
+
+
+def _naive_score(groups, title: str) -> float:
+    """The original approach: one substring scan per keyword."""
+    title_lower = title.lower()
+    return sum(weight for weight, words in groups.values()
+               if any(word in title_lower for word in words))
+
+
+def run(n_titles: int = 5_000) -> dict:
+    rng = random.Random(0)
+    titles = _titles(n_titles, rng)
+    results = {}
+    for size in VOCAB_SIZES:
+        groups = _vocabulary(size, rng)
+        scorer = PriorityScorer(groups)
+
+        start = time.perf_counter()
+        fast = [scorer.title_score(t) for t in titles]
+        automaton_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        slow = [_naive_score(groups, t) for t in titles]
+        naive_s = time.perf_counter() - start
+
+        assert fast == slow
+        results[size] = {
+            "automaton_us_per_title": automaton_s / n_titles * 1e6,
+            "naive_us_per_title": naive_s / n_titles * 1e6,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--titles", type=int, default=5_000)
+    args = parser.parse_args()
+    print(f"{'keywords':>9s} {'automaton us/title':>19s} {'naive us/title':>15s}")
+    for size, r in run(args.titles).items():
+        print(f"{size:9,d} {r['automaton_us_per_title']:19.2f} {r['naive_us_per_title']:15.2f}")
@@ -0,0 +1,138 @@
+"""
+Load test for the HTTP service: sustained requests/sec and latency.
+
+Starts server.FocusBuddyService in-process on a free port and keeps N
+keep-alive client connections busy for a fixed time, each sending requests
+back to back. Modes:
+
+    local   POST /plan with "present": false (parse/prioritize/schedule only)
+    adjust  POST /adjust on an existing plan (incremental re-plan only)
+    fast    POST /plan on the fast path with the stub model phrasing the plan
+            (needs google-adk; model turns take --latency-ms)
+
+Reports successful requests/sec, p50/p95/p99 latency and how many requests
+were turned away with 503 by the model queue limit.
+
+    python -m benchmarks.bench_server [--seconds 5] [--connections 1 16 64] [--modes local adjust fast]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import Counter
+
+from benchmarks import SRC_DIR  # noqa: F401  (puts src/ on sys.path)
+from benchmarks.bench_shortlist import make_backlog
+from benchmarks.harness import latency_summary
+
+import main
+import server
+
+# stub_model.STUB_MODEL_NAME; not imported, so the local modes run without google-adk
+os.environ.setdefault("FOCUS_BUDDY_MODEL", "stub-focus-buddy")
+
+MODES = ("local", "adjust", "fast")
+
+
+async def _request(conn, method: str, path: str, body: dict = None):
+    reader, writer = conn
+    data = json.dumps(body).encode() if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    payload = json.loads(await reader.readexactly(length)) if length else {}
+    return status, payload
+
+
+async def _client(port: int, mode: str, n: int, backlog: str, deadline: float, latencies, statuses):
+    conn = await asyncio.open_connection("127.0.0.1", port)
+    session_id = f"bench-{mode}-{n}"
+    plan = {"tasks": backlog, "available_minutes": 60, "session_id": session_id,
+            "present": mode != "local"}
+    if mode == "adjust":
+        await _request(conn, "POST", "/plan", dict(plan, present=False))
+    i = 0
+    try:
+        while time.perf_counter() < deadline:
+            if mode == "adjust":
+                i += 1
+                path, body = "/adjust", {"session_id": session_id, "added": f"- follow-up {n}-{i} 5 min"}
+            else:
+                path, body = "/plan", plan
+            start = time.perf_counter()
+            status, _ = await _request(conn, "POST", path, body)
+            statuses[status] += 1
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+    finally:
+        conn[1].close()
+
+
+async def _level(mode: str, connections: int, seconds: float, backlog: str,
+                 model_concurrency: int, max_queue: int, workers: int) -> dict:
+    service = server.FocusBuddyService(model_concurrency, max_queue, workers)
+    listener = await service.start(port=0)
+    port = listener.sockets[0].getsockname()[1]
+    latencies, statuses = [], Counter()
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(_client(port, mode, n, backlog, start + seconds, latencies, statuses)
+                               for n in range(connections)))
+    finally:
+        elapsed = time.perf_counter() - start
+        listener.close()
+        await listener.wait_closed()
+        service.close()
+    summary = latency_summary(latencies)
+    summary["requests_per_sec"] = len(latencies) / elapsed
+    summary["rejected_503"] = statuses[503]
+    summary["errors"] = sum(count for status, count in statuses.items() if status not in (200, 503))
+    return summary
+
+
+def run(seconds: float = 5.0, connections=(1, 16, 64), modes=MODES, tasks: int = 20,
+        latency_ms: float = 50.0, model_concurrency: int = 8, max_queue: int = 32,
+        workers: int = 4) -> dict:
+    backlog = make_backlog(tasks)
+    results = {}
+    for mode in modes:
+        if mode == "fast":
+            try:
+                main.get_model().latency_seconds = latency_ms / 1000
+            except ImportError as e:
+                print(f"skipping fast: {e}")
+                continue
+        for level in connections:
+            results[f"{mode}_c{level}"] = asyncio.run(_level(mode, level, seconds, backlog,
+                                                             model_concurrency, max_queue, workers))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--connections", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--tasks", type=int, default=20, help="tasks in each /plan backlog")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="stub model latency per turn")
+    parser.add_argument("--model-concurrency", type=int, default=8)
+    parser.add_argument("--max-queue", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    results = run(args.seconds, args.connections, args.modes, args.tasks, args.latency_ms,
+                  args.model_concurrency, args.max_queue, args.workers)
+    print(f"{'case':12s} {'req/s':>8s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} {'503s':>6s} {'errors':>6s}")
+    for case, r in results.items():
+        print(f"{case:12s} {r['requests_per_sec']:8.1f} {r['p50_ms']:8.1f} {r['p95_ms']:8.1f} "
+              f"{r['p99_ms']:8.1f} {r['rejected_503']:6d} {r['errors']:6d}")
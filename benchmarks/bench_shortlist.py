@@ -0,0 +1,73 @@
+"""
+Top-K pre-ranking: tokens the model no longer reads, and what it costs locally.
+
+For backlogs of growing size, compares what the agent sees with and without
+the local shortlist stage: the task text in the prompt, the parse tool's
+echo of it (re-read on 3 later model turns), and the fast path's presenter
+prompt. Also times the local pre-stage (parse + rank + top-K).
+
+    python -m benchmarks.bench_shortlist [--top-k 10] [--sizes 100 1000 10000 100000]
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks import SRC_DIR  # noqa: F401  (puts src/ on sys.path)
+from pipeline import build_focus_plan, describe_plan, describe_rest, describe_shortlist, shortlist_tasks
+from tool_output import format_parsed
+from tools import parse_tasks
+from tracing import estimate_tokens
+
+WORDS = ("review", "update", "fix", "write", "deploy", "reply", "plan", "docs", "tests",
+         "auth", "billing", "email", "slides", "retro", "bug", "module", "service")
+
+
+def make_backlog(n: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    lines = []
+    for i in range(n):
+        line = "- " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 6))) + f" {i}"
+        if rng.random() < 0.6:
+            line += f" {rng.choice((5, 10, 15, 20, 30, 45))} min"
+        if rng.random() < 0.2:
+            line += f" due: {rng.choice(('today', 'tomorrow', 'Friday'))}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def run(sizes=(100, 1_000, 10_000, 100_000), top_k: int = 10) -> dict:
+    results = {}
+    for n in sizes:
+        raw = make_backlog(n)
+        start = time.perf_counter()
+        shortlist = shortlist_tasks(raw, top_k)
+        prestage_ms = (time.perf_counter() - start) * 1000
+        text = describe_shortlist(shortlist)
+
+        full_agent = estimate_tokens(raw) + 3 * estimate_tokens(format_parsed(parse_tasks(raw)))
+        short_agent = (estimate_tokens(text) + estimate_tokens(describe_rest(shortlist))
+                       + 3 * estimate_tokens(format_parsed(parse_tasks(text))))
+        plan = build_focus_plan(raw)
+        full_fast = estimate_tokens(describe_plan(plan))
+        short_fast = estimate_tokens(describe_plan(plan, max_deferred=top_k))
+        results[f"tasks_{n}"] = {
+            "prestage_ms": prestage_ms,
+            "agent_tokens_full": full_agent,
+            "agent_tokens_top_k": short_agent,
+            "fast_prompt_tokens_full": full_fast,
+            "fast_prompt_tokens_top_k": short_fast,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000])
+    args = parser.parse_args()
+    print(f"{'tasks':>8s} {'pre-stage ms':>13s} {'agent tokens':>22s} {'fast-path prompt':>22s}")
+    for case, r in run(args.sizes, args.top_k).items():
+        print(f"{case[6:]:>8s} {r['prestage_ms']:13.1f} "
+              f"{r['agent_tokens_full']:>10,} -> {r['agent_tokens_top_k']:<8,} "
+              f"{r['fast_prompt_tokens_full']:>10,} -> {r['fast_prompt_tokens_top_k']:<8,}")
@@ -0,0 +1,75 @@
+"""
+Time to first useful output, streaming vs. waiting for the whole answer.
+
+Runs plans through main.stream_focus_buddy against the local ScriptedModel,
+which streams its answer one line per chunk with a fixed delay between
+chunks. For each mode, reports the time until the first event the user can
+read (the local plan on the fast path, the first text chunk otherwise) and
+the time until the answer is complete. The complete time is what
+run_focus_buddy callers wait before they can print anything.
+
+    python -m benchmarks.bench_stream [--sessions 30] [--latency-ms 50] [--chunk-ms 20]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks import SRC_DIR  # noqa: F401  (puts src/ on sys.path)
+from benchmarks.harness import latency_summary
+from stub_model import STUB_MODEL_NAME
+
+import main
+
+os.environ.setdefault("FOCUS_BUDDY_MODEL", STUB_MODEL_NAME)
+
+BACKLOG = """
+- Review pull requests (20 min)
+- Write unit tests for auth module
+- Update documentation due: today
+- Reply to 3 urgent emails (15 min)
+- Plan sprint retrospective
+"""
+
+
+async def _plan(mode: str, n: int):
+    start = time.perf_counter()
+    first = None
+    async for event in main.stream_focus_buddy(BACKLOG, available_minutes=30,
+                                               fast_path=(mode == "fast"),
+                                               session_id=f"stream-{mode}-{n}"):
+        if first is None and event.kind in ("plan", "text"):
+            first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+async def _run(sessions: int) -> dict:
+    results = {}
+    for mode in ("agent", "fast"):
+        firsts, totals = [], []
+        for n in range(sessions):
+            first, total = await _plan(mode, n)
+            firsts.append(first)
+            totals.append(total)
+        results[f"{mode}_first_output"] = latency_summary(firsts)
+        results[f"{mode}_complete"] = latency_summary(totals)
+    return results
+
+
+def run(sessions: int = 30, latency_ms: float = 50.0, chunk_ms: float = 20.0) -> dict:
+    model = main.get_model()
+    model.latency_seconds = latency_ms / 1000
+    model.chunk_latency_seconds = chunk_ms / 1000
+    return asyncio.run(_run(sessions))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=30)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--chunk-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    print(f"{'case':20s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s}")
+    for case, r in run(args.sessions, args.latency_ms, args.chunk_ms).items():
+        print(f"{case:20s} {r['p50_ms']:8.1f} {r['p95_ms']:8.1f} {r['p99_ms']:8.1f}")
@@ -0,0 +1,72 @@
+"""
+Memory and prioritize time: List[Task] vs. TaskTable at 10k / 100k / 1M rows.
+
+    python -m benchmarks.bench_task_table [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from benchmarks import SRC_DIR  # noqa: F401  (puts src/ on sys.path)
+from task_table import TaskTable
+from tools import Task, create_focus_schedule, prioritize_tasks
+
+SIZES = (10_000, 100_000, 1_000_000)
+DEADLINES = ("", "", "", "today", "tomorrow", "Friday")
+
+
+def _rows(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    for i in range(n):
+        yield f"Backlog item {i % 5000}", rng.choice(DEADLINES), rng.choice((5, 10, 15, 30, 60))
+
+
+def _measure(build):
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run(sizes=SIZES) -> dict:
+    results = {}
+    for n in sizes:
+        tasks, list_bytes = _measure(lambda: [Task(title=t, deadline=d, estimated_minutes=m)
+                                              for t, d, m in _rows(n)])
+        table, table_bytes = _measure(lambda: TaskTable.from_tasks(tasks))
+
+        sorted_list, list_sort = _timed(lambda: prioritize_tasks(tasks))
+        sorted_table, table_sort = _timed(lambda: prioritize_tasks(table))
+        assert [t.title for t in sorted_list[:100]] == [t.title for t in sorted_table[:100]]
+        _, table_schedule = _timed(lambda: create_focus_schedule(sorted_table, 25))
+
+        results[n] = {
+            "list_mb": list_bytes / 1e6,
+            "table_mb": table_bytes / 1e6,
+            "list_prioritize_s": list_sort,
+            "table_prioritize_s": table_sort,
+            "table_schedule_s": table_schedule,
+        }
+        del tasks, table, sorted_list, sorted_table
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    args = parser.parse_args()
+    print(f"{'rows':>9s} {'list MB':>9s} {'table MB':>9s} {'list sort s':>12s} {'table sort s':>13s}")
+    for n, r in run(args.sizes).items():
+        print(f"{n:9,d} {r['list_mb']:9.1f} {r['table_mb']:9.1f} "
+              f"{r['list_prioritize_s']:12.3f} {r['table_prioritize_s']:13.3f}")
@@ -0,0 +1,68 @@
+"""
+Prompt tokens spent on tool outputs: prose vs. compact vs. compact with a budget.
+
+In the tool-driven workflow each tool result stays in the context for every
+later model turn: the parse output is re-read on 3 turns, the prioritize
+output on 2 and the schedule on 1. "per_plan" counts that.
+
+    python -m benchmarks.bench_tool_output [--budget 200]
+"""
+
+import argparse
+import random
+
+from benchmarks import SRC_DIR  # noqa: F401  (puts src/ on sys.path)
+from tool_output import (ToolOutputConfig, format_parsed, format_prioritized,
+                         format_schedule, task_index)
+from tools import Task, create_focus_schedule, prioritize_tasks
+from tracing import estimate_tokens
+
+SIZES = (5, 50, 500)
+WORDS = ("review", "update", "fix", "write", "deploy", "reply", "plan", "docs", "tests",
+         "auth", "billing", "email", "slides", "retro", "bug", "module", "service")
+
+
+def make_tasks(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [Task(title=" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 6))).capitalize() + f" {i}",
+                 deadline=rng.choice(["", "", "today", "Friday"]),
+                 estimated_minutes=rng.choice((5, 10, 15, 20, 30)))
+            for i in range(n)]
+
+
+def _tokens(tasks, config: ToolOutputConfig) -> dict:
+    index = task_index(tasks)
+    parsed = format_parsed(tasks, config)
+    prioritized = prioritize_tasks(list(tasks))
+    ranked = format_prioritized(prioritized, index, config)
+    schedule = format_schedule(create_focus_schedule(prioritized, 25), 25, index, config)
+    p, r, s = estimate_tokens(parsed), estimate_tokens(ranked), estimate_tokens(schedule)
+    return {"parse": p, "prioritize": r, "schedule": s, "per_plan": 3 * p + 2 * r + s}
+
+
+def run(budget: int = 200) -> dict:
+    modes = {
+        "prose": ToolOutputConfig(),
+        "compact": ToolOutputConfig(compact=True),
+        f"compact_budget{budget}": ToolOutputConfig(compact=True, token_budget=budget),
+    }
+    results = {}
+    for n in SIZES:
+        tasks = make_tasks(n)
+        row = {name: _tokens(tasks, config) for name, config in modes.items()}
+        prose = row["prose"]["per_plan"]
+        for name in modes:
+            row[name]["reduction_vs_prose"] = 1 - row[name]["per_plan"] / prose
+        results[n] = row
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget", type=int, default=200)
+    args = parser.parse_args()
+    print(f"{'tasks':>6s} {'mode':18s} {'parse':>7s} {'prior.':>7s} {'sched.':>7s} {'per plan':>9s} {'saved':>6s}")
+    for n, row in run(args.budget).items():
+        for name, r in row.items():
+            print(f"{n:6d} {name:18s} {r['parse']:7d} {r['prioritize']:7d} {r['schedule']:7d} "
+                  f"{r['per_plan']:9d} {r['reduction_vs_prose']:6.0%}")
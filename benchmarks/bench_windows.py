@@ -0,0 +1,93 @@
+"""
+Multi-window scheduling: segment-tree first-fit vs. a linear slot scan.
+
+Builds weeks of working days whose free time is broken up by meetings into
+hundreds of windows, then places a prioritized backlog into its Pomodoro
+slots with window_scheduler.schedule_windows and with the same placement
+done by scanning the slot list for every part.
+
+    python -m benchmarks.bench_windows [--days 60] [--tasks 1000 5000 20000]
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks import SRC_DIR  # noqa: F401  (puts src/ on sys.path)
+from tools import Task, prioritize_tasks
+from window_scheduler import free_windows, pomodoro_slots, schedule_windows, split_minutes
+
+DURATIONS = (5, 10, 15, 20, 30, 45, 60, 90)
+DAY = 24 * 60
+
+
+def make_calendar(days: int, rng: random.Random):
+    free = [(d * DAY + 9 * 60, d * DAY + 17 * 60) for d in range(days)]
+    busy = []
+    for d in range(days):
+        for _ in range(rng.randint(3, 8)):
+            start = d * DAY + rng.randrange(9 * 60, 17 * 60, 15)
+            busy.append((start, start + rng.choice((15, 30, 30, 60))))
+    return free, busy
+
+
+def linear_first_fit(tasks, free, busy, focus_minutes: int = 25):
+    """Reference placement: scan the slots from the start for every part."""
+    slots, _ = pomodoro_slots(free_windows(free, busy), focus_minutes)
+    room = [end - start for start, end in slots]
+    placed = 0
+    for task in tasks:
+        parts = split_minutes(task.estimated_minutes, focus_minutes)
+        taken = []
+        lo = 0
+        for need in parts:
+            i = next((j for j in range(lo, len(room)) if room[j] >= need), -1)
+            if i < 0:
+                break
+            room[i] -= need
+            taken.append((i, need))
+            lo = i + 1
+        if len(taken) < len(parts):
+            for i, need in taken:
+                room[i] += need
+        else:
+            placed += 1
+    return placed
+
+
+def run(days: int = 60, task_counts=(1_000, 5_000, 20_000), seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    free, busy = make_calendar(days, rng)
+    windows = free_windows(free, busy)
+    slots, _ = pomodoro_slots(windows)
+    results = {"calendar": {"windows": len(windows), "slots": len(slots)}}
+    for n in task_counts:
+        tasks = prioritize_tasks([Task(title=f"Task {i}", estimated_minutes=rng.choice(DURATIONS))
+                                  for i in range(n)])
+        start = time.perf_counter()
+        plan = schedule_windows(tasks, free, busy)
+        tree_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        placed = linear_first_fit(tasks, free, busy)
+        linear_ms = (time.perf_counter() - start) * 1000
+        assert placed == n - len(plan.unscheduled)
+        results[f"tasks_{n}"] = {
+            "segment_tree_ms": tree_ms,
+            "linear_scan_ms": linear_ms,
+            "tasks_scheduled": placed,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1_000, 5_000, 20_000])
+    args = parser.parse_args()
+    results = run(args.days, args.tasks)
+    calendar = results.pop("calendar")
+    print(f"{calendar['windows']} free windows, {calendar['slots']} Pomodoro slots")
+    print(f"{'tasks':>8s} {'tree ms':>9s} {'linear ms':>10s} {'scheduled':>10s}")
+    for case, r in results.items():
+        print(f"{case[6:]:>8s} {r['segment_tree_ms']:9.1f} {r['linear_scan_ms']:10.1f} "
+              f"{r['tasks_scheduled']:10d}")
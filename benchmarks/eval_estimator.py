@@ -0,0 +1,108 @@
+"""
+Offline evaluation of learned duration estimates on synthetic histories.
+
+Simulates users planning sessions of tasks written without a time. Each
+task kind has a typical duration, each user a personal speed factor, and
+every completion some noise. Sessions are replayed in order. Before each
+session, the tasks are estimated with the fixed 10-minute default and with
+DurationEstimator (trained online on all earlier completions), then the
+true durations are fed back. Reports mean absolute error, the median
+relative error, and the re-plan rate: the share of sessions whose
+scheduled tasks really overrun the window by more than 20%, sending the
+user back to re-plan.
+
+    python -m benchmarks.eval_estimator [--users 500] [--sessions 40]
+"""
+
+import argparse
+import random
+
+from benchmarks import SRC_DIR  # noqa: F401  (puts src/ on sys.path)
+from benchmarks.harness import percentile
+from duration_estimator import DurationEstimator
+from tools import Task, create_focus_schedule
+
+# Task kind -> (typical minutes, title templates)
+KINDS = {
+    "email": (8, ("Reply to {} emails", "Answer email from {}", "Clear inbox for {}")),
+    "review": (20, ("Review pull request for {}", "Review design doc for {}")),
+    "bug": (45, ("Fix bug in {}", "Investigate crash in {}")),
+    "write": (35, ("Write docs for {}", "Draft report on {}")),
+    "call": (15, ("Call {} about invoice", "Sync call with {}")),
+    "admin": (5, ("File expenses for {}", "Book room for {}")),
+}
+SUBJECTS = ("auth", "billing", "search", "onboarding", "Sam", "Priya", "vendor", "Q4", "mobile")
+WINDOW = 25
+FIXED_DEFAULT = 10
+
+
+def _make_task(rng: random.Random, speed: float):
+    kind = rng.choice(list(KINDS))
+    typical, templates = KINDS[kind]
+    title = rng.choice(templates).format(rng.choice(SUBJECTS))
+    actual = max(1, round(typical * speed * rng.lognormvariate(0, 0.25)))
+    return title, actual
+
+
+def _replans(tasks, estimates, actual) -> bool:
+    """True if the tasks scheduled with these estimates really overrun the window."""
+    planned = [Task(title=t, estimated_minutes=m) for t, m in zip(tasks, estimates)]
+    real = 0
+    for block in create_focus_schedule(planned, WINDOW):
+        if block.task_title.endswith(" (partial)"):
+            # The user stops a partial block when the window ends
+            real += block.end_minute - block.start_minute
+        else:
+            real += actual[block.task_title]
+    return real > WINDOW * 1.2
+
+
+def run(users: int = 500, sessions: int = 40, tasks_per_session: int = 4, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    speeds = {f"user{u}": rng.lognormvariate(0, 0.3) for u in range(users)}
+    # Interleave the users' sessions, as they would arrive in production
+    timeline = [user for user in speeds for _ in range(sessions)]
+    rng.shuffle(timeline)
+
+    estimator = DurationEstimator()
+    errors = {"fixed": [], "learned": []}
+    relative = {"fixed": [], "learned": []}
+    replans = {"fixed": 0, "learned": 0}
+    for user_id in timeline:
+        drawn = [_make_task(rng, speeds[user_id]) for _ in range(tasks_per_session)]
+        titles = [title for title, _ in drawn]
+        actual = dict(drawn)
+        default = estimator.default_minutes(user_id)
+        estimates = {"fixed": [FIXED_DEFAULT] * len(titles), "learned": [default(t) for t in titles]}
+        for name, guesses in estimates.items():
+            for title, guess in zip(titles, guesses):
+                errors[name].append(abs(guess - actual[title]))
+                relative[name].append(abs(guess - actual[title]) / actual[title])
+            replans[name] += _replans(titles, guesses, actual)
+        for title, minutes in drawn:
+            estimator.observe(user_id, title, minutes)
+
+    results = {}
+    for name in ("fixed", "learned"):
+        results[name] = {
+            "mae_minutes": sum(errors[name]) / len(errors[name]),
+            "median_relative_error": percentile(relative[name], 50),
+            "replan_rate": replans[name] / len(timeline),
+        }
+    results["estimator"] = estimator.stats()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--sessions", type=int, default=40)
+    args = parser.parse_args()
+    results = run(args.users, args.sessions)
+    sizes = results.pop("estimator")
+    print(f"{'estimates':10s} {'MAE min':>8s} {'median rel err':>15s} {'re-plan rate':>13s}")
+    for name, r in results.items():
+        print(f"{name:10s} {r['mae_minutes']:8.1f} {r['median_relative_error']:15.2f} "
+              f"{r['replan_rate']:13.1%}")
+    print(f"estimator size: {sizes['users']} users, {sizes['user_keywords']} user keywords, "
+          f"{sizes['keywords']} keywords")
@@ -0,0 +1,87 @@
+"""
+Shared helpers for the benchmarks: percentiles and JSON baselines.
+
+Baselines are plain JSON files in benchmarks/baselines/, so a run can be
+diffed against an earlier one offline (`python -m benchmarks.run_all --compare`).
+"""
+
+import json
+import math
+import os
+from typing import Dict, List, Sequence
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+# Metrics where a larger number is better; everything else numeric is a cost
+_HIGHER_IS_BETTER = ("per_sec", "throughput", "isolated", "minutes_used")
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of samples (0 for an empty list)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def latency_summary(samples_s: Sequence[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean in milliseconds for latencies given in seconds."""
+    ms = [s * 1000 for s in samples_s]
+    return {
+        "p50_ms": percentile(ms, 50),
+        "p95_ms": percentile(ms, 95),
+        "p99_ms": percentile(ms, 99),
+        "mean_ms": sum(ms) / len(ms) if ms else 0.0,
+    }
+
+
+def baseline_path(name: str) -> str:
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def save_baseline(name: str, results: dict) -> str:
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    path = baseline_path(name)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return path
+
+
+def load_baseline(name: str) -> dict:
+    with open(baseline_path(name)) as f:
+        return json.load(f)
+
+
+def _flatten(results: dict, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = float(value)
+    return flat
+
+
+def compare(baseline: dict, current: dict, tolerance: float = 0.10) -> List[str]:
+    """Lines describing metrics that moved more than tolerance, worst first.
+
+    Regressions are prefixed with "REGRESSION", improvements with "improved".
+    """
+    old, new = _flatten(baseline), _flatten(current)
+    changes = []
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key], new[key]
+        if before == 0:
+            continue
+        change = (after - before) / abs(before)
+        if abs(change) <= tolerance:
+            continue
+        better = change > 0 if key.endswith(_HIGHER_IS_BETTER) else change < 0
+        label = "improved  " if better else "REGRESSION"
+        changes.append((not better, abs(change),
+                        f"{label} {key}: {before:.4g} -> {after:.4g} ({change:+.0%})"))
+    changes.sort(reverse=True)
+    return [line for _, _, line in changes]
@@ -0,0 +1,76 @@
+"""
+Run every benchmark and save or diff the results as a JSON baseline.
+
+    python -m benchmarks.run_all --save main          # write baselines/main.json
+    python -m benchmarks.run_all --compare main       # diff against it
+
+Sizes are kept small enough for a laptop; run the individual modules for
+the full-size numbers.
+"""
+
+import argparse
+import importlib
+import json
+import sys
+
+from benchmarks.harness import compare, load_baseline, save_baseline
+
+# suite name -> (module, keyword arguments for its run())
+SUITES = {
+    "parse": ("benchmarks.bench_parse", {"n_lines": 100_000}),
+    "schedule": ("benchmarks.bench_schedule", {}),
+    "scoring": ("benchmarks.bench_scoring", {"n_titles": 2_000}),
+    "task_table": ("benchmarks.bench_task_table", {"sizes": (10_000, 100_000)}),
+    "shortlist": ("benchmarks.bench_shortlist", {"sizes": (100, 10_000)}),
+    "dedup": ("benchmarks.bench_dedup", {"n_tasks": 10_000, "brute_force": 1_000, "thresholds": (0.6,)}),
+    "windows": ("benchmarks.bench_windows", {"task_counts": (1_000, 5_000)}),
+    "deadlines": ("benchmarks.bench_deadlines", {"n_tokens": 200_000, "n_tasks": 20_000}),
+    "incremental": ("benchmarks.bench_incremental", {"ops": 1_000}),
+    "estimator": ("benchmarks.eval_estimator", {"users": 200}),
+    "history": ("benchmarks.bench_history", {"rows": 100_000, "users": 200}),
+    "agent": ("benchmarks.bench_agent", {"sessions": 30, "concurrency": (1, 8)}),
+    "stream": ("benchmarks.bench_stream", {"sessions": 20}),
+    "server": ("benchmarks.bench_server", {"seconds": 2.0, "connections": (1, 16)}),
+    "batch": ("benchmarks.bench_batch", {"records": 2_000, "workers": (1, 4), "present_records": 200}),
+    "gateway": ("benchmarks.bench_gateway", {"calls": 50, "batch": 40}),
+}
+
+
+def run_suites(names) -> dict:
+    results = {}
+    for name in names:
+        module_name, kwargs = SUITES[name]
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError as e:
+            print(f"skipping {name}: {e}", file=sys.stderr)
+            continue
+        print(f"running {name}...", file=sys.stderr)
+        results[name] = module.run(**kwargs)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("suites", nargs="*", default=list(SUITES),
+                        help=f"suites to run (default: all of {', '.join(SUITES)})")
+    parser.add_argument("--save", metavar="NAME", help="write results to baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="diff results against baselines/NAME.json")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="relative change to report when comparing (default 0.10)")
+    args = parser.parse_args()
+    unknown = set(args.suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(sorted(unknown))}")
+
+    results = run_suites(args.suites)
+    print(json.dumps(results, indent=2, sort_keys=True, default=str))
+
+    if args.save:
+        print(f"saved {save_baseline(args.save, results)}", file=sys.stderr)
+    if args.compare:
+        changes = compare(load_baseline(args.compare), results, args.tolerance)
+        for line in changes or ["no changes beyond tolerance"]:
+            print(line, file=sys.stderr)
+        if any(line.startswith("REGRESSION") for line in changes):
+            sys.exit(1)
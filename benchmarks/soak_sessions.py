@@ -0,0 +1,138 @@
+"""
+Soak test: resident sessions and process memory stay flat over 100k sessions.
+
+Simulates a long-lived worker: each step starts a new session or, some of the
+time, continues one of the recent ones. Time is simulated (--interval seconds
+per step), so the idle TTL evicts sessions as it would in production, and
+--max-sessions caps the rest. Modes:
+
+    local  sessions planned with main.plan_locally; returning users add tasks
+    stub   sessions phrased by the presenter runner with the stub model and
+           returning users send another turn, so histories grow and are
+           compacted (needs google-adk)
+
+Every tenth of the run it prints resident sessions, their serialized size,
+the session_store size and the process RSS. Memory that keeps growing
+after warm-up is a leak.
+
+    python -m benchmarks.soak_sessions [--sessions 100000] [--modes local stub] [--max-sessions 1000] [--ttl 600]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import random
+import resource
+
+from benchmarks import SRC_DIR  # noqa: F401  (puts src/ on sys.path)
+from benchmarks.bench_shortlist import make_backlog
+
+import main
+
+# stub_model.STUB_MODEL_NAME; not imported, so the local mode works without google-adk
+os.environ.setdefault("FOCUS_BUDDY_MODEL", "stub-focus-buddy")
+
+MODES = ("local", "stub")
+
+# Sessions a returning user picks from (the most recently started ones)
+RECENT_SESSIONS = 200
+
+
+def rss_mb() -> float:
+    """Current resident set size (peak where /proc is not available)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def _step(mode: str, user_id: str, session_id: str, backlog: str, returning: bool) -> None:
+    if mode == "local":
+        if returning:
+            main.get_session_manager().touch(user_id, session_id)
+            main.add_tasks(user_id, session_id, "- follow-up 10 min")
+        else:
+            main.plan_locally(backlog, 60, user_id, session_id)
+        return
+    if returning:
+        prompt = main.presenter_prompt("- follow-up 10 min", 10)
+    else:
+        prompt = main.presenter_prompt(backlog, 60)
+    await main.run_prompt(main.get_presenter_runner(), prompt, user_id, session_id)
+
+
+async def _soak(mode: str, sessions: int, interval: float, return_rate: float, seed: int) -> list:
+    rng = random.Random(seed)
+    backlogs = [make_backlog(rng.randint(3, 15), seed=n) for n in range(50)]
+    manager = main.get_session_manager()
+    now = [0.0]
+    manager.clock = lambda: now[0]
+    recent, samples = [], []
+    checkpoint = max(1, sessions // 10)
+    for n in range(1, sessions + 1):
+        now[0] += interval
+        returning = bool(recent) and rng.random() < return_rate
+        if returning:
+            user_id, session_id = rng.choice(recent)
+        else:
+            user_id, session_id = f"user{n % 5000}", f"soak-{mode}-{n}"
+            recent.append((user_id, session_id))
+            del recent[:-RECENT_SESSIONS]
+        await _step(mode, user_id, session_id, rng.choice(backlogs), returning)
+        if n % checkpoint == 0:
+            await manager.sweep()
+            stats = manager.stats()
+            samples.append({"steps": n, "resident": stats["resident"],
+                            "resident_kb": stats["resident_bytes"] / 1024,
+                            "store": len(main.session_store), "rss_mb": rss_mb(),
+                            "evicted": stats["evicted_ttl"] + stats["evicted_lru"],
+                            "compacted_events": stats["compacted_events"]})
+    return samples
+
+
+def run(sessions: int = 100_000, modes=MODES, interval: float = 0.5, return_rate: float = 0.3,
+        max_sessions: int = 1_000, ttl: float = 600.0, keep_turns: int = 2, seed: int = 0) -> dict:
+    manager = main.get_session_manager()
+    manager.max_sessions, manager.ttl_seconds, manager.keep_turns = max_sessions, ttl, keep_turns
+    results = {}
+    for mode in modes:
+        if mode == "stub":
+            try:
+                main.get_model()
+            except ImportError as e:
+                print(f"skipping stub: {e}")
+                continue
+        with contextlib.redirect_stdout(io.StringIO()):
+            samples = asyncio.run(_soak(mode, sessions, interval, return_rate, seed))
+        # Growth after the first tenth (warm-up) is what a leak would show
+        results[mode] = {
+            "samples": samples,
+            "rss_growth_mb": samples[-1]["rss_mb"] - samples[0]["rss_mb"],
+            "max_resident": max(s["resident"] for s in samples),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--interval", type=float, default=0.5, help="simulated seconds per step")
+    parser.add_argument("--return-rate", type=float, default=0.3,
+                        help="share of steps that continue a recent session")
+    parser.add_argument("--max-sessions", type=int, default=1_000)
+    parser.add_argument("--ttl", type=float, default=600.0, help="idle seconds before eviction")
+    parser.add_argument("--keep-turns", type=int, default=2)
+    args = parser.parse_args()
+    results = run(args.sessions, args.modes, args.interval, args.return_rate, args.max_sessions,
+                  args.ttl, args.keep_turns)
+    for mode, r in results.items():
+        print(f"\n{mode}: max {r['max_resident']} resident, RSS growth after warm-up {r['rss_growth_mb']:+.1f} MB")
+        print(f"{'steps':>8s} {'resident':>9s} {'res KB':>8s} {'store':>6s} {'RSS MB':>7s} "
+              f"{'evicted':>8s} {'compacted':>10s}")
+        for s in r["samples"]:
+            print(f"{s['steps']:8d} {s['resident']:9d} {s['resident_kb']:8.0f} {s['store']:6d} "
+                  f"{s['rss_mb']:7.1f} {s['evicted']:8d} {s['compacted_events']:10d}")
@@ -0,0 +1,236 @@
+"""
+Offline batch planning from a JSONL file, e.g. morning plans for every user.
+
+Each input line is a record like
+
+    {"id": "u42-mon", "user": "u42", "raw_text": "- Review PRs 20 min ...", "available_minutes": 60}
+
+("id" defaults to the line number, "energy" to medium). Records are read
+as a stream and planned in a process pool in chunks, with only a few chunks
+in flight, so memory stays flat however long the file is. With --present,
+the presenter model phrases each plan under a concurrency limit, at batch
+priority (see model_gateway.py); plans the plan cache has already phrased
+are not sent again. Results are appended to the output JSONL one line per
+record as they finish.
+
+The output file is the checkpoint: a rerun with the same output skips every
+record already written (records that failed are retried), so an
+interrupted run picks up where it stopped.
+
+    python src/batch.py requests.jsonl plans.jsonl [--workers 4] [--present] [--model-concurrency 8]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Iterator, List, Set, Tuple
+
+import main
+from model_gateway import BATCH, model_priority
+from pipeline import build_focus_plan, describe_plan
+
+# Records sent to a worker process at a time
+DEFAULT_CHUNK_SIZE = 32
+
+
+@dataclass
+class BatchStats:
+    """Counts for one batch run."""
+    planned: int = 0
+    presented: int = 0
+    cached: int = 0
+    errors: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+    @property
+    def records_per_sec(self) -> float:
+        return (self.planned + self.errors) / self.seconds if self.seconds else 0.0
+
+
+def completed_ids(output_path: str) -> Set[str]:
+    """Ids of records already written without an error. A torn last line
+    (the run was killed mid-write) is cut off so the file can be appended to."""
+    done: Set[str] = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, "rb+") as f:
+        good = 0
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            good += len(line)
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            if "error" not in result:
+                done.add(str(result["id"]))
+        f.truncate(good)
+    return done
+
+
+def read_records(input_path: str, skip: Set[str] = frozenset()) -> Iterator[Tuple[str, object]]:
+    """(id, record) pairs from a JSONL file, leaving out ids in skip. A line
+    that isn't valid JSON is passed on as its text so it is reported."""
+    with open(input_path) as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = line.rstrip("\n")
+            record_id = str(record.get("id", number)) if isinstance(record, dict) else str(number)
+            if record_id not in skip:
+                yield record_id, record
+
+
+def plan_record(record_id: str, record) -> dict:
+    """Plan one record with the local pipeline; runs in a worker process."""
+    if not isinstance(record, dict):
+        return {"id": record_id, "error": "not a JSON object"}
+    user = str(record.get("user", ""))
+    result = {"id": record_id, "user": user}
+    try:
+        raw_text = record["raw_text"]
+        available_minutes = int(record.get("available_minutes", 25))
+        energy = str(record.get("energy", "medium"))
+        plan = build_focus_plan(raw_text, available_minutes, energy=energy,
+                                default_minutes=main.get_duration_estimator().default_minutes(user),
+                                dedupe_threshold=main.get_dedupe_threshold())
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        result["error"] = f"bad record: {e!r}"
+        return result
+    top_k = main.get_top_k()
+    result.update({
+        "available_minutes": available_minutes,
+        "energy": energy,
+        "tasks": len(plan.tasks),
+        "schedule": [asdict(block) for block in plan.schedule],
+        "plan": describe_plan(plan, max_deferred=top_k if top_k > 0 else None),
+        "cache_key": main.plan_cache_key(raw_text, available_minutes, energy, user, tasks=plan.tasks),
+    })
+    return result
+
+
+def plan_chunk(chunk: List[Tuple[str, object]]) -> List[dict]:
+    return [plan_record(record_id, record) for record_id, record in chunk]
+
+
+def _chunks(records: Iterator, size: int) -> Iterator[list]:
+    chunk = []
+    for item in records:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def _present(result: dict) -> str:
+    """Phrase a plan with the presenter model in a throwaway session, queued
+    behind interactive requests when the model is rate limited."""
+    runner = main.get_presenter_runner()
+    user_id = result["user"] or "batch"
+    session_id = f"batch-{result['id']}"
+    prompt = main.presenter_prompt(result["plan"], result["available_minutes"], result["energy"])
+    try:
+        with model_priority(BATCH):
+            return await main.run_prompt(runner, prompt, user_id, session_id)
+    finally:
+        await main.get_session_manager().evict(user_id, session_id)
+
+
+async def run_batch(input_path: str, output_path: str, workers: int = 4, present: bool = False,
+                    model_concurrency: int = 8, chunk_size: int = DEFAULT_CHUNK_SIZE) -> BatchStats:
+    """Plan every record of input_path not yet in output_path and append the results."""
+    stats = BatchStats()
+    start = time.perf_counter()
+    done = completed_ids(output_path)
+    stats.skipped = len(done)
+    loop = asyncio.get_running_loop()
+    # Bounded stages: chunks in the pool (and their results until handed
+    # on), then plans waiting for or holding a model slot
+    chunk_slots = asyncio.Semaphore(2 * workers)
+    model_slots = asyncio.Semaphore(model_concurrency)
+    plan_cache = main.get_plan_cache()
+    pending = set()
+
+    def spawn(coro) -> None:
+        task = asyncio.ensure_future(coro)
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    # Line-buffered, so every finished record reaches the file at once
+    with ProcessPoolExecutor(max_workers=workers) as pool, open(output_path, "a", buffering=1) as out:
+        def write(result: dict) -> None:
+            result.pop("cache_key", None)
+            if "error" in result:
+                stats.errors += 1
+            else:
+                stats.planned += 1
+            out.write(json.dumps(result) + "\n")
+
+        async def phrase(result: dict) -> None:
+            try:
+                text = await _present(result)
+                if text:
+                    plan_cache.put(result["cache_key"], text)
+                result["text"] = text
+                stats.presented += 1
+            except Exception as e:
+                result["error"] = f"model call failed: {e!r}"
+            finally:
+                model_slots.release()
+            write(result)
+
+        async def run_chunk(chunk) -> None:
+            try:
+                results = await loop.run_in_executor(pool, plan_chunk, chunk)
+                for result in results:
+                    if not present or "error" in result or not result["tasks"]:
+                        write(result)
+                        continue
+                    cached = plan_cache.get(result["cache_key"])
+                    if cached is not None:
+                        result["text"] = cached
+                        stats.cached += 1
+                        write(result)
+                        continue
+                    await model_slots.acquire()
+                    spawn(phrase(result))
+            finally:
+                chunk_slots.release()
+
+        for chunk in _chunks(read_records(input_path, done), chunk_size):
+            await chunk_slots.acquire()
+            spawn(run_chunk(chunk))
+        while pending:
+            await asyncio.gather(*pending)
+
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", help="JSONL file of {user, raw_text, available_minutes} records")
+    parser.add_argument("output", help="JSONL file to append plans to (also the resume checkpoint)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="processes for the local pipeline (default: CPU count)")
+    parser.add_argument("--present", action="store_true", help="have the model phrase each plan")
+    parser.add_argument("--model-concurrency", type=int, default=8,
+                        help="model calls running at once with --present (default 8)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+    stats = asyncio.run(run_batch(args.input, args.output, args.workers, args.present,
+                                  args.model_concurrency, args.chunk_size))
+    print(f"{stats.planned} planned ({stats.presented} phrased, {stats.cached} from cache), "
+          f"{stats.errors} errors, {stats.skipped} already done; "
+          f"{stats.seconds:.1f} s, {stats.records_per_sec:.0f} records/s")
@@ -0,0 +1,140 @@
+"""
+Deadline resolution for Focus Buddy tasks.
+
+Task.deadline holds the raw token the user wrote after "due"/"by"
+("today", "Monday", "5pm", "10/31"). resolve_deadline turns it into a
+datetime relative to a reference clock, so tasks can be ordered by when
+they are actually due. Each reference day gets one DeadlineResolver whose
+lookup table is prefilled with the relative words and weekday names; other
+tokens (clock times, dates) are parsed once and memoized in the same table.
+"""
+
+import functools
+import re
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Optional
+
+# Day-level deadlines ("today", "Friday") are due at this time of day
+DEFAULT_DUE_TIME = time(17, 0)
+
+# Words meaning "right now"; they resolve to the reference time itself
+NOW_WORDS = frozenset(["now", "asap", "urgent", "immediately"])
+
+# Relative words -> (days from the reference day, time of day or None for DEFAULT_DUE_TIME)
+RELATIVE_WORDS: Dict[str, tuple] = {
+    "today": (0, None),
+    "eod": (0, None),
+    "tonight": (0, time(23, 59)),
+    "tomorrow": (1, None),
+    "tmrw": (1, None),
+    "soon": (2, None),
+    "next": (7, None),
+}
+
+WEEKDAYS: Dict[str, int] = {}
+for _i, _names in enumerate((("monday", "mon"), ("tuesday", "tue", "tues"), ("wednesday", "wed"),
+                             ("thursday", "thu", "thur", "thurs"), ("friday", "fri"),
+                             ("saturday", "sat"), ("sunday", "sun"))):
+    for _name in _names:
+        WEEKDAYS[_name] = _i
+
+# Largest number of parsed (non-table) tokens memoized per reference day
+MAX_MEMOIZED_TOKENS = 10_000
+
+_CLOCK_RE = re.compile(r'(\d{1,2})(?::(\d{2}))?\s*(am|pm)?$')
+_ISO_DATE_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})$')
+_MONTH_DAY_RE = re.compile(r'(\d{1,2})/(\d{1,2})$')
+
+
+def normalize_deadline(token: str) -> str:
+    return token.lower().strip(".,;:!()")
+
+
+class DeadlineResolver:
+    """Resolves deadline tokens for one reference day, memoizing every token."""
+
+    def __init__(self, today: date, due_time: time = DEFAULT_DUE_TIME):
+        self.today = today
+        self.due_time = due_time
+        self._table: Dict[str, Optional[datetime]] = {}
+        for word, (days, at) in RELATIVE_WORDS.items():
+            self._table[word] = datetime.combine(today + timedelta(days=days), at or due_time)
+        for name, weekday in WEEKDAYS.items():
+            days = (weekday - today.weekday()) % 7
+            self._table[name] = datetime.combine(today + timedelta(days=days), due_time)
+        self._parsed = 0
+
+    def resolve(self, token: str, now: datetime = None) -> Optional[datetime]:
+        """Due datetime for a token, or None if it isn't a recognizable deadline."""
+        word = normalize_deadline(token)
+        if word in NOW_WORDS:
+            return now or datetime.combine(self.today, datetime.now().time())
+        try:
+            return self._table[word]
+        except KeyError:
+            pass
+        resolved = self._parse(word)
+        if self._parsed < MAX_MEMOIZED_TOKENS:
+            self._table[word] = resolved
+            self._parsed += 1
+        return resolved
+
+    def _parse(self, word: str) -> Optional[datetime]:
+        match = _CLOCK_RE.match(word)
+        if match and (match.group(2) or match.group(3)):
+            hour, minute = int(match.group(1)), int(match.group(2) or 0)
+            meridiem = match.group(3)
+            if meridiem == "pm" and hour < 12:
+                hour += 12
+            elif meridiem == "am" and hour == 12:
+                hour = 0
+            if hour < 24 and minute < 60:
+                return datetime.combine(self.today, time(hour, minute))
+            return None
+
+        match = _ISO_DATE_RE.match(word)
+        if match:
+            return self._on(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+
+        match = _MONTH_DAY_RE.match(word)
+        if match:
+            month, day = int(match.group(1)), int(match.group(2))
+            due = self._on(self.today.year, month, day)
+            # A month/day already past this year means next year
+            if due is not None and due.date() < self.today:
+                due = self._on(self.today.year + 1, month, day)
+            return due
+        return None
+
+    def _on(self, year: int, month: int, day: int) -> Optional[datetime]:
+        try:
+            return datetime.combine(date(year, month, day), self.due_time)
+        except ValueError:
+            return None
+
+
+@functools.lru_cache(maxsize=8)
+def resolver_for(today: date) -> DeadlineResolver:
+    """Shared resolver (and lookup table) for a reference day."""
+    return DeadlineResolver(today)
+
+
+def resolve_deadline(token: str, now: datetime = None) -> Optional[datetime]:
+    """Due datetime for a deadline token relative to now (default: the
+    current local time), or None for an empty or unrecognized token."""
+    if not token:
+        return None
+    now = now or datetime.now()
+    return resolver_for(now.date()).resolve(token, now)
+
+
+def urgency_key(due: Optional[datetime], estimated_minutes: int, order: str,
+                now: datetime) -> tuple:
+    """Sort key for the "edf" (seconds until due) and "slack" (seconds until
+    due minus the task's own time) orderings; tasks with no due date sort last."""
+    if due is None:
+        return (1, 0.0)
+    seconds = (due - now).total_seconds()
+    if order == "slack":
+        seconds -= estimated_minutes * 60
+    return (0, seconds)
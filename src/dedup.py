@@ -0,0 +1,251 @@
+"""
+Near-duplicate task detection for large pasted lists.
+
+Backlogs exported from several trackers repeat the same task with slightly
+different wording ("Fix login bug", "fix the login bug."). dedupe_tasks
+finds such groups without comparing every pair: each title becomes a set
+of character 3-gram shingles, a MinHash signature of the set is cut into
+bands, and only titles sharing a band bucket (locality-sensitive hashing)
+are compared by exact Jaccard similarity. Similar titles still have to
+agree word for word (see same_words), so tasks that differ in one word
+("... auth module" / "... billing module", "Email Bob" / "Email Rob") or in
+a number ("Reply to 3 emails" / "Reply to 5 emails") are never merged.
+
+A merged task keeps the first title, the longest estimate and the earliest
+deadline of its group.
+"""
+
+import functools
+import random
+import re
+import zlib
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Sequence, Tuple
+
+from deadlines import resolve_deadline
+from duration_estimator import STOPWORDS
+from plan_cache import normalize_title
+from tools import Task
+
+# Jaccard similarity of title shingles at or above which tasks are compared
+# word by word; rewordings ("fix the login bug.") score about 0.6-0.9, but so
+# do different tasks that share most words, which same_words then keeps apart
+DEFAULT_DEDUPE_THRESHOLD = 0.6
+DEFAULT_NUM_PERM = 48
+SHINGLE_SIZE = 3
+
+# Chance that a pair exactly at the threshold shares at least one LSH bucket
+LSH_RECALL_TARGET = 0.9
+
+# Up to this many distinct titles, comparing every pair is cheaper than hashing
+ALL_PAIRS_MAX_TITLES = 64
+
+_MASK_SEED = 0x5EED
+_NUMBER_RE = re.compile(r'\d+')
+
+# Word endings that make an inflection of the same word ("bug" / "bugs")
+INFLECTION_SUFFIXES = ("s", "es", "d", "ed", "ing")
+
+
+def shingles(title: str) -> frozenset:
+    """Hashed character 3-grams of a normalized title."""
+    text = f" {normalize_title(title)} "
+    if len(text) <= SHINGLE_SIZE:
+        return frozenset([zlib.crc32(text.encode())])
+    return frozenset(zlib.crc32(text[i:i + SHINGLE_SIZE].encode())
+                     for i in range(len(text) - SHINGLE_SIZE + 1))
+
+
+def title_numbers(title: str) -> Tuple[str, ...]:
+    """Distinct digit runs of a title ("PR #4512 for v2" -> ("2", "4512")).
+    Titles whose numbers differ are different tasks, however alike."""
+    return tuple(sorted(set(_NUMBER_RE.findall(title))))
+
+
+def title_words(title: str) -> frozenset:
+    """Words of a normalized title without punctuation and stopwords."""
+    words = (word.strip(".,;:!?()[]\"'#") for word in normalize_title(title).split())
+    return frozenset(word for word in words if word and word not in STOPWORDS)
+
+
+def _same_word(word: str, other: str) -> bool:
+    """Equal, an inflection ("bug" / "bugs") or one swap of adjacent letters
+    ("login" / "lgoin"); a changed letter ("bob" / "rob") is another word."""
+    if word == other:
+        return True
+    shorter, longer = sorted((word, other), key=len)
+    if len(shorter) >= 2 and longer.startswith(shorter) and longer[len(shorter):] in INFLECTION_SUFFIXES:
+        return True
+    if len(word) != len(other) or len(word) < 4:
+        return False
+    diff = [i for i in range(len(word)) if word[i] != other[i]]
+    return (len(diff) == 2 and diff[1] == diff[0] + 1
+            and word[diff[0]] == other[diff[1]] and word[diff[1]] == other[diff[0]])
+
+
+def same_words(a: frozenset, b: frozenset) -> bool:
+    """Whether every word of each title_words set matches a word of the
+    other. Character similarity alone merges titles that differ in the one
+    word that matters ("auth" / "billing"); this is checked after it."""
+    return (all(any(_same_word(w, o) for o in b) for w in a - b)
+            and all(any(_same_word(w, o) for o in a) for w in b - a))
+
+
+def lsh_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """(bands, rows) with bands * rows == num_perm: the most selective banding
+    (most rows per band) under which a pair at the threshold still becomes a
+    candidate with probability LSH_RECALL_TARGET. Exact verification then
+    removes the false candidates."""
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= LSH_RECALL_TARGET:
+            best = (bands, rows)
+    return best
+
+
+@functools.lru_cache(maxsize=8)
+def _masks(num_perm: int) -> Tuple[int, ...]:
+    rng = random.Random(_MASK_SEED)
+    return tuple(rng.getrandbits(32) for _ in range(num_perm))
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        i, j = self.find(i), self.find(j)
+        if i != j:
+            # Keep the earlier index as the root, so groups are led by their first task
+            if j < i:
+                i, j = j, i
+            self.parent[j] = i
+
+
+def duplicate_groups(titles: Sequence[str], threshold: float = DEFAULT_DEDUPE_THRESHOLD,
+                     num_perm: int = DEFAULT_NUM_PERM) -> List[List[int]]:
+    """Indices of titles grouped by near-duplication, each group in input
+    order and the groups ordered by their first index (singletons included)."""
+    n = len(titles)
+    uf = _UnionFind(n)
+
+    # Exact repeats (after normalization) are merged without hashing
+    first_seen: Dict[str, int] = {}
+    unique = []
+    for i, title in enumerate(titles):
+        key = normalize_title(title)
+        if key in first_seen:
+            uf.union(first_seen[key], i)
+        else:
+            first_seen[key] = i
+            unique.append(i)
+
+    sets = {i: shingles(titles[i]) for i in unique}
+    words: Dict[int, frozenset] = {}
+
+    def duplicates(i: int, j: int) -> bool:
+        a, b = sets[i], sets[j]
+        if len(a & b) < threshold * len(a | b):
+            return False
+        for k in (i, j):
+            if k not in words:
+                words[k] = title_words(titles[k])
+        return same_words(words[i], words[j])
+
+    if len(unique) <= ALL_PAIRS_MAX_TITLES:
+        numbers = {i: title_numbers(titles[i]) for i in unique}
+        for k, i in enumerate(unique):
+            for j in unique[:k]:
+                if numbers[i] == numbers[j] and duplicates(i, j):
+                    uf.union(i, j)
+        return _groups(uf, n)
+
+    masks = _masks(num_perm)
+    bands, rows = lsh_bands(threshold, num_perm)
+    # Titles share most of their shingles, so each shingle's hash under
+    # every mask is computed once and a signature is a column-wise min
+    hashes: Dict[int, tuple] = {}
+    buckets = defaultdict(list)
+    for i in unique:
+        hashed = sets[i]
+        columns = []
+        for h in hashed:
+            row = hashes.get(h)
+            if row is None:
+                row = hashes[h] = tuple(h ^ mask for mask in masks)
+            columns.append(row)
+        signature = tuple(map(min, zip(*columns)))
+        # Numbers are part of the bucket key: titles that differ only in a
+        # ticket number would otherwise crowd into the same buckets
+        numbers = title_numbers(titles[i])
+        for band in range(bands):
+            buckets[band, numbers, signature[band * rows:(band + 1) * rows]].append(i)
+
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        # Compare each member with the groups already found in this bucket
+        # instead of with every other member
+        reps: List[int] = []
+        for i in members:
+            for rep in reps:
+                if uf.find(i) == uf.find(rep):
+                    break
+                if duplicates(i, rep):
+                    uf.union(i, rep)
+                    break
+            else:
+                reps.append(i)
+
+    return _groups(uf, n)
+
+
+def _groups(uf: _UnionFind, n: int) -> List[List[int]]:
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for i in range(n):
+        groups[uf.find(i)].append(i)
+    return sorted(groups.values(), key=lambda group: group[0])
+
+
+def merge_tasks(tasks: Sequence[Task], now: datetime = None) -> Task:
+    """One task for a group of duplicates: first title, longest estimate,
+    earliest deadline (resolvable deadlines win over ones that don't resolve)."""
+    deadline = ""
+    earliest = None
+    for task in tasks:
+        if not task.deadline:
+            continue
+        due = resolve_deadline(task.deadline, now)
+        if due is not None and (earliest is None or due < earliest):
+            earliest, deadline = due, task.deadline
+        elif earliest is None and not deadline:
+            deadline = task.deadline
+    return Task(title=tasks[0].title, deadline=deadline,
+                estimated_minutes=max(task.estimated_minutes for task in tasks))
+
+
+def dedupe_tasks(tasks: Sequence[Task], threshold: float = DEFAULT_DEDUPE_THRESHOLD,
+                 num_perm: int = DEFAULT_NUM_PERM, now: datetime = None) -> List[Task]:
+    """Tasks with near-duplicates merged, in order of each group's first task.
+
+    Tasks without duplicates are returned as they are.
+    """
+    tasks = list(tasks)
+    merged = []
+    for group in duplicate_groups([task.title for task in tasks], threshold, num_perm):
+        if len(group) == 1:
+            merged.append(tasks[group[0]])
+        else:
+            merged.append(merge_tasks([tasks[i] for i in group], now))
+    return merged
@@ -0,0 +1,167 @@
+"""
+Learned duration estimates for tasks written without a time.
+
+DurationEstimator keeps running statistics of how long completed tasks
+really took, per user and title keyword and per keyword across all users,
+and answers "how long will this title take for this user?" with the
+median of the most specific statistics available. Every statistic is a
+count, a running mean and a small duration histogram, so memory stays
+bounded: users are evicted least recently used and each keyword table is
+capped, dropping its rarest keywords when full.
+"""
+
+import bisect
+import heapq
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from plan_cache import normalize_title
+
+# Histogram bucket upper bounds in minutes; the last bucket takes everything longer
+DURATION_BUCKETS: Tuple[int, ...] = (5, 10, 15, 20, 25, 30, 40, 50, 60, 90, 120, 180, 240)
+
+# Words that say nothing about how long a task takes
+STOPWORDS = frozenset([
+    "the", "and", "for", "with", "from", "into", "about", "this", "that", "some",
+    "all", "new", "my", "our", "to", "of", "on", "in", "a", "an", "up",
+])
+
+
+def title_keywords(title: str) -> List[str]:
+    """Distinct keywords of a title, in order."""
+    seen = []
+    for word in normalize_title(title).split():
+        word = word.strip(".,;:!?()[]\"'")
+        if len(word) >= 3 and word not in STOPWORDS and not word.isdigit() and word not in seen:
+            seen.append(word)
+    return seen
+
+
+class RunningStats:
+    """Count, running mean and bucketed histogram of durations."""
+
+    __slots__ = ("count", "mean", "histogram")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.histogram = [0] * (len(DURATION_BUCKETS) + 1)
+
+    def add(self, minutes: float) -> None:
+        self.count += 1
+        self.mean += (minutes - self.mean) / self.count
+        self.histogram[bisect.bisect_left(DURATION_BUCKETS, minutes)] += 1
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile: the upper bound of the bucket it falls in
+        (the running mean for the open-ended last bucket)."""
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.histogram):
+            seen += n
+            if n and seen >= target:
+                return DURATION_BUCKETS[i] if i < len(DURATION_BUCKETS) else max(self.mean, DURATION_BUCKETS[-1])
+        return self.mean
+
+
+def _bounded_add(table: Dict[str, RunningStats], key: str, minutes: float, max_size: int) -> None:
+    stats = table.get(key)
+    if stats is None:
+        if len(table) >= max_size:
+            # Drop the rarest tenth in one go: one O(n log n) selection every
+            # n/10 inserts, so O(log n) amortized per insert
+            rarest = heapq.nsmallest(max(1, max_size // 10), table, key=lambda k: table[k].count)
+            for k in rarest:
+                del table[k]
+        stats = table[key] = RunningStats()
+    stats.add(minutes)
+
+
+class _UserStats:
+    __slots__ = ("overall", "keywords")
+
+    def __init__(self):
+        self.overall = RunningStats()
+        self.keywords: Dict[str, RunningStats] = {}
+
+
+class DurationEstimator:
+    """Per-user and per-keyword duration statistics learned from completions."""
+
+    def __init__(self, max_users: int = 10_000, max_user_keywords: int = 256,
+                 max_keywords: int = 20_000, min_samples: int = 2, quantile: float = 0.5,
+                 prior_minutes: int = 10):
+        self.max_users = max_users
+        self.max_user_keywords = max_user_keywords
+        self.max_keywords = max_keywords
+        self.min_samples = min_samples
+        self.quantile = quantile
+        self.prior_minutes = prior_minutes
+        self._users: "OrderedDict[str, _UserStats]" = OrderedDict()
+        self._keywords: Dict[str, RunningStats] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, user_id: str, title: str, actual_minutes: float) -> None:
+        """Learn from one completed task."""
+        if actual_minutes <= 0:
+            return
+        keywords = title_keywords(title)
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is None:
+                if len(self._users) >= self.max_users:
+                    self._users.popitem(last=False)
+                user = self._users[user_id] = _UserStats()
+            else:
+                self._users.move_to_end(user_id)
+            user.overall.add(actual_minutes)
+            for word in keywords:
+                _bounded_add(user.keywords, word, actual_minutes, self.max_user_keywords)
+                _bounded_add(self._keywords, word, actual_minutes, self.max_keywords)
+
+    def observe_many(self, completions: Iterable[Tuple[str, str, float]]) -> int:
+        """Learn from (user_id, title, actual_minutes) tuples; returns how many."""
+        n = 0
+        for user_id, title, actual_minutes in completions:
+            self.observe(user_id, title, actual_minutes)
+            n += 1
+        return n
+
+    def estimate(self, user_id: str, title: str) -> Optional[int]:
+        """Learned minutes for a title, or None when nothing relevant is known.
+
+        Uses the user's own keyword statistics if any keyword has enough
+        samples, then everyone's keyword statistics, then the user's overall
+        median. Matching keywords are combined weighted by sample count.
+        """
+        keywords = title_keywords(title)
+        with self._lock:
+            user = self._users.get(user_id)
+            tables = ([user.keywords] if user is not None else []) + [self._keywords]
+            for table in tables:
+                matched = [table[w] for w in keywords
+                           if w in table and table[w].count >= self.min_samples]
+                if matched:
+                    total = sum(s.count for s in matched)
+                    value = sum(s.quantile(self.quantile) * s.count for s in matched) / total
+                    return max(1, round(value))
+            if user is not None and user.overall.count >= self.min_samples:
+                return max(1, round(user.overall.quantile(self.quantile)))
+        return None
+
+    def default_minutes(self, user_id: str) -> Callable[[str], int]:
+        """Title -> minutes function for parse_tasks(default_minutes=...)."""
+        def default(title: str) -> int:
+            minutes = self.estimate(user_id, title)
+            return self.prior_minutes if minutes is None else minutes
+        return default
+
+    def stats(self) -> dict:
+        """Sizes of the statistics tables."""
+        with self._lock:
+            return {
+                "users": len(self._users),
+                "user_keywords": sum(len(u.keywords) for u in self._users.values()),
+                "keywords": len(self._keywords),
+            }
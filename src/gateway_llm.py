@@ -0,0 +1,58 @@
+"""
+ADK model that sends every model turn through a model_gateway.ModelGateway.
+
+GatewayLlm wraps the real (or stub) model. Turns with the same request key
+share one upstream call while it is in flight; each caller gets its own copy
+of the responses, since ADK attaches them to that caller's session.
+"""
+
+import hashlib
+import json
+from typing import AsyncGenerator
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from pydantic import ConfigDict
+
+from model_gateway import ModelGateway
+
+
+def request_key(llm_request: LlmRequest, stream: bool = False) -> str:
+    """Hash of everything the model sees in a turn: model, config (system
+    instruction, tool declarations), tools and contents. Function call ids
+    are left out; ADK makes them up per session."""
+    contents = []
+    for content in llm_request.contents or []:
+        data = content.model_dump(mode="json", exclude_none=True)
+        for part in data.get("parts", []):
+            for field in ("function_call", "function_response"):
+                if field in part:
+                    part[field].pop("id", None)
+        contents.append(data)
+    config = llm_request.config
+    payload = {
+        "model": llm_request.model,
+        "stream": stream,
+        "config": config.model_dump(mode="json", exclude_none=True) if config else None,
+        "tools": sorted(llm_request.tools_dict or {}),
+        "contents": contents,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class GatewayLlm(BaseLlm):
+    """upstream behind a gateway: coalesced, rate limited and prioritized."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    upstream: BaseLlm
+    gateway: ModelGateway
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        responses = self.gateway.call(request_key(llm_request, stream),
+                                      lambda: self.upstream.generate_content_async(llm_request, stream))
+        async for response in responses:
+            yield response.model_copy(deep=True)
@@ -0,0 +1,270 @@
+"""
+Durable history of plans, planned tasks and completions.
+
+Every record is appended to a JSON-lines log, which is the source of truth,
+and indexed in SQLite by user, day and normalized task title for the
+check-in and next-plan queries (tasks carried over many sessions, actual vs.
+estimated minutes). Writes are queued and applied by a background thread in
+batches, one log write and one SQLite transaction per batch, so recording a
+plan costs the caller a queue put. Recording never blocks: callers run on
+the event loop, so when the writer falls max_pending records behind, new
+records are dropped and counted in `dropped` rather than waited on. The
+index can be rebuilt from the log.
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import traceback
+from typing import Iterable, List, Optional, Tuple
+
+from plan_cache import normalize_title
+from tools import Task, ScheduledBlock
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS plans (
+    user_id TEXT NOT NULL, session_id TEXT NOT NULL, day TEXT NOT NULL, ts REAL NOT NULL,
+    available_minutes INTEGER NOT NULL, energy TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS plan_tasks (
+    user_id TEXT NOT NULL, session_id TEXT NOT NULL, day TEXT NOT NULL, ts REAL NOT NULL,
+    title_key TEXT NOT NULL, title TEXT NOT NULL, estimated_minutes INTEGER NOT NULL,
+    scheduled INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS completions (
+    user_id TEXT NOT NULL, session_id TEXT NOT NULL, day TEXT NOT NULL, ts REAL NOT NULL,
+    title_key TEXT NOT NULL, title TEXT NOT NULL, estimated_minutes INTEGER NOT NULL,
+    actual_minutes INTEGER
+);
+CREATE INDEX IF NOT EXISTS plans_user_day ON plans (user_id, day);
+CREATE INDEX IF NOT EXISTS plan_tasks_user_title ON plan_tasks (user_id, title_key, ts, session_id);
+CREATE INDEX IF NOT EXISTS plan_tasks_user_day ON plan_tasks (user_id, day);
+CREATE INDEX IF NOT EXISTS completions_user_title ON completions (user_id, title_key, ts);
+CREATE INDEX IF NOT EXISTS completions_user_day ON completions (user_id, day);
+"""
+
+LOG_NAME = "history.jsonl"
+INDEX_NAME = "history.sqlite"
+
+# Sentinel telling the writer thread to stop
+_STOP = object()
+
+
+def _day(ts: float) -> str:
+    return time.strftime("%Y-%m-%d", time.localtime(ts))
+
+
+class HistoryStore:
+    """Append-only plan/completion log in directory `path` with a SQLite index."""
+
+    def __init__(self, path: str, batch_size: int = 1000, flush_interval: float = 0.2,
+                 max_pending: int = 100_000, clock=time.time):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._clock = clock
+        self._log = open(os.path.join(path, LOG_NAME), "a", encoding="utf-8")
+        self._db = sqlite3.connect(os.path.join(path, INDEX_NAME), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+        self._db_lock = threading.Lock()
+        self._pending = queue.Queue(maxsize=max_pending)
+        # Records not written because the queue was full
+        self.dropped = 0
+        self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self._writer.start()
+
+    # Recording (called on the request path; only enqueues)
+
+    def record_plan(self, user_id: str, session_id: str, tasks: Iterable[Task],
+                    schedule: Iterable[ScheduledBlock], available_minutes: int,
+                    energy: str = "medium") -> None:
+        """Queue a finished plan: its tasks and which of them got a block."""
+        scheduled = {block.task_title.removesuffix(" (partial)") for block in schedule}
+        self._put({
+            "type": "plan", "ts": self._clock(), "user_id": user_id, "session_id": session_id,
+            "available_minutes": available_minutes, "energy": energy,
+            "tasks": [[task.title, task.estimated_minutes, task.title in scheduled] for task in tasks],
+        })
+
+    def record_completion(self, user_id: str, session_id: str, title: str,
+                          estimated_minutes: int, actual_minutes: Optional[int] = None) -> None:
+        """Queue a completed task; actual_minutes is None when the user didn't say."""
+        self._put({
+            "type": "completion", "ts": self._clock(), "user_id": user_id,
+            "session_id": session_id, "title": title, "estimated_minutes": estimated_minutes,
+            "actual_minutes": actual_minutes,
+        })
+
+    def _put(self, record: dict) -> None:
+        if self._writer is None:
+            raise RuntimeError("HistoryStore is closed")
+        try:
+            self._pending.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    # Queries
+
+    def carried_over(self, user_id: str, min_sessions: int = 3, limit: int = 20) -> List[dict]:
+        """Tasks planned in at least min_sessions sessions since they were last completed."""
+        return self._query(
+            """
+            SELECT MAX(p.title), COUNT(DISTINCT p.session_id) AS sessions, MIN(p.day), MAX(p.day)
+            FROM plan_tasks p
+            LEFT JOIN (
+                SELECT title_key, MAX(ts) AS done_at FROM completions
+                WHERE user_id = ? GROUP BY title_key
+            ) c ON c.title_key = p.title_key
+            WHERE p.user_id = ? AND p.ts > COALESCE(c.done_at, 0)
+            GROUP BY p.title_key
+            HAVING sessions >= ?
+            ORDER BY sessions DESC, MIN(p.ts)
+            LIMIT ?
+            """,
+            (user_id, user_id, min_sessions, limit),
+            ("title", "sessions", "first_day", "last_day"),
+        )
+
+    def estimate_accuracy(self, user_id: Optional[str] = None) -> List[dict]:
+        """Per user: completions with a reported duration, total estimated and
+        actual minutes, and actual/estimated as a ratio."""
+        where = "WHERE actual_minutes IS NOT NULL"
+        params = ()
+        if user_id is not None:
+            where += " AND user_id = ?"
+            params = (user_id,)
+        rows = self._query(
+            f"""
+            SELECT user_id, COUNT(*), SUM(estimated_minutes), SUM(actual_minutes)
+            FROM completions {where} GROUP BY user_id ORDER BY user_id
+            """,
+            params,
+            ("user_id", "completions", "estimated_minutes", "actual_minutes"),
+        )
+        for row in rows:
+            row["ratio"] = row["actual_minutes"] / row["estimated_minutes"] if row["estimated_minutes"] else None
+        return rows
+
+    def completions(self, user_id: str, since_day: str = "", limit: int = 50) -> List[dict]:
+        """Most recent completions for a user on or after since_day (YYYY-MM-DD)."""
+        return self._query(
+            """
+            SELECT day, title, estimated_minutes, actual_minutes FROM completions
+            WHERE user_id = ? AND day >= ? ORDER BY day DESC, ts DESC LIMIT ?
+            """,
+            (user_id, since_day, limit),
+            ("day", "title", "estimated_minutes", "actual_minutes"),
+        )
+
+    def timed_completions(self, limit: int = 100_000) -> List[Tuple[str, str, int]]:
+        """(user_id, title, actual_minutes) of the latest completions with a
+        reported duration, oldest first; used to warm up DurationEstimator."""
+        with self._db_lock:
+            rows = self._db.execute(
+                """
+                SELECT user_id, title, actual_minutes FROM completions
+                WHERE actual_minutes IS NOT NULL ORDER BY ts DESC LIMIT ?
+                """,
+                (limit,),
+            ).fetchall()
+        rows.reverse()
+        return rows
+
+    def _query(self, sql: str, params, columns) -> List[dict]:
+        with self._db_lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    # Writing
+
+    def flush(self) -> None:
+        """Block until everything queued so far is in the log and the index."""
+        self._pending.join()
+
+    def close(self) -> None:
+        """Write out pending records and stop the writer."""
+        if self._writer is None:
+            return
+        self._pending.put(_STOP)
+        self._writer.join()
+        self._writer = None
+        self._log.close()
+        self._db.close()
+
+    def rebuild_index(self) -> int:
+        """Recreate the SQLite index from the log; returns the number of records."""
+        self.flush()
+        with self._db_lock:
+            for table in ("plans", "plan_tasks", "completions"):
+                self._db.execute(f"DELETE FROM {table}")
+        count = 0
+        batch = []
+        with open(os.path.join(self.path, LOG_NAME), encoding="utf-8") as log:
+            for line in log:
+                if line.strip():
+                    batch.append(json.loads(line))
+                if len(batch) >= self.batch_size:
+                    count += len(batch)
+                    self._index(batch)
+                    batch = []
+        count += len(batch)
+        self._index(batch)
+        return count
+
+    def _write_loop(self) -> None:
+        while True:
+            batch = [self._pending.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not _STOP:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._pending.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            stop = batch[-1] is _STOP
+            records = batch[:-1] if stop else batch
+            try:
+                if records:
+                    self._log.write("".join(json.dumps(record, separators=(",", ":")) + "\n"
+                                            for record in records))
+                    self._log.flush()
+                    self._index(records)
+            except Exception:
+                # Keep the writer alive; the log is replayable with rebuild_index()
+                traceback.print_exc()
+            finally:
+                for _ in batch:
+                    self._pending.task_done()
+            if stop:
+                return
+
+    def _index(self, records: List[dict]) -> None:
+        plans, plan_tasks, completions = [], [], []
+        for record in records:
+            ts = record["ts"]
+            day = _day(ts)
+            user_id, session_id = record["user_id"], record["session_id"]
+            if record["type"] == "plan":
+                plans.append((user_id, session_id, day, ts, record["available_minutes"], record["energy"]))
+                plan_tasks.extend(
+                    (user_id, session_id, day, ts, normalize_title(title), title, minutes, int(scheduled))
+                    for title, minutes, scheduled in record["tasks"]
+                )
+            elif record["type"] == "completion":
+                completions.append((user_id, session_id, day, ts, normalize_title(record["title"]),
+                                    record["title"], record["estimated_minutes"], record["actual_minutes"]))
+        with self._db_lock:
+            self._db.executemany("INSERT INTO plans VALUES (?, ?, ?, ?, ?, ?)", plans)
+            self._db.executemany("INSERT INTO plan_tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?)", plan_tasks)
+            self._db.executemany("INSERT INTO completions VALUES (?, ?, ?, ?, ?, ?, ?, ?)", completions)
+            self._db.commit()
@@ -0,0 +1,184 @@
+"""
+Incremental re-planning during a focus session.
+
+When the user reports progress ("done with PRs, emails took longer") the
+plan only changes from the current minute on. IncrementalPlanner keeps the
+pending tasks in a heap ordered like prioritize_tasks (then apply_energy)
+would order them, so complete / insert / update_duration are O(log n), and
+rebuilds only the greedy schedule suffix after the current minute: that
+costs one heap pop per block in the window, not a re-sort of every task.
+Each change returns a ScheduleDiff of the blocks that changed.
+
+Superseded heap entries (completed tasks, old durations) are skipped when
+popped rather than searched for and removed (lazy deletion).
+"""
+
+import heapq
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pipeline import ENERGY_MAX_TASK_MINUTES
+from plan_cache import normalize_title
+from scoring import PriorityScorer, default_scorer
+from tools import Task, ScheduledBlock
+
+# Same rule as create_focus_schedule: a task that doesn't fit gets a partial
+# block if at least this many minutes are left
+MIN_PARTIAL_MINUTES = 5
+
+
+@dataclass
+class ScheduleDiff:
+    """Blocks dropped from and added to the schedule by one change."""
+    removed: List[ScheduledBlock] = field(default_factory=list)
+    added: List[ScheduledBlock] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.removed or self.added)
+
+
+def _block_key(block: ScheduledBlock) -> Tuple[int, int, str]:
+    return block.start_minute, block.end_minute, block.task_title
+
+
+class IncrementalPlanner:
+    """Greedy focus schedule that is updated in place as tasks change.
+
+    The initial schedule equals
+    create_focus_schedule(apply_energy(prioritize_tasks(tasks), energy), available_minutes).
+    Completed tasks stay at the front of the schedule as they actually
+    happened; the current minute is the end of the last completed block.
+    """
+
+    def __init__(self, tasks: Iterable[Task], available_minutes: int,
+                 energy: str = "medium", scorer: PriorityScorer = None):
+        self.available_minutes = available_minutes
+        self.now = 0
+        self.completed: List[ScheduledBlock] = []
+        self._scorer = scorer or default_scorer
+        self._energy_limit = ENERGY_MAX_TASK_MINUTES.get(energy.strip().lower())
+        self._tasks: Dict[int, Task] = {}      # pending tasks by id
+        self._versions: Dict[int, int] = {}    # id -> version of its live heap entry
+        self._by_title: Dict[str, List[int]] = {}
+        self._heap: List[tuple] = []
+        self._next_id = 0
+        for task in tasks:
+            self._heap.append(self._register(task))
+        heapq.heapify(self._heap)
+        self._suffix = self._plan_suffix()
+
+    @property
+    def schedule(self) -> List[ScheduledBlock]:
+        """Completed blocks followed by the plan for the rest of the window."""
+        return self.completed + self._suffix
+
+    def pending(self) -> List[Task]:
+        """Pending tasks in priority order."""
+        live = sorted(e for e in self._heap if self._versions.get(e[3]) == e[4])
+        return [self._tasks[e[3]] for e in live]
+
+    def complete(self, title: str, actual_minutes: Optional[int] = None) -> ScheduleDiff:
+        """Mark a pending task done, taking actual_minutes (default: its
+        estimate) from the current minute, and re-plan the rest."""
+        task_id = self._find(title)
+        task = self._tasks.pop(task_id)
+        del self._versions[task_id]
+        self._by_title[normalize_title(task.title)].remove(task_id)
+
+        minutes = task.estimated_minutes if actual_minutes is None else actual_minutes
+        done = ScheduledBlock(start_minute=self.now, end_minute=self.now + minutes,
+                              task_title=task.title)
+        self.completed.append(done)
+        self.now += minutes
+        diff = self._replan()
+        diff.added.insert(0, done)
+        return diff
+
+    def insert(self, task: Task) -> ScheduleDiff:
+        """Add a new pending task."""
+        return self.insert_many([task])
+
+    def insert_many(self, tasks: Iterable[Task]) -> ScheduleDiff:
+        """Add several pending tasks with a single re-plan."""
+        for task in tasks:
+            self._push(self._register(task))
+        return self._replan()
+
+    def update_duration(self, title: str, minutes: int) -> ScheduleDiff:
+        """Change a pending task's estimate (the time it still needs)."""
+        task_id = self._find(title)
+        task = self._tasks[task_id]
+        task.estimated_minutes = minutes
+        self._push(self._entry(task_id, task, self._versions[task_id] + 1))
+        return self._replan()
+
+    def _find(self, title: str) -> int:
+        ids = self._by_title.get(normalize_title(title))
+        if not ids:
+            raise KeyError(f"No pending task {title!r}")
+        return ids[0]
+
+    def _register(self, task: Task) -> tuple:
+        task_id = self._next_id
+        self._next_id += 1
+        self._tasks[task_id] = task
+        self._by_title.setdefault(normalize_title(task.title), []).append(task_id)
+        return self._entry(task_id, task, 0)
+
+    def _entry(self, task_id: int, task: Task, version: int) -> tuple:
+        # Sorts like prioritize_tasks (score, then shorter first, then input
+        # order) after apply_energy's stable move of too-long tasks to the back
+        task.priority_score = self._scorer.score(task)
+        too_long = self._energy_limit is not None and task.estimated_minutes > self._energy_limit
+        self._versions[task_id] = version
+        return (too_long, -task.priority_score, task.estimated_minutes, task_id, version)
+
+    def _push(self, entry: tuple) -> None:
+        heapq.heappush(self._heap, entry)
+        # Drop superseded entries once they make up most of the heap
+        if len(self._heap) > 2 * len(self._tasks) + 16:
+            self._heap = [e for e in self._heap if self._versions.get(e[3]) == e[4]]
+            heapq.heapify(self._heap)
+
+    def _plan_suffix(self) -> List[ScheduledBlock]:
+        """Greedy schedule from the current minute, popping only as many
+        heap entries as there are blocks (plus superseded ones)."""
+        blocks = []
+        taken = []
+        current_minute = self.now
+        heap = self._heap
+        while heap:
+            entry = heapq.heappop(heap)
+            if self._versions.get(entry[3]) != entry[4]:
+                continue  # superseded: dropped for good
+            taken.append(entry)
+            task = self._tasks[entry[3]]
+            if current_minute + task.estimated_minutes <= self.available_minutes:
+                blocks.append(ScheduledBlock(
+                    start_minute=current_minute,
+                    end_minute=current_minute + task.estimated_minutes,
+                    task_title=task.title
+                ))
+                current_minute += task.estimated_minutes
+            else:
+                remaining = self.available_minutes - current_minute
+                if remaining >= MIN_PARTIAL_MINUTES:
+                    blocks.append(ScheduledBlock(
+                        start_minute=current_minute,
+                        end_minute=self.available_minutes,
+                        task_title=f"{task.title} (partial)"
+                    ))
+                break
+        for entry in taken:
+            heapq.heappush(heap, entry)
+        return blocks
+
+    def _replan(self) -> ScheduleDiff:
+        old = self._suffix
+        self._suffix = self._plan_suffix()
+        old_keys = {_block_key(b) for b in old}
+        new_keys = {_block_key(b) for b in self._suffix}
+        return ScheduleDiff(
+            removed=[b for b in old if _block_key(b) not in new_keys],
+            added=[b for b in self._suffix if _block_key(b) not in old_keys],
+        )
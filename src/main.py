@@ -1,108 +1,615 @@
 import os
+import sys
+import uuid
 import asyncio
-from google.adk.models.google_llm import Gemini
-from google.adk import Agent
-from google.adk.runners import InMemoryRunner
+import functools
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, AsyncIterator
 from tools import parse_tasks, prioritize_tasks, create_focus_schedule, Task, ScheduledBlock
+from dedup import DEFAULT_DEDUPE_THRESHOLD
+from pipeline import DEFAULT_TOP_K, build_focus_plan, describe_plan, resolve_tasks, shortlist_tasks, describe_shortlist, describe_rest
+from session_store import SessionStore
+from plan_cache import PlanCache, plan_key, normalize_title
+from history_store import HistoryStore
+from duration_estimator import DurationEstimator
+from tracing import tracer, traced_tool, before_model_callback, after_model_callback, on_model_error_callback
+from tool_output import task_index, format_parsed, format_prioritized, format_schedule, format_schedule_diff
+from incremental_planner import IncrementalPlanner
+from model_gateway import ModelGateway
+from session_manager import DEFAULT_KEEP_TURNS, DEFAULT_MAX_SESSIONS, DEFAULT_TTL_SECONDS, SessionManager
 
-# Configure API key
-os.environ['GOOGLE_API_KEY'] = os.environ.get('GEMINI_API_KEY', '')
+# google.adk is heavy to import; it is only loaded when the model, agents or
+# runners are first built (see the get_* factories below)
+if TYPE_CHECKING:
+    from google.adk.tools.tool_context import ToolContext
 
-# Session memory
-session_memory = {
-    "current_focus_plan": None,
-    "tasks": [],
-    "completed": []
-}
+AGENT_SPEC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'agent_spec.md')
 
-# Read agent spec
-with open('src/agent_spec.md', 'r') as f:
-    AGENT_SPEC = f.read()
+# Session memory, one dict per (user_id, session_id)
+session_store = SessionStore()
+
+@functools.lru_cache(maxsize=None)
+def load_agent_spec() -> str:
+    """Agent spec text, read once from agent_spec.md next to this file."""
+    with open(AGENT_SPEC_PATH, 'r') as f:
+        return f.read()
+
+@functools.lru_cache(maxsize=None)
+def get_plan_cache() -> PlanCache:
+    """Finished plans for repeated task lists; set FOCUS_BUDDY_PLAN_CACHE to a
+    file path to keep them across restarts."""
+    return PlanCache(path=os.environ.get('FOCUS_BUDDY_PLAN_CACHE'))
+
+@functools.lru_cache(maxsize=None)
+def get_session_manager() -> SessionManager:
+    """Expiry, LRU eviction and history compaction for the sessions in
+    session_store and the shared runners: FOCUS_BUDDY_SESSION_TTL (idle
+    seconds, default 3600), FOCUS_BUDDY_MAX_SESSIONS (default 10000) and
+    FOCUS_BUDDY_KEEP_TURNS (turns kept verbatim, default 4); 0 turns one off."""
+    return SessionManager(session_store,
+                          ttl_seconds=float(os.environ.get('FOCUS_BUDDY_SESSION_TTL', DEFAULT_TTL_SECONDS)),
+                          max_sessions=int(os.environ.get('FOCUS_BUDDY_MAX_SESSIONS', DEFAULT_MAX_SESSIONS)),
+                          keep_turns=int(os.environ.get('FOCUS_BUDDY_KEEP_TURNS', DEFAULT_KEEP_TURNS)))
+
+@functools.lru_cache(maxsize=None)
+def get_history_store():
+    """Durable plan and completion history in the directory named by
+    FOCUS_BUDDY_HISTORY, or None when it is not set (history is not kept)."""
+    path = os.environ.get('FOCUS_BUDDY_HISTORY')
+    return HistoryStore(path) if path else None
+
+@functools.lru_cache(maxsize=None)
+def get_duration_estimator() -> DurationEstimator:
+    """Learned task durations, warmed up from the history store if there is one."""
+    estimator = DurationEstimator()
+    history = get_history_store()
+    if history is not None:
+        estimator.observe_many(history.timed_completions())
+    return estimator
+
+def record_plan(user_id: str, session_id: str, tasks, schedule, available_minutes: int,
+                energy: str = "medium") -> None:
+    """Add a finished plan to the history store, if one is configured."""
+    history = get_history_store()
+    if history is not None:
+        history.record_plan(user_id, session_id, tasks, schedule, available_minutes, energy)
 
 # Define tools for ADK
-def parse_tasks_tool(raw_text: str) -> str:
+@traced_tool
+def parse_tasks_tool(raw_text: str, tool_context: "ToolContext") -> str:
     """Parse messy task text into structured Task objects."""
-    tasks = parse_tasks(raw_text)
+    session_memory = session_store.for_context(tool_context)
+    tasks = parse_tasks(raw_text, get_duration_estimator().default_minutes(tool_context.session.user_id))
     session_memory["tasks"] = tasks
-    result = f"Found {len(tasks)} tasks:\n"
-    for i, task in enumerate(tasks, 1):
-        result += f"{i}. {task.title} ({task.estimated_minutes} min"
-        if task.deadline:
-            result += f", due: {task.deadline}"
-        result += ")\n"
-    return result
+    session_memory["task_index"] = task_index(tasks)
+    # The previous plan no longer matches these tasks
+    session_memory["current_focus_plan"] = None
+    session_memory["planner"] = None
+    tracer.annotate(input_lines=raw_text.count("\n") + 1, tasks=len(tasks))
+    return format_parsed(tasks)
 
-def prioritize_tasks_tool() -> str:
+@traced_tool
+def prioritize_tasks_tool(tool_context: "ToolContext") -> str:
     """Prioritize tasks from session memory."""
+    session_memory = session_store.for_context(tool_context)
     if not session_memory["tasks"]:
         return "No tasks to prioritize. Call parse_tasks first."
     
     prioritized = prioritize_tasks(session_memory["tasks"])
     session_memory["tasks"] = prioritized
-    
-    result = "Tasks prioritized (urgent/deadline first, then by time):\n"
-    for i, task in enumerate(prioritized, 1):
-        result += f"{i}. {task.title} ({task.estimated_minutes} min)\n"
-    return result
+    tracer.annotate(tasks=len(prioritized))
+    return format_prioritized(prioritized, session_memory["task_index"])
 
-def create_schedule_tool(available_minutes: int = 25) -> str:
+@traced_tool
+def create_schedule_tool(tool_context: "ToolContext", available_minutes: int = 25) -> str:
     """Create a focus schedule from prioritized tasks."""
+    session_memory = session_store.for_context(tool_context)
     if not session_memory["tasks"]:
         return "No tasks available. Call parse_tasks and prioritize_tasks first."
     
     schedule = create_focus_schedule(session_memory["tasks"], available_minutes)
     session_memory["current_focus_plan"] = schedule
-    
-    result = f"Created {available_minutes}-minute focus plan with {len(schedule)} blocks:\n"
-    for block in schedule:
-        result += f"  {block.start_minute}-{block.end_minute} min: {block.task_title}\n"
+    session_memory["planner"] = None  # built from the tasks on the first adjustment
+    session_memory["available_minutes"] = available_minutes
+    record_plan(tool_context.session.user_id, tool_context.session.id,
+                session_memory["tasks"], schedule, available_minutes)
+    tracer.annotate(tasks=len(session_memory["tasks"]), blocks=len(schedule))
+    return format_schedule(schedule, available_minutes, session_memory["task_index"])
+
+@traced_tool
+def plan_focus_session_tool(raw_text: str, tool_context: "ToolContext", available_minutes: int = 25,
+                            energy: str = "medium") -> str:
+    """Parse, prioritize and schedule a task list in one step and return the finished plan.
+
+    energy is the user's energy level: low, medium or high.
+    """
+    session_memory = session_store.for_context(tool_context)
+    plan = build_focus_plan(raw_text, available_minutes, energy=energy,
+                            default_minutes=get_duration_estimator().default_minutes(
+                                tool_context.session.user_id),
+                            dedupe_threshold=get_dedupe_threshold())
+    session_memory["tasks"] = plan.tasks
+    session_memory["task_index"] = task_index(plan.tasks)
+    session_memory["current_focus_plan"] = plan.schedule
+    session_memory["planner"] = IncrementalPlanner(plan.tasks, available_minutes, energy=energy)
+    record_plan(tool_context.session.user_id, tool_context.session.id,
+                plan.tasks, plan.schedule, available_minutes, energy)
+    tracer.annotate(input_lines=raw_text.count("\n") + 1, tasks=len(plan.tasks),
+                    blocks=len(plan.schedule))
+    return describe_plan(plan)
+
+@traced_tool
+def complete_task_tool(title: str, tool_context: "ToolContext", actual_minutes: int = 0) -> str:
+    """Mark a task from the current plan as done during a check-in.
+
+    actual_minutes is how long it really took, or 0 if the user didn't say.
+    """
+    session = tool_context.session
+    return complete_task(session.user_id, session.id, title, actual_minutes)
+
+def complete_task(user_id: str, session_id: str, title: str, actual_minutes: int = 0) -> str:
+    """complete_task_tool for a session given by id."""
+    session_memory = session_store.get(user_id, session_id)
+    key = normalize_title(title)
+    task = next((task for task in session_memory["tasks"] if normalize_title(task.title) == key), None)
+    if task is None:
+        return f"'{title}' is not in the current plan."
+
+    # Check the task is still pending (and re-plan) before recording
+    # anything, so a repeated completion isn't counted twice
+    total = sum(normalize_title(t.title) == key for t in session_memory["tasks"])
+    done = sum(normalize_title(c["title"]) == key for c in session_memory["completed"])
+    if done >= total:
+        return f"'{task.title}' is already marked done."
+    planner = _session_planner(session_memory)
+    diff = None
+    if planner is not None:
+        try:
+            diff = planner.complete(task.title, actual_minutes or None)
+        except KeyError:  # not pending in the planner
+            return f"'{task.title}' is already marked done."
+
+    completion = {"title": task.title, "estimated_minutes": task.estimated_minutes,
+                  "actual_minutes": actual_minutes or None}
+    session_memory["completed"].append(completion)
+    if actual_minutes:
+        get_duration_estimator().observe(user_id, task.title, actual_minutes)
+    history = get_history_store()
+    if history is not None:
+        history.record_completion(user_id, session_id, task.title, task.estimated_minutes,
+                                  actual_minutes or None)
+    done = len(session_memory["completed"])
+    result = f"Marked '{task.title}' done ({done} of {len(session_memory['tasks'])} tasks completed)."
+    if diff is not None:
+        session_memory["current_focus_plan"] = planner.schedule
+        result += "\n" + format_schedule_diff(diff, session_memory["task_index"])
     return result
 
-# Create model
-model = Gemini(model="gemini-2.5-flash-lite")
+def _session_planner(session_memory: dict):
+    """The session's IncrementalPlanner, built on first use from the current
+    tasks; None if there is no plan yet."""
+    if session_memory["planner"] is None and session_memory["current_focus_plan"] is not None:
+        session_memory["planner"] = IncrementalPlanner(
+            session_memory["tasks"], session_memory.get("available_minutes", 25))
+    return session_memory["planner"]
 
-# Create ADK Agent
-agent = Agent(
-    name="FocusBuddy",
-    model=model,
-    instruction=AGENT_SPEC + """
+@traced_tool
+def update_task_minutes_tool(title: str, minutes: int, tool_context: "ToolContext") -> str:
+    """Change how many minutes a task in the current plan still needs, and
+    return the schedule changes."""
+    session = tool_context.session
+    return update_task_minutes(session.user_id, session.id, title, minutes)
 
-You must follow this workflow:
-1. Call parse_tasks_tool with the user's task list
-2. Call prioritize_tasks_tool to sort them
-3. Call create_schedule_tool with the available minutes
-4. Present the final plan with: Summary, Timeline, Checklist, Check-in""",
-    tools=[parse_tasks_tool, prioritize_tasks_tool, create_schedule_tool]
-)
+def update_task_minutes(user_id: str, session_id: str, title: str, minutes: int) -> str:
+    """update_task_minutes_tool for a session given by id."""
+    session_memory = session_store.get(user_id, session_id)
+    planner = _session_planner(session_memory)
+    if planner is None:
+        return "No plan yet. Call plan_focus_session first."
+    try:
+        diff = planner.update_duration(title, minutes)
+    except KeyError:
+        return f"'{title}' is not a pending task in the current plan."
+    session_memory["current_focus_plan"] = planner.schedule
+    return format_schedule_diff(diff, session_memory["task_index"])
 
-# Create runner
-runner = InMemoryRunner(agent=agent)
+@traced_tool
+def add_tasks_tool(raw_text: str, tool_context: "ToolContext") -> str:
+    """Add new tasks to the current plan and return the schedule changes."""
+    session = tool_context.session
+    return add_tasks(session.user_id, session.id, raw_text)
 
-async def run_focus_buddy(user_input: str, available_minutes: int = 25):
-    """Main agent loop using ADK with InMemoryRunner."""
-    
+def add_tasks(user_id: str, session_id: str, raw_text: str) -> str:
+    """add_tasks_tool for a session given by id."""
+    session_memory = session_store.get(user_id, session_id)
+    planner = _session_planner(session_memory)
+    if planner is None:
+        return "No plan yet. Call plan_focus_session first."
+    new_tasks = parse_tasks(raw_text, get_duration_estimator().default_minutes(user_id))
+    if not new_tasks:
+        return "No tasks found in that text."
+    for task in new_tasks:
+        session_memory["tasks"].append(task)
+        session_memory["task_index"].setdefault(task.title, len(session_memory["tasks"]))
+    diff = planner.insert_many(new_tasks)
+    session_memory["current_focus_plan"] = planner.schedule
+    return format_schedule_diff(diff, session_memory["task_index"])
+
+@traced_tool
+def review_history_tool(tool_context: "ToolContext") -> str:
+    """Tasks the user keeps carrying over and how their estimates compare to
+    actual time, for check-ins and the next plan."""
+    history = get_history_store()
+    if history is None:
+        return "No history is kept for this user."
+    user_id = tool_context.session.user_id
+    lines = []
+    for row in history.carried_over(user_id, min_sessions=3, limit=5):
+        lines.append(f"Carried over {row['sessions']} sessions: {row['title']}")
+    for row in history.estimate_accuracy(user_id):
+        if row["ratio"] is not None:
+            lines.append(f"Tasks take {row['ratio']:.1f}x the estimate "
+                         f"({row['completions']} timed completions)")
+    return "\n".join(lines) or "No history yet."
+
+def build_model(model_name: str = None):
+    """Create the LLM. FOCUS_BUDDY_MODEL=stub-focus-buddy selects the local
+    ScriptedModel from stub_model.py instead of Gemini."""
+    from google.adk.models.registry import LLMRegistry
+
+    os.environ['GOOGLE_API_KEY'] = os.environ.get('GEMINI_API_KEY', '')
+    model_name = model_name or os.environ.get('FOCUS_BUDDY_MODEL', 'gemini-2.5-flash-lite')
+    if model_name.startswith('stub-'):
+        import stub_model  # registers the stub with ADK
+    return LLMRegistry.new_llm(model_name)
+
+def build_agent(model=None):
+    """Create the tool-driven Focus Buddy agent."""
+    from google.adk import Agent
+
+    return Agent(
+        name="FocusBuddy",
+        model=model or get_gateway_model(),
+        instruction=load_agent_spec() + """
+
+For a new task list, call plan_focus_session_tool once with the user's
+task list, the available minutes and their energy level, then present the
+final plan with: Summary, Timeline, Checklist, Check-in.
+
+Use the step-by-step tools only to adjust an existing plan:
+- parse_tasks_tool to replace the task list
+- prioritize_tasks_tool to re-sort the tasks in session memory
+- create_schedule_tool to rebuild the schedule for a different number of minutes
+
+At a check-in, call complete_task_tool for each task the user finished.
+When the user reports progress mid-session, adjust the plan in place instead
+of re-planning: complete_task_tool for finished tasks (with actual minutes),
+update_task_minutes_tool when a task needs more or less time, and
+add_tasks_tool for new tasks. Each returns only the blocks that changed.
+Call review_history_tool before planning or at a check-in to see which
+tasks keep getting carried over and how long tasks really take.""",
+        tools=[plan_focus_session_tool, parse_tasks_tool, prioritize_tasks_tool, create_schedule_tool,
+               complete_task_tool, update_task_minutes_tool, add_tasks_tool, review_history_tool],
+        before_model_callback=before_model_callback,
+        after_model_callback=after_model_callback,
+        on_model_error_callback=on_model_error_callback,
+    )
+
+def build_presenter_agent(model=None):
+    """Create the presenter agent for the local fast path: the plan is computed
+    in Python, the model only phrases it (one model turn, no tool calls)."""
+    from google.adk import Agent
+
+    return Agent(
+        name="FocusBuddyPresenter",
+        model=model or get_gateway_model(),
+        instruction=load_agent_spec() + """
+
+The focus plan has already been computed for you by the planning tools.
+Do not call any tools and do not change the schedule.
+Present the plan you are given with: Summary, Timeline, Checklist, Check-in""",
+        before_model_callback=before_model_callback,
+        after_model_callback=after_model_callback,
+        on_model_error_callback=on_model_error_callback,
+    )
+
+@functools.lru_cache(maxsize=None)
+def get_model():
+    """Shared upstream model instance, built on first use."""
+    return build_model()
+
+@functools.lru_cache(maxsize=None)
+def get_gateway() -> ModelGateway:
+    """Shared model-call gateway: identical in-flight turns are coalesced and
+    upstream calls are capped at FOCUS_BUDDY_MODEL_RPM per minute (burst
+    FOCUS_BUDDY_MODEL_BURST; default and 0: no cap)."""
+    burst = os.environ.get('FOCUS_BUDDY_MODEL_BURST')
+    return ModelGateway(requests_per_minute=float(os.environ.get('FOCUS_BUDDY_MODEL_RPM', 0)),
+                        burst=float(burst) if burst else None)
+
+@functools.lru_cache(maxsize=None)
+def get_gateway_model():
+    """get_model() behind get_gateway(); the model the agents call."""
+    from gateway_llm import GatewayLlm
+
+    upstream = get_model()
+    return GatewayLlm(model=upstream.model, upstream=upstream, gateway=get_gateway())
+
+@functools.lru_cache(maxsize=None)
+def get_runner():
+    """Shared runner for the tool-driven agent, built on first use."""
+    from google.adk.runners import InMemoryRunner
+
+    return InMemoryRunner(agent=build_agent())
+
+@functools.lru_cache(maxsize=None)
+def get_presenter_runner():
+    """Shared runner for the fast-path presenter agent, built on first use."""
+    from google.adk.runners import InMemoryRunner
+
+    return InMemoryRunner(agent=build_presenter_agent())
+
+@dataclass
+class StreamEvent:
+    """One item from stream_focus_buddy.
+
+    kind is "plan" (the locally computed plan, fast path only), "text" (a
+    chunk of the agent's answer), "tool_call" or "tool_result"; name is the
+    tool name for the tool events.
+    """
+    kind: str
+    text: str = ""
+    name: str = ""
+
+async def run_focus_buddy(user_input: str, available_minutes: int = 25, fast_path: bool = False,
+                          user_id: str = "focus_user", session_id: str = None, energy: str = "medium",
+                          top_k: int = None):
+    """Main agent loop using ADK with InMemoryRunner.
+
+    With fast_path=True the tasks are parsed, prioritized and scheduled locally
+    and the model is called once, only to present the finished plan.
+    Each call runs in its own ADK session (a fresh one unless session_id is
+    given), so concurrent calls never share tasks or plans.
+    Backlogs longer than top_k tasks (default FOCUS_BUDDY_TOP_K or 10; 0 for
+    no limit) are ranked locally first and the model only sees the top_k.
+    With tracing enabled (see tracing.py) the call is recorded as one plan
+    span with its tool calls and model turns nested inside.
+    """
+    session_id = session_id or uuid.uuid4().hex
+    with tracer.plan(plan_id=session_id, mode="fast" if fast_path else "agent",
+                     input_lines=user_input.count("\n") + 1, input_chars=len(user_input)):
+        return await _run_focus_buddy(user_input, available_minutes, fast_path,
+                                      user_id, session_id, energy, top_k)
+
+async def _run_focus_buddy(user_input: str, available_minutes: int, fast_path: bool,
+                           user_id: str, session_id: str, energy: str, top_k: int):
     print("="*60)
     print("FOCUS BUDDY AGENT - Multi-Agent Session")
     print("="*60)
     
-    # Reset memory for new session
-    session_memory["tasks"] = []
-    session_memory["current_focus_plan"] = None
-    
-    # Build the prompt
-    prompt = f"""I have these tasks to do in the next {available_minutes} minutes:
-
-{user_input}
-
-Please create my focus plan."""
-    
-    print("\n🤖 Agent working...\n")
+    runner, prompt, plan = prepare_run(user_input, available_minutes, fast_path,
+                                       user_id, session_id, energy, top_k)
+    if plan is not None:
+        print("\n🤖 Agent working (local plan, single model turn)...\n")
+    else:
+        print("\n🤖 Agent working...\n")
     
     # Run the agent with runner
-    response = await runner.run_debug(prompt)
+    async with get_session_manager().use(runner, user_id, session_id):
+        response = await runner.run_debug(prompt, user_id=user_id, session_id=session_id)
     
     return response
 
+def get_top_k(top_k: int = None) -> int:
+    """top_k if given, else FOCUS_BUDDY_TOP_K (default 10); 0 means no limit."""
+    if top_k is not None:
+        return top_k
+    return int(os.environ.get('FOCUS_BUDDY_TOP_K', DEFAULT_TOP_K))
+
+def get_dedupe_threshold() -> float:
+    """Similarity for merging near-duplicate tasks, or 0 (the default) to keep
+    every task: set FOCUS_BUDDY_DEDUPE to a threshold, or to "on" for 0.6."""
+    value = os.environ.get('FOCUS_BUDDY_DEDUPE', '0').strip().lower()
+    return DEFAULT_DEDUPE_THRESHOLD if value == 'on' else float(value)
+
+def plan_locally(user_input: str, available_minutes: int, user_id: str, session_id: str,
+                 energy: str = "medium"):
+    """Start the session over with a plan built entirely in Python (no model
+    call) and return the FocusPlan; it becomes the session's current plan."""
+    get_session_manager().touch(user_id, session_id)
+    session_memory = session_store.reset(user_id, session_id)
+    with tracer.span("pipeline.build_focus_plan") as span:
+        plan = build_focus_plan(user_input, available_minutes, energy=energy,
+                                default_minutes=get_duration_estimator().default_minutes(user_id),
+                                dedupe_threshold=get_dedupe_threshold())
+        span.set(tasks=len(plan.tasks), blocks=len(plan.schedule))
+    session_memory["tasks"] = plan.tasks
+    session_memory["task_index"] = task_index(plan.tasks)
+    session_memory["current_focus_plan"] = plan.schedule
+    session_memory["planner"] = IncrementalPlanner(plan.tasks, available_minutes, energy=energy)
+    record_plan(user_id, session_id, plan.tasks, plan.schedule, available_minutes, energy)
+    return plan
+
+def presenter_prompt(plan_text: str, available_minutes: int, energy: str = "medium") -> str:
+    """Prompt asking the presenter agent to phrase a locally built plan."""
+    return f"""Here is my focus plan for the next {available_minutes} minutes.
+My energy level is {energy}.
+
+{plan_text}
+
+Please present it."""
+
+def agent_prompt(task_text: str, available_minutes: int, energy: str = "medium",
+                 note: str = "") -> str:
+    """Prompt asking the agent to plan task_text; note goes in the closing
+    paragraph, outside the task list."""
+    closing = f"{note}\n" if note else ""
+    return f"""I have these tasks to do in the next {available_minutes} minutes.
+My energy level is {energy}.
+
+{task_text}
+
+{closing}Please create my focus plan."""
+
+def prepare_run(user_input: str, available_minutes: int, fast_path: bool,
+                user_id: str, session_id: str, energy: str, top_k: int = None):
+    """Reset session memory and pick the runner and prompt for one plan.
+
+    Returns (runner, prompt, plan); plan is the locally built FocusPlan on the
+    fast path and None when the agent plans with its tools.
+    """
+    top_k = get_top_k(top_k)
+    if fast_path:
+        plan = plan_locally(user_input, available_minutes, user_id, session_id, energy)
+        prompt = presenter_prompt(describe_plan(plan, max_deferred=top_k if top_k > 0 else None),
+                                  available_minutes, energy)
+        return get_presenter_runner(), prompt, plan
+
+    # Reset memory for new session
+    get_session_manager().touch(user_id, session_id)
+    session_store.reset(user_id, session_id)
+
+    # Long backlogs are ranked here so the model only reads the top candidates
+    task_text, note = user_input, ""
+    if top_k > 0:
+        with tracer.span("pipeline.shortlist") as span:
+            shortlist = shortlist_tasks(user_input, top_k, energy=energy,
+                                        default_minutes=get_duration_estimator().default_minutes(user_id),
+                                        dedupe_threshold=get_dedupe_threshold())
+            span.set(tasks=len(shortlist.tasks) + shortlist.rest_count, kept=len(shortlist.tasks))
+        if shortlist.rest_count:
+            task_text, note = describe_shortlist(shortlist), describe_rest(shortlist)
+
+    return get_runner(), agent_prompt(task_text, available_minutes, energy, note), None
+
+async def stream_focus_buddy(user_input: str, available_minutes: int = 25, fast_path: bool = False,
+                             user_id: str = "focus_user", session_id: str = None,
+                             energy: str = "medium", top_k: int = None) -> AsyncIterator[StreamEvent]:
+    """Run the agent like run_focus_buddy, yielding StreamEvents as they happen.
+
+    The model is called in SSE streaming mode, so the answer arrives as text
+    chunks instead of one block at the end. On the fast path the local plan
+    is yielded first, before the model is called at all. Nothing is printed.
+    """
+    from google.adk.agents.run_config import RunConfig, StreamingMode
+    from google.genai import types
+
+    session_id = session_id or uuid.uuid4().hex
+    with tracer.plan(plan_id=session_id, mode="fast" if fast_path else "agent",
+                     input_lines=user_input.count("\n") + 1, input_chars=len(user_input)):
+        runner, prompt, plan = prepare_run(user_input, available_minutes, fast_path,
+                                           user_id, session_id, energy, top_k)
+        if plan is not None:
+            yield StreamEvent("plan", describe_plan(plan))
+
+        async with get_session_manager().use(runner, user_id, session_id):
+            await _ensure_session(runner, user_id, session_id)
+            message = types.Content(role="user", parts=[types.Part(text=prompt)])
+            run_config = RunConfig(streaming_mode=StreamingMode.SSE)
+            # Partial events carry the text as it is generated; the closing
+            # non-partial event repeats all of it, so its text is skipped
+            streamed = False
+            async for event in runner.run_async(user_id=user_id, session_id=session_id,
+                                                new_message=message, run_config=run_config):
+                partial = bool(event.partial)
+                parts = event.content.parts if event.content and event.content.parts else []
+                for part in parts:
+                    if part.text and (partial or not streamed):
+                        yield StreamEvent("text", part.text)
+                    elif partial:
+                        continue
+                    elif part.function_call:
+                        yield StreamEvent("tool_call", name=part.function_call.name)
+                    elif part.function_response:
+                        result = part.function_response.response or {}
+                        yield StreamEvent("tool_result", str(result.get("result", result)),
+                                          name=part.function_response.name)
+                streamed = partial
+
+async def _ensure_session(runner, user_id: str, session_id: str) -> None:
+    session_service = runner.session_service
+    if await session_service.get_session(app_name=runner.app_name, user_id=user_id,
+                                         session_id=session_id) is None:
+        await session_service.create_session(app_name=runner.app_name, user_id=user_id,
+                                             session_id=session_id)
+
+async def run_prompt(runner, prompt: str, user_id: str, session_id: str) -> str:
+    """Send one message to a runner in a session (created if needed) and
+    return the agent's text, without printing anything."""
+    from google.genai import types
+
+    message = types.Content(role="user", parts=[types.Part(text=prompt)])
+    async with get_session_manager().use(runner, user_id, session_id):
+        await _ensure_session(runner, user_id, session_id)
+        events = [event async for event in runner.run_async(user_id=user_id, session_id=session_id,
+                                                            new_message=message)]
+    return extract_text(events)
+
+def extract_text(events) -> str:
+    """Concatenate the text parts of the events returned by run_focus_buddy."""
+    final_response = ""
+    for event in events:
+        if hasattr(event, 'content') and event.content and hasattr(event.content, 'parts'):
+            for part in event.content.parts:
+                if hasattr(part, 'text') and part.text:
+                    final_response += part.text
+    return final_response
+
+def plan_cache_key(user_input: str, available_minutes: int, energy: str = "medium",
+                   user_id: str = "focus_user", tasks=None) -> str:
+    """Plan cache key for user_input as user_id's plan is built from it: with
+    their learned default minutes and duplicates merged, so a user whose
+    estimates differ, or change, gets a different key. Pass the plan's tasks
+    (FocusPlan.tasks) when they are already at hand to skip resolving again."""
+    if tasks is None:
+        tasks = resolve_tasks(user_input, get_duration_estimator().default_minutes(user_id),
+                              get_dedupe_threshold())
+    return plan_key(tasks, available_minutes, energy)
+
+async def get_focus_plan(user_input: str, available_minutes: int = 25, energy: str = "medium",
+                         fast_path: bool = False, user_id: str = "focus_user") -> str:
+    """Focus plan text, served from the plan cache when the same tasks were planned recently.
+
+    The cache key is the task list as the plan is built from it (learned
+    default minutes applied, duplicates merged; order, case and spacing
+    ignored) plus the time window and energy level, so a hit never calls
+    the model.
+    """
+    plan_cache = get_plan_cache()
+    key = plan_cache_key(user_input, available_minutes, energy, user_id)
+    cached = plan_cache.get(key)
+    if cached is not None:
+        return cached
+
+    events = await run_focus_buddy(user_input, available_minutes, fast_path=fast_path,
+                                   user_id=user_id, energy=energy)
+    text = extract_text(events)
+    if text:
+        plan_cache.put(key, text)
+    return text
+
+async def stream_focus_plan(user_input: str, available_minutes: int = 25, energy: str = "medium",
+                            fast_path: bool = False,
+                            user_id: str = "focus_user") -> AsyncIterator[StreamEvent]:
+    """Streaming get_focus_plan: a cache hit is yielded as a single text
+    event, a miss streams from the agent and caches the finished text."""
+    plan_cache = get_plan_cache()
+    key = plan_cache_key(user_input, available_minutes, energy, user_id)
+    cached = plan_cache.get(key)
+    if cached is not None:
+        yield StreamEvent("text", cached)
+        return
+
+    chunks = []
+    async for event in stream_focus_buddy(user_input, available_minutes, fast_path=fast_path,
+                                          user_id=user_id, energy=energy):
+        if event.kind == "text":
+            chunks.append(event.text)
+        yield event
+    text = "".join(chunks)
+    if text:
+        plan_cache.put(key, text)
+
 # Example usage
 if __name__ == "__main__":
     example_tasks = """
@@ -115,7 +622,8 @@ if __name__ == "__main__":
     
     async def main():
         try:
-            result = await run_focus_buddy(example_tasks, available_minutes=30)
+            result = await run_focus_buddy(example_tasks, available_minutes=30,
+                                           fast_path="--fast" in sys.argv)
             print("\n" + "="*60)
             print("RESULT:")
             print("="*60)
@@ -0,0 +1,233 @@
+"""
+Model-call gateway: in-flight coalescing, rate limiting and priorities.
+
+When a team shares a standup list, many users send the same prompt within
+seconds. ModelGateway.call runs one upstream call per distinct key at a
+time (single-flight): later callers with the same key follow the call
+already in flight and receive the same responses, streamed as they arrive.
+
+Upstream calls take a token from a token bucket (requests per minute, with
+a burst allowance). When none is left, calls wait in a priority queue:
+INTERACTIVE requests (the default) are let through before BATCH ones, in
+arrival order within a priority. If an interactive caller joins a batch
+call that is still queued, the call moves up to interactive. Queue waits
+are kept per priority for stats() and recorded as "model.queue_wait.<priority>"
+spans.
+
+Nothing here depends on ADK; gateway_llm.GatewayLlm puts an ADK model
+behind a gateway.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import heapq
+import itertools
+import math
+import time
+import uuid
+from collections import deque
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from tracing import tracer
+
+INTERACTIVE = 0
+BATCH = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch"}
+
+# Queue-wait samples kept per priority for stats()
+WAIT_SAMPLES = 1000
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("focus_buddy_model_priority",
+                                                           default=INTERACTIVE)
+
+
+def _priority_name(level: int) -> str:
+    return PRIORITY_NAMES.get(level, str(level))
+
+
+def _wait_summary(samples_ms) -> dict:
+    """count, mean, nearest-rank p50/p95 and max of queue waits in milliseconds."""
+    ordered = sorted(samples_ms)
+    if not ordered:
+        return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+
+    def pct(p: float) -> float:
+        return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+    return {"count": len(ordered), "mean_ms": sum(ordered) / len(ordered),
+            "p50_ms": pct(50), "p95_ms": pct(95), "max_ms": ordered[-1]}
+
+
+@contextlib.contextmanager
+def model_priority(level: int):
+    """Model calls made inside this block (by this task, including the ones
+    ADK makes for it) are queued at this priority."""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class TokenBucket:
+    """rate tokens per second, holding at most capacity; rate 0 never limits."""
+
+    def __init__(self, rate: float, capacity: float = None, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._last = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def try_take(self) -> bool:
+        if not self.rate:
+            return True
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def wait_time(self) -> float:
+        """Seconds until a token is available."""
+        if not self.rate:
+            return 0.0
+        self._refill()
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+
+class _Flight:
+    """One upstream call and the responses it has produced so far."""
+
+    def __init__(self, priority: int):
+        self.priority = priority
+        self.items: List = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.ticket: Optional[asyncio.Future] = None
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    def _notify(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def add(self, item) -> None:
+        self.items.append(item)
+        self._notify()
+
+    def finish(self, error: BaseException = None) -> None:
+        self.error = error
+        self.done = True
+        self._notify()
+
+    async def follow(self) -> AsyncIterator:
+        """Every response of the call, from the first, as they arrive."""
+        i = 0
+        while True:
+            if i < len(self.items):
+                yield self.items[i]
+                i += 1
+            elif self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            else:
+                await self._changed.wait()
+
+
+class ModelGateway:
+    """Single-flight, rate-limited, prioritized access to an upstream model."""
+
+    def __init__(self, requests_per_minute: float = 0, burst: float = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self._bucket = TokenBucket(requests_per_minute / 60, burst, clock)
+        self._flights: Dict[str, _Flight] = {}
+        self._queue: List[tuple] = []   # (priority, seq, ticket) heap
+        self._seq = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._waits: Dict[int, deque] = {}
+        self.upstream_calls = 0
+        self.coalesced = 0
+
+    async def call(self, key: Optional[str], upstream: Callable[[], AsyncIterator]) -> AsyncIterator:
+        """Responses of upstream(), shared with any in-flight call with the
+        same key (None: never shared)."""
+        priority = _priority.get()
+        key = key or uuid.uuid4().hex
+        flight = self._flights.get(key)
+        if flight is None or flight.task.get_loop() is not asyncio.get_running_loop():
+            flight = self._flights[key] = _Flight(priority)
+            flight.task = asyncio.ensure_future(self._fly(key, flight, upstream))
+        else:
+            self.coalesced += 1
+            if priority < flight.priority and flight.ticket is not None and not flight.ticket.done():
+                flight.priority = priority
+                self._enqueue(flight.ticket, priority)
+        async for item in flight.follow():
+            yield item
+
+    async def _fly(self, key: str, flight: _Flight, upstream) -> None:
+        try:
+            await self._admit(flight)
+            self.upstream_calls += 1
+            async for item in upstream():
+                flight.add(item)
+        except asyncio.CancelledError:
+            flight.finish(RuntimeError("model call was cancelled"))
+            raise
+        except Exception as e:
+            flight.finish(e)
+        else:
+            flight.finish()
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    async def _admit(self, flight: _Flight) -> None:
+        """Wait for a rate token, behind every queued call of higher or equal priority."""
+        start = time.perf_counter()
+        if self._queue or not self._bucket.try_take():
+            flight.ticket = asyncio.get_running_loop().create_future()
+            self._enqueue(flight.ticket, flight.priority)
+            await flight.ticket
+        wait_ms = (time.perf_counter() - start) * 1000
+        self._waits.setdefault(flight.priority, deque(maxlen=WAIT_SAMPLES)).append(wait_ms)
+        tracer.record(f"model.queue_wait.{_priority_name(flight.priority)}", wait_ms)
+
+    def _enqueue(self, ticket: asyncio.Future, priority: int) -> None:
+        heapq.heappush(self._queue, (priority, next(self._seq), ticket))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        queue = self._queue
+        while queue:
+            ticket = queue[0][2]
+            if ticket.done():  # cancelled, or already let through by an earlier entry
+                heapq.heappop(queue)
+                continue
+            wait = self._bucket.wait_time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            elif self._bucket.try_take():
+                heapq.heappop(queue)
+                ticket.set_result(None)
+
+    def stats(self) -> dict:
+        """Upstream calls, coalesced callers, calls in flight and queued, and
+        queue-wait summaries (over the last WAIT_SAMPLES calls) per priority."""
+        return {
+            "upstream_calls": self.upstream_calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._flights),
+            "queued": sum(not ticket.done() for _, _, ticket in self._queue),
+            "queue_wait": {_priority_name(p): _wait_summary(samples)
+                           for p, samples in sorted(self._waits.items())},
+        }
@@ -0,0 +1,138 @@
+"""
+Local planning pipeline for Focus Buddy.
+
+Runs parse -> prioritize -> schedule in a single Python call so the model only
+has to phrase the finished plan instead of driving each tool step itself.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, List
+
+from dedup import dedupe_tasks
+from tools import Task, ScheduledBlock, parse_tasks, prioritize_tasks, create_focus_schedule
+
+
+@dataclass
+class Shortlist:
+    """Top-ranked candidates from a backlog and a summary of the rest."""
+    tasks: List[Task]
+    rest_count: int = 0
+    rest_minutes: int = 0
+
+
+@dataclass
+class FocusPlan:
+    """Result of the local pipeline: prioritized tasks and the schedule built from them."""
+    available_minutes: int
+    tasks: List[Task]
+    schedule: List[ScheduledBlock]
+
+
+# Most candidate tasks passed to the agent from one backlog; a 25-minute
+# window only ever uses about 5
+DEFAULT_TOP_K = 10
+
+# Longest task a user at this energy level gets before shorter ones
+# ("tired = smaller tasks" in the agent spec)
+ENERGY_MAX_TASK_MINUTES = {"low": 15}
+
+
+def apply_energy(tasks: List[Task], energy: str = "medium") -> List[Task]:
+    """Move tasks too long for the user's energy level behind the rest (stable)."""
+    limit = ENERGY_MAX_TASK_MINUTES.get(energy.strip().lower())
+    if limit is None:
+        return tasks
+    return sorted(tasks, key=lambda task: task.estimated_minutes > limit)
+
+
+def resolve_tasks(raw_text: str, default_minutes: Callable[[str], int] = None,
+                  dedupe_threshold: float = None) -> List[Task]:
+    """Parse and optionally merge near-duplicates: the tasks a plan is built from."""
+    tasks = parse_tasks(raw_text, default_minutes)
+    if dedupe_threshold:
+        tasks = dedupe_tasks(tasks, dedupe_threshold)
+    return tasks
+
+
+def rank_tasks(raw_text: str, energy: str = "medium",
+               default_minutes: Callable[[str], int] = None, order: str = "score",
+               dedupe_threshold: float = None) -> List[Task]:
+    """Resolve, prioritize and apply energy."""
+    tasks = resolve_tasks(raw_text, default_minutes, dedupe_threshold)
+    return apply_energy(prioritize_tasks(tasks, order=order), energy)
+
+
+def build_focus_plan(raw_text: str, available_minutes: int = 25,
+                     strategy: str = "greedy", energy: str = "medium",
+                     default_minutes: Callable[[str], int] = None,
+                     order: str = "score", dedupe_threshold: float = None) -> FocusPlan:
+    """Parse, prioritize and schedule raw task text without calling the model.
+
+    default_minutes is passed to parse_tasks for tasks written without a time,
+    order to prioritize_tasks ("score", "edf" or "slack"). With
+    dedupe_threshold, near-duplicate tasks are merged first (see dedup.py).
+    """
+    tasks = rank_tasks(raw_text, energy, default_minutes, order, dedupe_threshold)
+    schedule = create_focus_schedule(tasks, available_minutes, strategy=strategy)
+    return FocusPlan(available_minutes=available_minutes, tasks=tasks, schedule=schedule)
+
+
+def shortlist_tasks(raw_text: str, top_k: int = DEFAULT_TOP_K, energy: str = "medium",
+                    default_minutes: Callable[[str], int] = None, order: str = "score",
+                    dedupe_threshold: float = None) -> Shortlist:
+    """Parse and rank a whole backlog locally and keep the top_k candidates
+    (ranked as build_focus_plan ranks them); top_k <= 0 keeps everything."""
+    ranked = rank_tasks(raw_text, energy, default_minutes, order, dedupe_threshold)
+    if top_k <= 0 or len(ranked) <= top_k:
+        return Shortlist(tasks=ranked)
+    rest = ranked[top_k:]
+    return Shortlist(tasks=ranked[:top_k], rest_count=len(rest),
+                     rest_minutes=sum(task.estimated_minutes for task in rest))
+
+
+def describe_shortlist(shortlist: Shortlist) -> str:
+    """Shortlisted tasks as task-list text; parse_tasks reads back exactly
+    these tasks, with the same minutes and deadlines."""
+    lines = []
+    for task in shortlist.tasks:
+        line = f"- {task.title} {task.estimated_minutes} min"
+        if task.deadline:
+            line += f" due: {task.deadline}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def describe_rest(shortlist: Shortlist) -> str:
+    """One sentence counting the tasks left off the shortlist ("" if none).
+
+    Kept out of the task list: any line in it is parsed as a task.
+    """
+    if not shortlist.rest_count:
+        return ""
+    return f"{shortlist.rest_count} lower-priority tasks are not listed here and can wait."
+
+
+def describe_plan(plan: FocusPlan, max_deferred: int = None) -> str:
+    """Render a plan as the structured text the presenting model works from.
+
+    With max_deferred, only that many unscheduled titles are listed and the
+    rest are counted.
+    """
+    deadlines = {task.title: task.deadline for task in plan.tasks if task.deadline}
+    lines = [f"Focus window: {plan.available_minutes} minutes", "Scheduled blocks:"]
+    for block in plan.schedule:
+        line = f"- {block.start_minute}-{block.end_minute} min: {block.task_title}"
+        if block.task_title in deadlines:
+            line += f" (due: {deadlines[block.task_title]})"
+        lines.append(line)
+    if not plan.schedule:
+        lines.append("- (nothing fits in this window)")
+
+    scheduled = {block.task_title.removesuffix(" (partial)") for block in plan.schedule}
+    deferred = [task.title for task in plan.tasks if task.title not in scheduled]
+    if deferred:
+        line = "Not scheduled this session: " + "; ".join(deferred[:max_deferred])
+        if max_deferred is not None and len(deferred) > max_deferred:
+            line += f" and {len(deferred) - max_deferred} more"
+        lines.append(line)
+    return "\n".join(lines)
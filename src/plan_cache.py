@@ -0,0 +1,142 @@
+"""
+Focus plan cache.
+
+Users resubmit the same (or nearly the same) task list many times a day.
+PlanCache stores finished plans keyed on a canonical form of the parsed
+tasks, the time window and the energy level, so repeats skip the agent loop.
+Entries expire after a TTL and the least recently used ones are evicted
+past a size bound. An optional SQLite file keeps the cache across restarts.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from tools import Task
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(title.lower().split()).strip(" .,;:!()")
+
+
+def plan_key(tasks: Iterable[Task], available_minutes: int, energy: str = "medium") -> str:
+    """Cache key for a plan: independent of task order, case and spacing."""
+    canonical = sorted(
+        (normalize_title(task.title), task.estimated_minutes, (task.deadline or "").lower())
+        for task in tasks
+    )
+    payload = json.dumps([canonical, int(available_minutes), energy.strip().lower()],
+                         separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PlanCache:
+    """LRU + TTL cache of plan text, optionally backed by a SQLite file."""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 6 * 3600,
+                 path: Optional[str] = None, clock=time.time):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS plans "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS plans_stored_at ON plans (stored_at)")
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached plan for key, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT stored_at, value FROM plans WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = self._entries[key] = (row[0], row[1])
+                    self._trim_memory()
+
+            if entry is None:
+                self.misses += 1
+                return None
+            if self._clock() - entry[0] > self.ttl_seconds:
+                self._remove(key)
+                self.evictions += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, value: str) -> None:
+        """Store a plan, evicting the least recently used entries past max_entries."""
+        with self._lock:
+            stored_at = self._clock()
+            self._entries[key] = (stored_at, value)
+            self._entries.move_to_end(key)
+            self._trim_memory()
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO plans (key, value, stored_at) VALUES (?, ?, ?)",
+                    (key, value, stored_at),
+                )
+                self._db.execute(
+                    "DELETE FROM plans WHERE key NOT IN "
+                    "(SELECT key FROM plans ORDER BY stored_at DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+                self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM plans")
+                self._db.commit()
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters and current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _trim_memory(self) -> None:
+        evicted = False
+        while len(self._entries) > self.max_entries:
+            key, _ = self._entries.popitem(last=False)
+            if self._db is not None:
+                self._db.execute("DELETE FROM plans WHERE key = ?", (key,))
+            self.evictions += 1
+            evicted = True
+        if evicted and self._db is not None:
+            self._db.commit()
+
+    def _remove(self, key: str) -> None:
+        self._entries.pop(key, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM plans WHERE key = ?", (key,))
+            self._db.commit()
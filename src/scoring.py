@@ -0,0 +1,133 @@
+"""
+Priority scoring for Focus Buddy tasks.
+
+Scores combine deadline urgency, a quick-win boost for short tasks and
+weighted title keywords ("urgent", "review", ...). All keywords are compiled
+into one Aho-Corasick automaton, so each title is scanned once no matter how
+many keywords are configured.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Sequence, Tuple
+
+# Keyword groups: name -> (weight, keywords). A group adds its weight once
+# per task if any of its keywords appears anywhere in the title.
+DEFAULT_KEYWORD_GROUPS: Dict[str, Tuple[float, Sequence[str]]] = {
+    "important": (15.0, ("urgent", "important", "critical", "asap", "priority")),
+    "quick": (3.0, ("review", "check", "quick", "simple")),
+}
+
+URGENT_DEADLINES = frozenset(["today", "asap", "urgent", "now"])
+SOON_DEADLINES = frozenset(["tomorrow", "soon"])
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton reporting which keyword groups occur in a text.
+
+    Each keyword maps to a bitmask; scan() returns the OR of the masks of
+    every keyword found, in a single left-to-right pass over the text.
+    """
+
+    def __init__(self, keywords: Dict[str, int]):
+        goto = [{}]
+        out = [0]
+        for word, mask in keywords.items():
+            if not word:
+                continue
+            node = 0
+            for ch in word:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append(0)
+                node = nxt
+            out[node] |= mask
+
+        # Breadth-first fail links; a node also reports what its fail target reports
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in goto[node].items():
+                queue.append(nxt)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] |= out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def scan(self, text: str) -> int:
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        found = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            found |= out[node]
+        return found
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+
+class PriorityScorer:
+    """Computes priority_score for tasks from a weighted keyword dictionary."""
+
+    def __init__(self, keyword_groups: Dict[str, Tuple[float, Iterable[str]]] = None):
+        groups = DEFAULT_KEYWORD_GROUPS if keyword_groups is None else keyword_groups
+        keywords: Dict[str, int] = {}
+        self._weights = []
+        for bit, (weight, words) in enumerate(groups.values()):
+            self._weights.append(weight)
+            for word in words:
+                word = word.lower()
+                keywords[word] = keywords.get(word, 0) | (1 << bit)
+        self._automaton = KeywordAutomaton(keywords)
+
+    def title_score(self, title: str) -> float:
+        """Keyword part of the score."""
+        found = self._automaton.scan(title.lower())
+        score = 0.0
+        bit = 0
+        while found:
+            if found & 1:
+                score += self._weights[bit]
+            found >>= 1
+            bit += 1
+        return score
+
+    @staticmethod
+    def deadline_score(deadline: str) -> float:
+        """Deadline part of the score: any deadline counts, urgent words count more."""
+        if not deadline:
+            return 0.0
+        word = deadline.lower().strip(".,;:!)")
+        if word in URGENT_DEADLINES:
+            return 30.0
+        if word in SOON_DEADLINES:
+            return 20.0
+        return 10.0
+
+    @staticmethod
+    def duration_score(estimated_minutes: int) -> float:
+        """Quick-win boost for short tasks."""
+        if estimated_minutes <= 5:
+            return 5.0
+        if estimated_minutes <= 15:
+            return 2.0
+        return 0.0
+
+    def score(self, task) -> float:
+        return (self.deadline_score(task.deadline)
+                + self.duration_score(task.estimated_minutes)
+                + self.title_score(task.title))
+
+
+default_scorer = PriorityScorer()
@@ -0,0 +1,418 @@
+"""
+HTTP service for Focus Buddy on plain asyncio (no web framework).
+
+    POST /plan     {"tasks": "...", "available_minutes": 25, "energy": "medium",
+                    "user_id": "...", "session_id": "...", "fast_path": true, "present": true}
+    POST /adjust   {"user_id": "...", "session_id": "...",
+                    "completed": [{"title": "...", "actual_minutes": 20}],
+                    "updated": [{"title": "...", "minutes": 15}], "added": "- new task 10 min"}
+    POST /checkin  {"user_id": "...", "session_id": "...", "message": "..."}
+    GET  /health   gate, gateway, pool and session counters
+
+The local stages (parse, prioritize, schedule, incremental adjustments) run
+in a thread pool so a long backlog never blocks the event loop. Model calls
+go through a ModelGate: at most model_concurrency run at once, at most
+max_queue more wait for a slot, and anything beyond that is answered
+503 with Retry-After right away instead of piling up. Behind the gate,
+main.get_gateway() coalesces identical turns and applies the rate limit
+(interactive priority). /adjust never calls the model; /plan with
+"present": false returns the local plan without it.
+Bodies that don't match the shapes above get 400, a failed model call 502
+and any other error 500; the last two are logged with their traceback.
+Requests for the same session are handled one at a time. Idle sessions are
+swept every SWEEP_SECONDS (see session_manager.py for the limits).
+
+    python src/server.py [--port 8080] [--model-concurrency 8] [--max-queue 32] [--workers 4]
+
+FOCUS_BUDDY_MODEL=stub-focus-buddy serves with the local stub model.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import uuid
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from http import HTTPStatus
+
+import main
+from pipeline import describe_plan
+from tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Largest request body accepted, in bytes
+MAX_BODY_BYTES = 1_000_000
+
+# Seconds a rejected client is told to wait before retrying
+RETRY_AFTER_SECONDS = 1
+
+# Seconds between sweeps for idle sessions
+SWEEP_SECONDS = 60
+
+
+class Overloaded(Exception):
+    """Raised when the model queue is full."""
+
+
+class ModelError(Exception):
+    """Raised when a model call fails; the original error is its __cause__."""
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _bad_request(message: str) -> HTTPError:
+    return HTTPError(HTTPStatus.BAD_REQUEST, message)
+
+
+def _text(body: dict, name: str, default: str = None) -> str:
+    """body[name] as a string; default when it is missing."""
+    value = body.get(name)
+    if value is None and default is not None:
+        return default
+    if not isinstance(value, str):
+        raise _bad_request(f'"{name}" must be text')
+    return value
+
+
+def _int(body: dict, name: str, default: int = None, minimum: int = 0) -> int:
+    """body[name] as an integer of at least minimum; default when it is missing."""
+    value = body.get(name)
+    if value is None and default is not None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+        raise _bad_request(f'"{name}" must be an integer of at least {minimum}')
+    return value
+
+
+def _bool(body: dict, name: str, default: bool) -> bool:
+    value = body.get(name, default)
+    if not isinstance(value, bool):
+        raise _bad_request(f'"{name}" must be true or false')
+    return value
+
+
+def _objects(body: dict, name: str) -> list:
+    """body[name] as a list of JSON objects; [] when it is missing."""
+    value = body.get(name, [])
+    if not isinstance(value, list) or not all(isinstance(item, dict) for item in value):
+        raise _bad_request(f'"{name}" must be a list of objects')
+    return value
+
+
+def _content_length(headers: dict) -> int:
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise _bad_request("Content-Length must be a number")
+    if length < 0:
+        raise _bad_request("Content-Length must not be negative")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "body too large")
+    return length
+
+
+class ModelGate:
+    """Concurrency limit with a bounded wait queue for model calls."""
+
+    def __init__(self, max_concurrency: int = 8, max_queue: int = 32):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self.running = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def check(self) -> None:
+        """Raise Overloaded if every slot is busy and max_queue callers are
+        already waiting for one."""
+        if self.running >= self.max_concurrency and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded()
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        """Hold one model slot, waiting in the queue if need be (see check)."""
+        self.check()
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            yield
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {"running": self.running, "waiting": self.waiting,
+                "completed": self.completed, "rejected": self.rejected}
+
+
+def _blocks(schedule) -> list:
+    return [asdict(block) for block in schedule or []]
+
+
+class FocusBuddyService:
+    """The /plan, /adjust and /checkin endpoints over one shared agent process."""
+
+    def __init__(self, model_concurrency: int = 8, max_queue: int = 32, workers: int = 4):
+        self.gate = ModelGate(model_concurrency, max_queue)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="focus-buddy-local")
+        self._workers = workers
+        self._session_locks: "weakref.WeakValueDictionary" = weakref.WeakValueDictionary()
+        self._routes = {
+            ("POST", "/plan"): self.plan,
+            ("POST", "/adjust"): self.adjust,
+            ("POST", "/checkin"): self.checkin,
+            ("GET", "/health"): self.health,
+        }
+        self._sweeper = None
+        self.requests = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        """Start listening; port 0 picks a free port (see server.sockets)."""
+        self._sweeper = asyncio.ensure_future(self._sweep_sessions())
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+    def close(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+        self._pool.shutdown(wait=False)
+
+    async def _sweep_sessions(self) -> None:
+        while True:
+            await asyncio.sleep(SWEEP_SECONDS)
+            await main.get_session_manager().sweep()
+
+    async def _local(self, fn, *args):
+        """Run a local planning stage in the thread pool, keeping the trace context."""
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            self._pool, functools.partial(context.run, fn, *args))
+
+    async def _model(self, runner, prompt: str, user_id: str, session_id: str) -> str:
+        async with self.gate.slot():
+            return await self._run_model(runner, prompt, user_id, session_id)
+
+    @staticmethod
+    async def _run_model(runner, prompt: str, user_id: str, session_id: str) -> str:
+        """main.run_prompt with its failures raised as ModelError; call it
+        while holding a gate slot."""
+        try:
+            return await main.run_prompt(runner, prompt, user_id, session_id)
+        except Exception as e:
+            raise ModelError(f"{type(e).__name__}: {e}") from e
+
+    def _session_lock(self, user_id: str, session_id: str) -> asyncio.Lock:
+        key = (user_id, session_id)
+        lock = self._session_locks.get(key)
+        if lock is None:
+            lock = self._session_locks[key] = asyncio.Lock()
+        return lock
+
+    # Endpoints: each takes the parsed JSON body and returns a JSON-able dict
+
+    async def plan(self, body: dict) -> dict:
+        raw_text = body.get("tasks")
+        if not isinstance(raw_text, str) or not raw_text.strip():
+            raise _bad_request('"tasks" must be non-empty text')
+        user_id = _text(body, "user_id", "focus_user")
+        session_id = _text(body, "session_id", "") or uuid.uuid4().hex
+        available_minutes = _int(body, "available_minutes", 25, minimum=1)
+        energy = _text(body, "energy", "medium")
+        fast_path = _bool(body, "fast_path", True)
+        present = _bool(body, "present", True)
+        top_k = None if body.get("top_k") is None else _int(body, "top_k")
+
+        async with self._session_lock(user_id, session_id):
+            with tracer.plan(plan_id=session_id, mode="fast" if fast_path else "agent",
+                             input_lines=raw_text.count("\n") + 1, input_chars=len(raw_text)):
+                if not present:
+                    plan = await self._local(main.plan_locally, raw_text, available_minutes,
+                                             user_id, session_id, energy)
+                    return {"session_id": session_id, "plan": describe_plan(plan),
+                            "schedule": _blocks(plan.schedule), "text": None}
+
+                # The slot is taken before planning resets the session, so a
+                # rejected request leaves the session as it was
+                async with self.gate.slot():
+                    runner, prompt, plan = await self._local(main.prepare_run, raw_text, available_minutes,
+                                                             fast_path, user_id, session_id, energy, top_k)
+                    text = await self._run_model(runner, prompt, user_id, session_id)
+            schedule = main.session_store.get(user_id, session_id)["current_focus_plan"]
+        return {"session_id": session_id, "plan": describe_plan(plan) if plan is not None else None,
+                "schedule": _blocks(schedule), "text": text}
+
+    async def adjust(self, body: dict) -> dict:
+        # Validated in full first, so a bad item doesn't leave the plan half adjusted
+        completed = [(_text(item, "title"), _int(item, "actual_minutes", 0))
+                     for item in _objects(body, "completed")]
+        updated = [(_text(item, "title"), _int(item, "minutes", minimum=1))
+                   for item in _objects(body, "updated")]
+        added = _text(body, "added", "")
+        user_id, session_id = self._session_ids(body)
+        async with self._session_lock(user_id, session_id):
+            main.get_session_manager().touch(user_id, session_id)
+            messages = await self._local(self._apply_adjustments, user_id, session_id,
+                                         completed, updated, added)
+            schedule = main.session_store.get(user_id, session_id)["current_focus_plan"]
+        return {"session_id": session_id, "messages": messages, "schedule": _blocks(schedule)}
+
+    @staticmethod
+    def _apply_adjustments(user_id: str, session_id: str, completed: list, updated: list,
+                           added: str) -> list:
+        messages = []
+        for title, actual_minutes in completed:
+            messages.append(main.complete_task(user_id, session_id, title, actual_minutes))
+        for title, minutes in updated:
+            messages.append(main.update_task_minutes(user_id, session_id, title, minutes))
+        if added:
+            messages.append(main.add_tasks(user_id, session_id, added))
+        return messages
+
+    async def checkin(self, body: dict) -> dict:
+        user_id, session_id = self._session_ids(body)
+        message = body.get("message")
+        if not isinstance(message, str) or not message.strip():
+            raise _bad_request('"message" must be non-empty text')
+        self.gate.check()
+        async with self._session_lock(user_id, session_id):
+            text = await self._model(main.get_runner(), message, user_id, session_id)
+            schedule = main.session_store.get(user_id, session_id)["current_focus_plan"]
+        return {"session_id": session_id, "schedule": _blocks(schedule), "text": text}
+
+    async def health(self, body: dict) -> dict:
+        return {"requests": self.requests, "workers": self._workers, "model": self.gate.stats(),
+                "gateway": main.get_gateway().stats(), "sessions": main.get_session_manager().stats()}
+
+    @staticmethod
+    def _session_ids(body: dict):
+        user_id = _text(body, "user_id", "focus_user")
+        session_id = body.get("session_id")
+        if not isinstance(session_id, str) or not session_id:
+            raise _bad_request('"session_id" is required')
+        memory = main.session_store.find(user_id, session_id)
+        if memory is None or memory["current_focus_plan"] is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"no plan for session {session_id!r}")
+        return user_id, session_id
+
+    # HTTP/1.1 with keep-alive, one request at a time per connection
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                keep_alive = await self._handle_request(request_line, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, request_line: bytes, reader, writer) -> bool:
+        self.requests += 1
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if not line.strip():
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "malformed request line"}, False)
+            return False
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+        extra = {}
+        raw = None
+        try:
+            length = _content_length(headers)
+            raw = await reader.readexactly(length) if length else b""
+            handler = self._routes.get((method, target.split("?", 1)[0]))
+            if handler is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND, f"no route for {method} {target}")
+            try:
+                body = json.loads(raw) if raw else {}
+            except ValueError:
+                raise _bad_request("body is not valid JSON")
+            if not isinstance(body, dict):
+                raise _bad_request("body must be a JSON object")
+            status, payload = HTTPStatus.OK, await handler(body)
+        except HTTPError as e:
+            status, payload = e.status, {"error": str(e)}
+        except Overloaded:
+            status, payload = HTTPStatus.SERVICE_UNAVAILABLE, {"error": "model queue is full"}
+            extra["Retry-After"] = str(RETRY_AFTER_SECONDS)
+        except ModelError as e:
+            logger.error("model call failed for %s %s", method, target, exc_info=e.__cause__)
+            status, payload = HTTPStatus.BAD_GATEWAY, {"error": f"model call failed: {e}"}
+        except (ConnectionError, asyncio.IncompleteReadError):
+            raise
+        except Exception:
+            logger.exception("error handling %s %s", method, target)
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "internal server error"}
+        if raw is None:
+            keep_alive = False  # the body was never read, so the stream can't be reused
+        self._respond(writer, status, payload, keep_alive, extra)
+        return keep_alive
+
+    @staticmethod
+    def _respond(writer, status: int, payload: dict, keep_alive: bool, extra: dict = None) -> None:
+        body = json.dumps(payload).encode()
+        status = HTTPStatus(status)
+        head = [f"HTTP/1.1 {status.value} {status.phrase}",
+                "Content-Type: application/json",
+                f"Content-Length: {len(body)}",
+                f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        head += [f"{name}: {value}" for name, value in (extra or {}).items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+
+
+async def serve(host: str, port: int, model_concurrency: int, max_queue: int, workers: int) -> None:
+    service = FocusBuddyService(model_concurrency, max_queue, workers)
+    server = await service.start(host, port)
+    print(f"Focus Buddy listening on http://{host}:{server.sockets[0].getsockname()[1]}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--model-concurrency", type=int, default=8,
+                        help="model calls running at once (default 8)")
+    parser.add_argument("--max-queue", type=int, default=32,
+                        help="model calls waiting for a slot before new ones get 503 (default 32)")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="threads for the local planning stages (default 4)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    try:
+        asyncio.run(serve(args.host, args.port, args.model_concurrency, args.max_queue, args.workers))
+    except KeyboardInterrupt:
+        pass
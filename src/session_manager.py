@@ -0,0 +1,254 @@
+"""
+Session lifecycle for the long-running runners: expiry, LRU eviction and
+history compaction.
+
+main.py keeps one InMemoryRunner per agent for the life of the process, and
+every plan leaves an ADK session (its whole event history) in the runner
+plus tool memory in main.session_store. SessionManager keeps both bounded:
+
+- sessions idle for longer than ttl_seconds are evicted;
+- beyond max_sessions, the least recently used sessions are evicted;
+- after each run, turns older than the last keep_turns are folded into one
+  short summary event, so a session that keeps going stays small.
+
+Evicting a session deletes it from every runner that used it and forgets its
+tool memory. Sessions in the middle of a run are never evicted. stats()
+reports resident sessions and their size (the serialized ADK sessions,
+measured after each run). Compaction and measuring go through the runner's
+session service and run outside the manager's lock, and only once no other
+run is using the session. Settings of 0 turn the matching limit off.
+"""
+
+import contextlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+DEFAULT_TTL_SECONDS = 3600
+DEFAULT_MAX_SESSIONS = 10_000
+DEFAULT_KEEP_TURNS = 4
+
+# A compaction summary keeps this many lines, each cut to SUMMARY_LINE_CHARS
+SUMMARY_LINES = 12
+SUMMARY_LINE_CHARS = 120
+SUMMARY_PREFIX = "[Earlier in this session]"
+
+SessionKey = Tuple[str, str]
+
+
+@dataclass
+class _Entry:
+    last_used: float
+    runners: list = field(default_factory=list)
+    in_use: int = 0
+    bytes: int = 0
+
+
+def _session_state(state: dict) -> dict:
+    """The session-scoped part of a session's state (app:, user: and temp:
+    keys are kept by the session service, not the session)."""
+    return {k: v for k, v in state.items() if not k.startswith(("app:", "user:", "temp:"))}
+
+
+def _is_summary(event) -> bool:
+    parts = event.content.parts if event.content and event.content.parts else []
+    return bool(parts) and bool(parts[0].text) and parts[0].text.startswith(SUMMARY_PREFIX)
+
+
+def summary_lines(events) -> List[str]:
+    """One short line per user message, answer and tool call in events, with
+    the lines of an earlier summary carried over."""
+    lines = []
+    for event in events:
+        if event.partial:
+            continue
+        for part in event.content.parts if event.content and event.content.parts else []:
+            if part.text and part.text.startswith(SUMMARY_PREFIX):
+                lines.extend(part.text[len(SUMMARY_PREFIX):].strip().splitlines())
+            elif part.text and part.text.strip():
+                speaker = "User" if event.author == "user" else "Assistant"
+                lines.append(f"{speaker}: {part.text.strip().splitlines()[0][:SUMMARY_LINE_CHARS]}")
+            elif part.function_call:
+                lines.append(f"Called {part.function_call.name}")
+    return lines[-SUMMARY_LINES:]
+
+
+def summary_event(events):
+    """One user event standing in for events in the model's context."""
+    from google.adk.events import Event
+    from google.genai import types
+
+    text = "\n".join([SUMMARY_PREFIX, *summary_lines(events)])
+    last = events[-1]
+    return Event(invocation_id=last.invocation_id, author="user", timestamp=last.timestamp,
+                 content=types.Content(role="user", parts=[types.Part(text=text)]))
+
+
+class SessionManager:
+    """Tracks when each session was last used and evicts and compacts them."""
+
+    def __init__(self, store, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS, keep_turns: int = DEFAULT_KEEP_TURNS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.keep_turns = keep_turns
+        self.clock = clock
+        # Least recently used first
+        self._entries: "OrderedDict[SessionKey, _Entry]" = OrderedDict()
+        # Evicted sessions whose ADK sessions are still to be deleted, by key
+        self._doomed: Dict[SessionKey, list] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._in_use = 0
+        self.evicted_ttl = 0
+        self.evicted_lru = 0
+        self.compacted_events = 0
+
+    def touch(self, user_id: str, session_id: str, runner=None) -> None:
+        """Mark a session as just used (with an ADK session in runner, if
+        given) and evict whatever is now over the limits."""
+        with self._lock:
+            self._touch((user_id, session_id), runner)
+            self._evict()
+
+    def _touch(self, key: SessionKey, runner) -> _Entry:
+        entry = self._entries.get(key)
+        if entry is None:
+            # Back before its evicted ADK sessions were deleted: keep tracking them
+            entry = self._entries[key] = _Entry(self.clock(), self._doomed.pop(key, []))
+        else:
+            entry.last_used = self.clock()
+            self._entries.move_to_end(key)
+        if runner is not None and all(r is not runner for r in entry.runners):
+            entry.runners.append(runner)
+        return entry
+
+    def _evict(self) -> None:
+        now = self.clock()
+        over = len(self._entries) - self.max_sessions if self.max_sessions else 0
+        victims = []
+        for key, entry in self._entries.items():
+            expired = bool(self.ttl_seconds) and now - entry.last_used > self.ttl_seconds
+            if not expired and len(victims) >= over:
+                break
+            if not entry.in_use:
+                victims.append((key, expired))
+        for key, expired in victims:
+            entry = self._entries.pop(key)
+            self._bytes -= entry.bytes
+            if expired:
+                self.evicted_ttl += 1
+            else:
+                self.evicted_lru += 1
+            self.store.discard(*key)
+            if entry.runners:
+                self._doomed[key] = entry.runners
+
+    async def flush(self) -> None:
+        """Delete the ADK sessions of evicted sessions."""
+        with self._lock:
+            doomed, self._doomed = self._doomed, {}
+        for (user_id, session_id), runners in doomed.items():
+            with self._lock:
+                entry = self._entries.get((user_id, session_id))
+                if entry is not None:  # used again since it was evicted: keep it
+                    entry.runners.extend(r for r in runners if all(r is not e for e in entry.runners))
+                    continue
+            for runner in runners:
+                await runner.session_service.delete_session(app_name=runner.app_name, user_id=user_id,
+                                                            session_id=session_id)
+
+    async def sweep(self) -> None:
+        """Evict expired sessions now (touch only evicts when sessions are used)."""
+        with self._lock:
+            self._evict()
+        await self.flush()
+
+    async def evict(self, user_id: str, session_id: str) -> None:
+        """Drop one session now, e.g. a throwaway batch session."""
+        key = (user_id, session_id)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry.bytes
+                self._doomed[key] = self._doomed.get(key, []) + entry.runners
+            self.store.discard(*key)
+        await self.flush()
+
+    @contextlib.asynccontextmanager
+    async def use(self, runner, user_id: str, session_id: str):
+        """Hold a session for one run in runner. Afterwards its history is
+        compacted and measured, and sessions evicted meanwhile are deleted."""
+        key = (user_id, session_id)
+        with self._lock:
+            entry = self._touch(key, runner)
+            entry.in_use += 1
+            self._in_use += 1
+            self._evict()
+        try:
+            yield
+        finally:
+            with self._lock:
+                entry.last_used = self.clock()
+                resident = self._entries.get(key) is entry
+                if resident:
+                    self._entries.move_to_end(key)
+                # Left for the last of several concurrent runs in the session
+                runners = list(entry.runners) if resident and entry.in_use == 1 else []
+            size = folded = 0
+            try:
+                # Still counted as in use, so the session isn't evicted meanwhile
+                for runner in runners:
+                    runner_size, runner_folded = await self._compact(runner, user_id, session_id)
+                    size += runner_size
+                    folded += runner_folded
+            finally:
+                with self._lock:
+                    entry.in_use -= 1
+                    self._in_use -= 1
+                    self.compacted_events += folded
+                    if runners and self._entries.get(key) is entry:
+                        self._bytes += size - entry.bytes
+                        entry.bytes = size
+                await self.flush()
+
+    async def _compact(self, runner, user_id: str, session_id: str) -> Tuple[int, int]:
+        """Fold all but the last keep_turns turns of runner's session into a
+        summary event; returns the session's serialized size and the number
+        of events folded."""
+        service = runner.session_service
+        ids = dict(app_name=runner.app_name, user_id=user_id, session_id=session_id)
+        session = await service.get_session(**ids)
+        if session is None:
+            return 0, 0
+        events = session.events
+        starts = [i for i, event in enumerate(events) if event.author == "user" and not _is_summary(event)]
+        if not self.keep_turns or len(starts) <= self.keep_turns:
+            return len(session.model_dump_json()), 0
+        cut = starts[-self.keep_turns]
+        # Session services only append events, so the session is recreated
+        # with the summary in place of the folded events
+        await service.delete_session(**ids)
+        session = await service.create_session(state=_session_state(session.state), **ids)
+        for event in [summary_event(events[:cut]), *events[cut:]]:
+            await service.append_event(session, event)
+        return len(session.model_dump_json()), cut
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "resident": len(self._entries),
+                "resident_bytes": self._bytes,
+                "in_use": self._in_use,
+                "evicted_ttl": self.evicted_ttl,
+                "evicted_lru": self.evicted_lru,
+                "pending_deletes": len(self._doomed),
+                "compacted_events": self.compacted_events,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
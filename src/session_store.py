@@ -0,0 +1,63 @@
+"""
+Per-session memory for the Focus Buddy tools.
+
+Every ADK session (user id + session id) gets its own memory dict, so many
+plans can run concurrently in one process without overwriting each other's
+tasks or schedule. Tools find their memory through the ToolContext that ADK
+passes them.
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+
+def new_session_memory() -> dict:
+    """Empty memory for one session."""
+    return {
+        "current_focus_plan": None,
+        "planner": None,
+        "tasks": [],
+        "task_index": {},
+        "completed": []
+    }
+
+
+class SessionStore:
+    """Session memory dicts keyed by (user_id, session_id)."""
+
+    def __init__(self):
+        self._sessions: Dict[Tuple[str, str], dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str, session_id: str) -> dict:
+        """Memory for a session, created empty on first use."""
+        key = (user_id, session_id)
+        with self._lock:
+            memory = self._sessions.get(key)
+            if memory is None:
+                memory = self._sessions[key] = new_session_memory()
+            return memory
+
+    def find(self, user_id: str, session_id: str) -> Optional[dict]:
+        """Memory for a session, or None if it has none yet."""
+        with self._lock:
+            return self._sessions.get((user_id, session_id))
+
+    def reset(self, user_id: str, session_id: str) -> dict:
+        """Start a session over with empty memory."""
+        with self._lock:
+            memory = self._sessions[(user_id, session_id)] = new_session_memory()
+            return memory
+
+    def discard(self, user_id: str, session_id: str) -> None:
+        """Forget a session's memory."""
+        with self._lock:
+            self._sessions.pop((user_id, session_id), None)
+
+    def for_context(self, tool_context) -> dict:
+        """Memory for the session a tool is being invoked in."""
+        session = tool_context.session
+        return self.get(session.user_id, session.id)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
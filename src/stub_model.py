@@ -0,0 +1,125 @@
+"""
+Local stand-in for the Gemini model, for benchmarks and offline runs.
+
+ScriptedModel replays the Focus Buddy tool workflow (plan_focus_session, or
+parse -> prioritize -> schedule) as function calls, then answers with a plan
+built from the tool results, after an optional fixed latency per turn. In
+streaming mode the answer is sent as partial text chunks, one line at a
+time, with an optional delay between chunks. It never touches the network.
+Importing this module registers it with ADK for model names starting with
+"stub-", so `FOCUS_BUDDY_MODEL=stub-focus-buddy` swaps it in for Gemini.
+"""
+
+import asyncio
+import re
+from typing import AsyncGenerator, List, Optional, Tuple
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.models.registry import LLMRegistry
+from google.genai import types
+
+STUB_MODEL_NAME = "stub-focus-buddy"
+
+# Tool calls replayed in order; steps for tools the agent doesn't have are skipped.
+# Without an explicit script the composite tool is used when the agent has it.
+COMPOSITE_SCRIPT: Tuple[str, ...] = ("plan_focus_session_tool",)
+GRANULAR_SCRIPT: Tuple[str, ...] = ("parse_tasks_tool", "prioritize_tasks_tool", "create_schedule_tool")
+
+_MINUTES_RE = re.compile(r'next (\d+) minutes')
+_ENERGY_RE = re.compile(r'energy level is (\w+)')
+
+
+class ScriptedModel(BaseLlm):
+    """Fake LLM that replays scripted tool calls with a configurable latency."""
+
+    model: str = STUB_MODEL_NAME
+    latency_seconds: float = 0.0
+    chunk_latency_seconds: float = 0.0
+    script: Optional[Tuple[str, ...]] = None
+    calls: int = 0
+
+    @classmethod
+    def supported_models(cls) -> List[str]:
+        return [r"stub-.*"]
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        content = self._next_turn(llm_request)
+        text = content.parts[0].text
+        if stream and text:
+            for chunk in text.splitlines(keepends=True):
+                yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=chunk)]),
+                                  partial=True)
+                if self.chunk_latency_seconds:
+                    await asyncio.sleep(self.chunk_latency_seconds)
+        yield LlmResponse(content=content)
+
+    def _next_turn(self, llm_request: LlmRequest) -> types.Content:
+        user_text, responses = _current_turn(llm_request.contents)
+        done = {name for name, _ in responses}
+        available = set(llm_request.tools_dict or {})
+
+        script = self.script
+        if script is None:
+            script = COMPOSITE_SCRIPT if COMPOSITE_SCRIPT[0] in available else GRANULAR_SCRIPT
+        for name in script:
+            if name in available and name not in done:
+                return types.Content(role="model", parts=[types.Part(
+                    function_call=types.FunctionCall(name=name, args=_tool_args(name, user_text))
+                )])
+
+        plan = responses[-1][1] if responses else user_text
+        text = (
+            "**Summary:** Here is your focus plan.\n\n"
+            f"**Timeline:**\n{plan}\n\n"
+            "**Check-in:** Come back when the session is over and tell me what got done."
+        )
+        return types.Content(role="model", parts=[types.Part(text=text)])
+
+
+def _current_turn(contents: List[types.Content]):
+    """Latest user message text and the (tool name, result text) responses since it."""
+    responses = []
+    for content in reversed(contents or []):
+        for part in reversed(content.parts or []):
+            if part.function_response is not None:
+                result = part.function_response.response or {}
+                responses.append((part.function_response.name, str(result.get("result", result))))
+            elif content.role == "user" and part.text:
+                responses.reverse()
+                return part.text, responses
+    responses.reverse()
+    return "", responses
+
+
+def _task_list(user_text: str) -> str:
+    """The pasted task list, as a model would pass it to the tools: the prompt
+    (see main.agent_prompt) without its "I have these tasks..." and "Please
+    create my focus plan." paragraphs. Text not shaped like that is used whole."""
+    paragraphs = user_text.strip().split("\n\n")
+    if len(paragraphs) < 3:
+        return user_text
+    return "\n\n".join(paragraphs[1:-1]).strip()
+
+
+def _tool_args(name: str, user_text: str) -> dict:
+    minutes = _MINUTES_RE.search(user_text)
+    available_minutes = int(minutes.group(1)) if minutes else 25
+    if name == "parse_tasks_tool":
+        return {"raw_text": _task_list(user_text)}
+    if name == "create_schedule_tool":
+        return {"available_minutes": available_minutes}
+    if name == "plan_focus_session_tool":
+        energy = _ENERGY_RE.search(user_text)
+        return {"raw_text": _task_list(user_text), "available_minutes": available_minutes,
+                "energy": energy.group(1) if energy else "medium"}
+    return {}
+
+
+LLMRegistry.register(ScriptedModel)
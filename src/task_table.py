@@ -0,0 +1,223 @@
+"""
+Columnar task storage for large backlogs.
+
+A TaskTable keeps tasks in typed arrays (minutes, deadline, score) with titles
+and deadlines interned in a shared string pool, instead of one Python object
+per task. It behaves like a List[Task] for reading: len(), iteration and
+indexing return lightweight TaskRow views, and prioritize_tasks /
+create_focus_schedule accept it directly.
+
+This uses the standard library `array` module so the agent keeps its small
+dependency footprint; the columns are contiguous machine-typed buffers and
+sorting is an argsort over a precomputed key that only reorders row ids,
+never the columns themselves.
+"""
+
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Sequence
+
+from deadlines import resolver_for, urgency_key
+from scoring import PriorityScorer, default_scorer
+
+
+class TaskRow:
+    """View of one row of a TaskTable, shaped like a Task.
+
+    Holds the physical row id, so it stays valid across reordered views.
+    """
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "TaskTable", index: int):
+        self._table = table
+        self._index = index
+
+    @property
+    def title(self) -> str:
+        return self._table._pool[self._table.title_ids[self._index]]
+
+    @property
+    def deadline(self) -> str:
+        return self._table._pool[self._table.deadline_ids[self._index]]
+
+    @property
+    def estimated_minutes(self) -> int:
+        return self._table.minutes[self._index]
+
+    @estimated_minutes.setter
+    def estimated_minutes(self, value: int) -> None:
+        self._table.minutes[self._index] = value
+
+    @property
+    def priority_score(self) -> float:
+        return self._table.scores[self._index]
+
+    @priority_score.setter
+    def priority_score(self, value: float) -> None:
+        self._table.scores[self._index] = value
+
+    def to_task(self):
+        from tools import Task
+        return Task(title=self.title, deadline=self.deadline,
+                    estimated_minutes=self.estimated_minutes,
+                    priority_score=self.priority_score)
+
+    def __repr__(self) -> str:
+        return (f"TaskRow(title={self.title!r}, deadline={self.deadline!r}, "
+                f"estimated_minutes={self.estimated_minutes})")
+
+
+class TaskTable:
+    """Tasks stored column by column.
+
+    take() and prioritized() return tables that share the columns and only
+    hold their own row order, like a sorted list sharing Task objects: a
+    score written through one view is seen by the others.
+    """
+
+    def __init__(self):
+        # Interned titles and deadlines; id 0 is the empty string (no deadline)
+        self._pool = [""]
+        self._pool_index: Dict[str, int] = {"": 0}
+        self.title_ids = array("i")
+        self.deadline_ids = array("i")
+        self.minutes = array("l")
+        self.scores = array("d")
+        # Physical row ids in this table's order, or None for storage order
+        self._order = None
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable) -> "TaskTable":
+        """Build a table from Task objects (or anything with the same attributes)."""
+        table = cls()
+        for task in tasks:
+            table.append(task.title, task.estimated_minutes, task.deadline,
+                         getattr(task, "priority_score", 0.0))
+        return table
+
+    def _intern(self, text: str) -> int:
+        text_id = self._pool_index.get(text)
+        if text_id is None:
+            text_id = self._pool_index[text] = len(self._pool)
+            self._pool.append(text)
+        return text_id
+
+    def append(self, title: str, estimated_minutes: int = 10, deadline: str = "",
+               priority_score: float = 0.0) -> None:
+        if self._order is not None:
+            raise ValueError("Cannot append to a reordered view of a TaskTable")
+        self.title_ids.append(self._intern(title))
+        self.deadline_ids.append(self._intern(deadline or ""))
+        self.minutes.append(estimated_minutes)
+        self.scores.append(priority_score)
+
+    def row_ids(self) -> Sequence[int]:
+        """Physical row ids (indexes into the columns) in table order."""
+        return range(len(self.minutes)) if self._order is None else self._order
+
+    def take(self, indices: Iterable[int]) -> "TaskTable":
+        """View with the given rows, in the given order (shares the columns)."""
+        row_ids = self.row_ids()
+        if self._order is not None:
+            indices = map(row_ids.__getitem__, indices)
+        return self._view(array("l", indices))
+
+    def _view(self, order: array) -> "TaskTable":
+        table = TaskTable.__new__(TaskTable)
+        table.__dict__.update(self.__dict__)
+        table._order = order
+        return table
+
+    def argsort(self, keys) -> array:
+        """Physical row ids of this table sorted by keys (indexed by physical row id).
+
+        The sort is stable, so rows with equal keys keep their current order.
+        """
+        return array("l", sorted(self.row_ids(), key=keys.__getitem__))
+
+    def prioritized(self, scorer: PriorityScorer = None, order: str = "score",
+                    now: datetime = None) -> "TaskTable":
+        """Same ordering as prioritize_tasks: highest score first, then shortest
+        first, or deadline-first for order="edf"/"slack".
+
+        Scores are written to the shared score column. Each distinct title and
+        deadline is scored (and resolved) once, since they are interned.
+        """
+        scorer = scorer or default_scorer
+        row_ids = self.row_ids()
+        pool, title_ids, deadline_ids, minutes = (
+            self._pool, self.title_ids, self.deadline_ids, self.minutes)
+
+        title_scores: Dict[int, float] = {}
+        deadline_scores: Dict[int, float] = {}
+        duration_scores: Dict[int, float] = {}
+        scores = self.scores
+        for i in row_ids:
+            t, d, m = title_ids[i], deadline_ids[i], minutes[i]
+            ts = title_scores.get(t)
+            if ts is None:
+                ts = title_scores[t] = scorer.title_score(pool[t])
+            ds = deadline_scores.get(d)
+            if ds is None:
+                ds = deadline_scores[d] = scorer.deadline_score(pool[d])
+            ms = duration_scores.get(m)
+            if ms is None:
+                ms = duration_scores[m] = scorer.duration_score(m)
+            scores[i] = ts + ds + ms
+
+        if order == "score":
+            return self._view(self.argsort(self._packed_keys(row_ids, [(scores, True), (minutes, False)])))
+
+        now = now or datetime.now()
+        resolver = resolver_for(now.date())
+        due: Dict[int, datetime] = {0: None}  # pool id 0 is the empty deadline
+        # Seconds until due (less the task's own time for "slack"); no due date sorts last
+        urgency = array("d", bytes(8 * len(minutes)))
+        for i in row_ids:
+            d = deadline_ids[i]
+            if d not in due:
+                due[d] = resolver.resolve(pool[d], now)
+            no_due, seconds = urgency_key(due[d], minutes[i], order, now)
+            urgency[i] = float("inf") if no_due else seconds
+        keys = self._packed_keys(row_ids, [(urgency, False), (scores, True), (minutes, False)])
+        return self._view(self.argsort(keys))
+
+    def _packed_keys(self, row_ids: Sequence[int], columns) -> array:
+        """One integer key per physical row, ordered like the tuple of the rows'
+        values in columns, given as (column, descending) pairs. Each column's
+        distinct values are ranked and the ranks combined in mixed radix, so no
+        per-row tuple is built."""
+        keys = array("q", bytes(8 * len(self.minutes)))
+        for column, descending in columns:
+            ranks = {v: r for r, v in enumerate(sorted({column[i] for i in row_ids}, reverse=descending))}
+            radix = len(ranks)
+            for i in row_ids:
+                keys[i] = keys[i] * radix + ranks[column[i]]
+        return keys
+
+    def to_tasks(self) -> list:
+        return [row.to_task() for row in self]
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns, row order and string pool."""
+        columns = [self.title_ids, self.deadline_ids, self.minutes, self.scores]
+        if self._order is not None:
+            columns.append(self._order)
+        return (sum(col.itemsize * len(col) for col in columns)
+                + sum(len(s) for s in self._pool))
+
+    def __len__(self) -> int:
+        return len(self.minutes) if self._order is None else len(self._order)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(range(*index.indices(len(self))))
+        return TaskRow(self, self.row_ids()[index])
+
+    def __iter__(self) -> Iterator[TaskRow]:
+        for row_id in self.row_ids():
+            yield TaskRow(self, row_id)
+
+    def __repr__(self) -> str:
+        return f"<TaskTable rows={len(self)} strings={len(self._pool)}>"
@@ -0,0 +1,145 @@
+"""
+Text returned to the model by the Focus Buddy tools.
+
+Every tool result stays in the model's context for the rest of the plan, so
+its size is paid again on each later turn. Besides the original prose form
+there is a compact form: one delimited line per task, with tasks referred to
+by their parse-order number after the first mention, and an optional token
+budget past which the tail is summarized in one line.
+
+Configure with configure_tool_output() or the FOCUS_BUDDY_COMPACT_TOOLS=1 and
+FOCUS_BUDDY_TOOL_TOKEN_BUDGET=<tokens> environment variables.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from tools import Task, ScheduledBlock
+from tracing import estimate_tokens
+
+
+@dataclass
+class ToolOutputConfig:
+    compact: bool = False
+    token_budget: Optional[int] = None
+
+
+tool_output_config = ToolOutputConfig(
+    compact=os.environ.get("FOCUS_BUDDY_COMPACT_TOOLS") == "1",
+    token_budget=int(os.environ["FOCUS_BUDDY_TOOL_TOKEN_BUDGET"])
+    if os.environ.get("FOCUS_BUDDY_TOOL_TOKEN_BUDGET") else None,
+)
+
+
+_UNSET = object()
+
+
+def configure_tool_output(compact: bool = None, token_budget=_UNSET) -> ToolOutputConfig:
+    """Change the output mode; token_budget=None removes the budget."""
+    if compact is not None:
+        tool_output_config.compact = compact
+    if token_budget is not _UNSET:
+        tool_output_config.token_budget = token_budget
+    return tool_output_config
+
+
+def task_index(tasks: Sequence[Task]) -> Dict[str, int]:
+    """1-based parse-order number of each task title (first occurrence wins)."""
+    index: Dict[str, int] = {}
+    for i, task in enumerate(tasks, 1):
+        index.setdefault(task.title, i)
+    return index
+
+
+def _fit(header: str, lines: List[str], budget: Optional[int], tail_summary) -> str:
+    """Join header and lines, replacing the lines past the token budget with
+    tail_summary(number_of_lines_dropped)."""
+    if budget is not None:
+        used = estimate_tokens(header)
+        for kept, line in enumerate(lines):
+            used += estimate_tokens(line) + 1
+            if used > budget:
+                lines = lines[:kept] + [tail_summary(kept)]
+                break
+    return "\n".join([header] + lines) + "\n"
+
+
+def format_parsed(tasks: Sequence[Task], config: ToolOutputConfig = None) -> str:
+    config = config or tool_output_config
+
+    def tail(kept: int) -> str:
+        rest = tasks[kept:]
+        return f"+{len(rest)} more tasks ({sum(t.estimated_minutes for t in rest)} min total)"
+
+    if config.compact:
+        header = f"tasks={len(tasks)} (n|title|min|due)"
+        lines = [f"{i}|{task.title}|{task.estimated_minutes}|{task.deadline}"
+                 for i, task in enumerate(tasks, 1)]
+    else:
+        header = f"Found {len(tasks)} tasks:"
+        lines = [f"{i}. {task.title} ({task.estimated_minutes} min"
+                 + (f", due: {task.deadline}" if task.deadline else "") + ")"
+                 for i, task in enumerate(tasks, 1)]
+    return _fit(header, lines, config.token_budget, tail)
+
+
+def format_prioritized(tasks: Sequence[Task], index: Dict[str, int],
+                       config: ToolOutputConfig = None) -> str:
+    config = config or tool_output_config
+    if config.compact:
+        order = [str(index.get(task.title, task.title)) for task in tasks]
+        if config.token_budget is not None:
+            chars = len("order=")
+            for kept, ref in enumerate(order):
+                chars += len(ref) + 1
+                if (chars + 3) // 4 > config.token_budget:
+                    order = order[:kept] + [f"+{len(order) - kept} more"]
+                    break
+        return "order=" + ",".join(order) + "\n"
+
+    lines = [f"{i}. {task.title} ({task.estimated_minutes} min)" for i, task in enumerate(tasks, 1)]
+    return _fit("Tasks prioritized (urgent/deadline first, then by time):", lines,
+                config.token_budget, lambda kept: f"+{len(tasks) - kept} more tasks")
+
+
+def format_schedule(schedule: Sequence[ScheduledBlock], available_minutes: int,
+                    index: Dict[str, int], config: ToolOutputConfig = None) -> str:
+    config = config or tool_output_config
+    if config.compact:
+        lines = []
+        for block in schedule:
+            title = block.task_title
+            partial = title.endswith(" (partial)")
+            if partial:
+                title = title[:-len(" (partial)")]
+            ref = f"#{index[title]}" if title in index else title
+            lines.append(f"{block.start_minute}-{block.end_minute}|{ref}" + ("|partial" if partial else ""))
+        header = f"plan={available_minutes}min blocks={len(schedule)} (start-end|task)"
+    else:
+        lines = [f"  {block.start_minute}-{block.end_minute} min: {block.task_title}" for block in schedule]
+        header = f"Created {available_minutes}-minute focus plan with {len(schedule)} blocks:"
+    return _fit(header, lines, config.token_budget, lambda kept: f"+{len(schedule) - kept} more blocks")
+
+
+def format_schedule_diff(diff, index: Dict[str, int], config: ToolOutputConfig = None) -> str:
+    """Blocks removed (-) and added (+) by an incremental re-plan."""
+    config = config or tool_output_config
+    if not diff:
+        return "Schedule unchanged.\n"
+    changes = [("-", block) for block in diff.removed] + [("+", block) for block in diff.added]
+    if config.compact:
+        lines = []
+        for sign, block in changes:
+            title = block.task_title
+            partial = title.endswith(" (partial)")
+            if partial:
+                title = title[:-len(" (partial)")]
+            ref = f"#{index[title]}" if title in index else title
+            lines.append(f"{sign}{block.start_minute}-{block.end_minute}|{ref}" + ("|partial" if partial else ""))
+        header = f"changes={len(changes)} (+/-start-end|task)"
+    else:
+        lines = [f"  {sign} {block.start_minute}-{block.end_minute} min: {block.task_title}"
+                 for sign, block in changes]
+        header = "Schedule changes (- removed, + added):"
+    return _fit(header, lines, config.token_budget, lambda kept: f"+{len(changes) - kept} more changes")
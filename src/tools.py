@@ -286,14 +286,21 @@ TOOL_FUNCTIONS = {
 '''
 
 from dataclasses import dataclass
-from typing import List
+from typing import Callable, Iterable, Iterator, List, Optional
 import re
 
+from datetime import datetime
+
+from deadlines import resolver_for, urgency_key
+from scoring import PriorityScorer, default_scorer
+from task_table import TaskTable
+
 @dataclass
 class Task:
     title: str
     deadline: str = ""
     estimated_minutes: int = 10
+    priority_score: float = 0.0
 
 @dataclass
 class ScheduledBlock:
@@ -301,46 +308,216 @@ class ScheduledBlock:
     end_minute: int
     task_title: str
 
-def parse_tasks(raw_text: str) -> List[Task]:
-    """Parse messy task text into structured Task objects."""
+# Bullet points, dashes and list numbers at the start of a line
+_BULLET_RE = re.compile(r'[-*•\d.)\]]+\s*')
+
+# Time estimates ("30min", "1hr") and deadlines ("due: Monday") in a single scan
+_TOKEN_RE = re.compile(
+    r'(?P<amount>\d+)\s*(?P<unit>min|hour|hr)'
+    r'|(?:due|deadline|by)\s*:?\s*(?P<deadline>\S+)',
+    re.IGNORECASE,
+)
+_TIME_RE = re.compile(r'(\d+)\s*(min|hour|hr)', re.IGNORECASE)
+_DEADLINE_RE = re.compile(r'(due|deadline|by)\s*:?\s*(\S+)', re.IGNORECASE)
+_DIGIT_RE = re.compile(r'\d')
+
+
+def _parse_line_multipass(clean_line: str,
+                          default_minutes: Callable[[str], int] = None) -> Optional[Task]:
+    """Reference parser: strip the time estimate first, then look for a deadline."""
+    time_match = _TIME_RE.search(clean_line)
+    estimated_minutes = 10  # default
+    if time_match:
+        num = int(time_match.group(1))
+        unit = time_match.group(2).lower()
+        estimated_minutes = num if 'min' in unit else num * 60
+        clean_line = _TIME_RE.sub('', clean_line)
+
+    deadline_match = _DEADLINE_RE.search(clean_line)
+    deadline = deadline_match.group(2) if deadline_match else ""
+    if deadline_match:
+        clean_line = _DEADLINE_RE.sub('', clean_line)
+
+    clean_line = clean_line.strip(' ,-:')
+    if clean_line:
+        if not time_match and default_minutes is not None:
+            estimated_minutes = default_minutes(clean_line)
+        return Task(title=clean_line, deadline=deadline, estimated_minutes=estimated_minutes)
+    return None
+
+
+def _parse_line(line: str, default_minutes: Callable[[str], int] = None) -> Optional[Task]:
+    """Parse one line of task text, or return None if nothing is left of it.
+
+    default_minutes(title) supplies the estimate for a line without a time.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    bullet = _BULLET_RE.match(line)
+    if bullet:
+        line = line[bullet.end():]
+
+    estimated_minutes = 10  # default
+    deadline = ""
+    have_time = have_deadline = False
+    pieces = []
+    pos = 0
+    for match in _TOKEN_RE.finditer(line):
+        start, end = match.span()
+        token_deadline = match.group('deadline')
+        if token_deadline is None:
+            # Removing a time estimate glues its neighbours together, which
+            # can spell out a new deadline keyword ("d5minue").
+            if 0 < start and end < len(line) and line[start - 1].isalpha() and line[end].isalpha():
+                return _parse_line_multipass(line, default_minutes)
+            if not have_time:
+                have_time = True
+                num = int(match.group('amount'))
+                estimated_minutes = num if 'min' in match.group('unit').lower() else num * 60
+        else:
+            # A digit after the keyword may be (part of) a time estimate that
+            # the reference parser strips before it looks for deadlines.
+            if _DIGIT_RE.search(token_deadline):
+                return _parse_line_multipass(line, default_minutes)
+            if not have_deadline:
+                have_deadline = True
+                deadline = token_deadline
+        pieces.append(line[pos:start])
+        pos = end
+
+    if pieces:
+        pieces.append(line[pos:])
+        line = ''.join(pieces)
+    line = line.strip(' ,-:')
+    if line:
+        if not have_time and default_minutes is not None:
+            estimated_minutes = default_minutes(line)
+        return Task(title=line, deadline=deadline, estimated_minutes=estimated_minutes)
+    return None
+
+
+def parse_tasks(raw_text: str, default_minutes: Callable[[str], int] = None) -> List[Task]:
+    """Parse messy task text into structured Task objects.
+
+    Tasks without a time get default_minutes(title) if given (for example
+    DurationEstimator.default_minutes(user_id)), otherwise 10 minutes.
+    """
     tasks = []
-    lines = [line.strip() for line in raw_text.split('\n') if line.strip()]
-    
-    for line in lines:
-        # Remove bullet points, dashes, numbers
-        clean_line = re.sub(r'^[-*•\d.)\]]+\s*', '', line)
-        
-        # Extract time estimates if present (e.g., "30min", "1hr")
-        time_match = re.search(r'(\d+)\s*(min|hour|hr)', clean_line, re.IGNORECASE)
-        estimated_minutes = 10  # default
-        if time_match:
-            num = int(time_match.group(1))
-            unit = time_match.group(2).lower()
-            estimated_minutes = num if 'min' in unit else num * 60
-            clean_line = re.sub(r'\d+\s*(min|hour|hr)', '', clean_line, flags=re.IGNORECASE)
-        
-        # Extract deadline if present
-        deadline_match = re.search(r'(due|deadline|by)\s*:?\s*(\S+)', clean_line, re.IGNORECASE)
-        deadline = deadline_match.group(2) if deadline_match else ""
-        if deadline_match:
-            clean_line = re.sub(r'(due|deadline|by)\s*:?\s*\S+', '', clean_line, flags=re.IGNORECASE)
-        
-        clean_line = clean_line.strip(' ,-:')
-        if clean_line:
-            tasks.append(Task(title=clean_line, deadline=deadline, estimated_minutes=estimated_minutes))
-    
+    for line in raw_text.split('\n'):
+        task = _parse_line(line, default_minutes)
+        if task:
+            tasks.append(task)
     return tasks
 
-def prioritize_tasks(tasks: List[Task]) -> List[Task]:
-    """Sort tasks by urgency (deadline present) then by estimated time."""
-    def priority_key(task):
-        has_deadline = 1 if task.deadline else 0
-        return (-has_deadline, task.estimated_minutes)
-    
-    return sorted(tasks, key=priority_key)
+def parse_tasks_iter(stream: Iterable[str],
+                     default_minutes: Callable[[str], int] = None) -> Iterator[Task]:
+    """Lazily parse Task objects from a file or text stream, one line at a time.
+
+    Yields the same tasks as parse_tasks(stream.read()) without holding the
+    whole input or task list in memory.
+    """
+    for line in stream:
+        task = _parse_line(line, default_minutes)
+        if task:
+            yield task
+
+# Orderings prioritize_tasks supports
+PRIORITY_ORDERS = ("score", "edf", "slack")
+
+def prioritize_tasks(tasks: List[Task], scorer: PriorityScorer = None, order: str = "score",
+                     now: datetime = None) -> List[Task]:
+    """Score tasks (deadline urgency, quick wins, title keywords), then sort by
+    score (highest first) and estimated time (shortest first).
+
+    order="edf" puts tasks whose deadline resolves (see deadlines.py) first,
+    earliest due first; order="slack" does the same by slack, the time left
+    until the deadline minus the task's estimate. Ties and tasks without a
+    deadline fall back to the score order. now is the reference time for
+    deadlines (default: the current local time).
+
+    Writes priority_score onto each task. A TaskTable is scored and sorted
+    column-wise and returned as a new TaskTable.
+    """
+    if order not in PRIORITY_ORDERS:
+        raise ValueError(f"Unknown priority order: {order!r}")
+    scorer = scorer or default_scorer
+    if isinstance(tasks, TaskTable):
+        return tasks.prioritized(scorer, order=order, now=now)
+
+    for task in tasks:
+        task.priority_score = scorer.score(task)
+
+    if order == "score":
+        return sorted(tasks, key=lambda task: (-task.priority_score, task.estimated_minutes))
+
+    now = now or datetime.now()
+    resolver = resolver_for(now.date())
+    return sorted(tasks, key=lambda task: urgency_key(
+        resolver.resolve(task.deadline, now) if task.deadline else None,
+        task.estimated_minutes, order, now,
+    ) + (-task.priority_score, task.estimated_minutes))
+
+# Largest DP table (tasks x minutes) the optimal strategy solves exactly
+_OPTIMAL_MAX_CELLS = 2_000_000
+
+def _task_values(tasks: List[Task]) -> List[int]:
+    """Integer value of each task: its priority score in hundredths, plus one
+    so that tasks scoring 0 still fill spare minutes. Unscored tasks are
+    scored with the default scorer."""
+    return [round((task.priority_score or default_scorer.score(task)) * 100) + 1 for task in tasks]
+
+def _select_optimal(tasks: List[Task], values: List[int], capacity: int) -> List[int]:
+    """Indices of the tasks with the highest total value that fit in capacity (0/1 knapsack)."""
+    best = [0] * (capacity + 1)
+    taken = []
+    for task, value in zip(tasks, values):
+        weight = task.estimated_minutes
+        take = bytearray(capacity + 1)
+        for c in range(capacity, weight - 1, -1):
+            candidate = best[c - weight] + value
+            if candidate > best[c]:
+                best[c] = candidate
+                take[c] = 1
+        taken.append(take)
+
+    chosen = []
+    c = capacity
+    for i in range(len(tasks) - 1, -1, -1):
+        if taken[i][c]:
+            chosen.append(i)
+            c -= tasks[i].estimated_minutes
+    chosen.reverse()
+    return chosen
+
+def _select_by_density(tasks: List[Task], values: List[int], capacity: int) -> List[int]:
+    """Fallback for large inputs: fill the window by value per minute."""
+    order = sorted(range(len(tasks)),
+                   key=lambda i: -values[i] / max(tasks[i].estimated_minutes, 0.5))
+    chosen = []
+    used = 0
+    for i in order:
+        if used + tasks[i].estimated_minutes <= capacity:
+            chosen.append(i)
+            used += tasks[i].estimated_minutes
+    chosen.sort()
+    return chosen
+
+def create_focus_schedule(tasks: List[Task], available_minutes: int,
+                          strategy: str = "greedy") -> List[ScheduledBlock]:
+    """Create a schedule that fits within available time.
+
+    strategy="greedy" takes tasks in priority order until one doesn't fit.
+    strategy="optimal" keeps the top-ranked task that fits and fills the rest
+    of the window with the set of later tasks with the highest total
+    priority score, keeping their priority order.
+    Accepts a List[Task] or a TaskTable.
+    """
+    if strategy == "optimal":
+        return _create_optimal_schedule(tasks, available_minutes)
+    if strategy != "greedy":
+        raise ValueError(f"Unknown scheduling strategy: {strategy!r}")
 
-def create_focus_schedule(tasks: List[Task], available_minutes: int) -> List[ScheduledBlock]:
-    """Create a schedule that fits within available time."""
     schedule = []
     current_minute = 0
     
@@ -363,4 +540,29 @@ def create_focus_schedule(tasks: List[Task], available_minutes: int) -> List[Sch
                 ))
             break
     
-    return schedule
\ No newline at end of file
+    return schedule
+
+def _create_optimal_schedule(tasks: List[Task], available_minutes: int) -> List[ScheduledBlock]:
+    """Knapsack schedule; falls back to a density heuristic when the DP table gets too big."""
+    capacity = max(available_minutes, 0)
+    # The top-ranked task that fits is always kept, so it is never traded
+    # for several lower-priority ones
+    first = next((i for i, task in enumerate(tasks) if task.estimated_minutes <= capacity), None)
+    if first is None:
+        return []
+    rest = [tasks[i] for i in range(first + 1, len(tasks))]
+    capacity -= tasks[first].estimated_minutes
+    select = _select_optimal if len(rest) * (capacity + 1) <= _OPTIMAL_MAX_CELLS else _select_by_density
+    chosen = [first] + [first + 1 + i for i in select(rest, _task_values(rest), capacity)]
+
+    schedule = []
+    current_minute = 0
+    for i in chosen:
+        task = tasks[i]
+        schedule.append(ScheduledBlock(
+            start_minute=current_minute,
+            end_minute=current_minute + task.estimated_minutes,
+            task_title=task.title
+        ))
+        current_minute += task.estimated_minutes
+    return schedule
@@ -0,0 +1,287 @@
+"""
+Timing spans for Focus Buddy plans, tool calls and model turns.
+
+Spans are written as JSON lines (one object per span) and aggregated in an
+in-process MetricsRegistry that can be scraped with snapshot() or
+render_prometheus(). Tracing is off by default; while it is off every entry
+point returns after a single flag check.
+
+Enable it with FOCUS_BUDDY_TRACE=1 (metrics only) or
+FOCUS_BUDDY_TRACE=/path/to/spans.jsonl, or call tracer.configure().
+"""
+
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+class MetricsRegistry:
+    """Per-span-name count, total and max duration, plus summed counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans: Dict[str, dict] = {}
+
+    def observe(self, name: str, duration_ms: float, attrs: dict) -> None:
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                stats = self._spans[name] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "sums": {}}
+            stats["count"] += 1
+            stats["total_ms"] += duration_ms
+            stats["max_ms"] = max(stats["max_ms"], duration_ms)
+            sums = stats["sums"]
+            for key, value in attrs.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    sums[key] = sums.get(key, 0) + value
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {name: {**stats, "sums": dict(stats["sums"])} for name, stats in self._spans.items()}
+
+    def render_prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, stats in sorted(self.snapshot().items()):
+            label = f'{{span="{name}"}}'
+            lines.append(f"focus_buddy_span_count{label} {stats['count']}")
+            lines.append(f"focus_buddy_span_ms_total{label} {stats['total_ms']:.3f}")
+            lines.append(f"focus_buddy_span_ms_max{label} {stats['max_ms']:.3f}")
+            for key, value in sorted(stats["sums"].items()):
+                lines.append(f'focus_buddy_span_{key}_total{label} {value}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+class Span:
+    """One timed operation; attributes can be added while it is open."""
+
+    __slots__ = ("tracer", "name", "attrs", "plan", "_start", "_wall")
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: dict, plan: Optional["PlanSpan"]):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.plan = plan
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        self._wall = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        duration_ms = (time.perf_counter() - self._start) * 1000
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.tracer._record(self, duration_ms)
+
+
+class PlanSpan(Span):
+    """Span around a whole plan; counts the tool calls and model turns inside it."""
+
+    __slots__ = ("plan_id", "model_turns", "tool_calls", "_token")
+
+    def __init__(self, tracer: "Tracer", plan_id: str, attrs: dict):
+        super().__init__(tracer, "plan", attrs, None)
+        self.plan = self
+        self.plan_id = plan_id
+        self.model_turns = 0
+        self.tool_calls = 0
+
+    def __enter__(self) -> "PlanSpan":
+        super().__enter__()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _current_span.reset(self._token)
+        self.attrs["model_round_trips"] = self.model_turns
+        self.attrs["tool_calls"] = self.tool_calls
+        super().__exit__(exc_type, exc, tb)
+
+
+class _NoopSpan:
+    """Returned by every entry point while tracing is disabled."""
+
+    def set(self, **attrs) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+# Open plan span, and open tool span (for annotate), of the running task
+_current_span: contextvars.ContextVar = contextvars.ContextVar("focus_buddy_span", default=None)
+_current_tool_span: contextvars.ContextVar = contextvars.ContextVar("focus_buddy_tool_span", default=None)
+
+
+class Tracer:
+    """Creates spans and exports them to a JSON-lines file and a MetricsRegistry."""
+
+    def __init__(self):
+        self.enabled = False
+        self.metrics = MetricsRegistry()
+        self._path: Optional[str] = None
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def configure(self, enabled: bool = True, jsonl_path: Optional[str] = None) -> None:
+        self.enabled = enabled
+        self._path = jsonl_path
+
+    def plan(self, plan_id: Optional[str] = None, **attrs):
+        """Span for one whole plan; spans opened inside it are attributed to it."""
+        if not self.enabled:
+            return _NOOP
+        return PlanSpan(self, plan_id or f"plan-{next(self._ids)}", attrs)
+
+    def span(self, name: str, **attrs):
+        if not self.enabled:
+            return _NOOP
+        return Span(self, name, attrs, _current_span.get())
+
+    def annotate(self, **attrs) -> None:
+        """Add attributes to the innermost open span (tool or plan)."""
+        if not self.enabled:
+            return
+        span = _current_tool_span.get() or _current_span.get()
+        if span is not None:
+            span.set(**attrs)
+
+    def record(self, name: str, duration_ms: float, **attrs) -> None:
+        """Record a span measured elsewhere (e.g. between two ADK callbacks)."""
+        if not self.enabled:
+            return
+        span = Span(self, name, attrs, _current_span.get())
+        span._wall = time.time() - duration_ms / 1000
+        self._record(span, duration_ms)
+
+    def _record(self, span: Span, duration_ms: float) -> None:
+        plan = span.plan
+        if plan is not None and span is not plan:
+            if span.name.startswith("tool."):
+                plan.tool_calls += 1
+            elif span.name == "model.turn":
+                plan.model_turns += 1
+
+        self.metrics.observe(span.name, duration_ms, span.attrs)
+        if self._path:
+            record = {
+                "name": span.name,
+                "plan_id": plan.plan_id if plan is not None else None,
+                "start": span._wall,
+                "duration_ms": round(duration_ms, 3),
+                **span.attrs,
+            }
+            line = json.dumps(record, default=str)
+            with self._lock:
+                with open(self._path, "a") as f:
+                    f.write(line + "\n")
+
+
+tracer = Tracer()
+
+_env = os.environ.get("FOCUS_BUDDY_TRACE", "")
+if _env:
+    tracer.configure(enabled=True, jsonl_path=None if _env == "1" else _env)
+
+
+def traced_tool(func):
+    """Wrap an agent tool in a "tool.<name>" span recording its output size.
+
+    functools.wraps keeps the signature visible to ADK, so tool_context
+    injection and the generated function declaration are unchanged.
+    """
+    name = f"tool.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not tracer.enabled:
+            return func(*args, **kwargs)
+        with tracer.span(name) as span:
+            token = _current_tool_span.set(span)
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                _current_tool_span.reset(token)
+            text = str(result)
+            span.set(output_chars=len(text), output_tokens=estimate_tokens(text))
+            return result
+
+    return wrapper
+
+
+# Start times and prompt sizes of in-flight model turns, keyed by invocation
+# id, oldest first. Capped, in case a turn ends without any callback
+MAX_OPEN_MODEL_TURNS = 10_000
+_model_turn_starts: "OrderedDict[str, tuple]" = OrderedDict()
+
+
+def before_model_callback(callback_context, llm_request):
+    """ADK before_model_callback: start timing a model turn."""
+    if tracer.enabled:
+        chars = sum(len(part.text or "") for content in llm_request.contents or []
+                    for part in content.parts or [])
+        _model_turn_starts[callback_context.invocation_id] = (time.perf_counter(), chars)
+        _model_turn_starts.move_to_end(callback_context.invocation_id)
+        if len(_model_turn_starts) > MAX_OPEN_MODEL_TURNS:
+            _model_turn_starts.popitem(last=False)
+    return None
+
+
+def after_model_callback(callback_context, llm_response):
+    """ADK after_model_callback: record the model turn as a "model.turn" span.
+
+    When streaming, partial responses are skipped: the turn ends with the
+    final response, which carries the whole text.
+    """
+    if tracer.enabled and not llm_response.partial:
+        started = _model_turn_starts.pop(callback_context.invocation_id, None)
+        if started is not None:
+            start, prompt_chars = started
+            text = ""
+            calls = 0
+            if llm_response.content and llm_response.content.parts:
+                for part in llm_response.content.parts:
+                    text += part.text or ""
+                    calls += part.function_call is not None
+            tracer.record("model.turn", (time.perf_counter() - start) * 1000,
+                          agent=callback_context.agent_name,
+                          prompt_chars=prompt_chars, prompt_tokens=(prompt_chars + 3) // 4,
+                          output_chars=len(text), output_tokens=estimate_tokens(text),
+                          function_calls=calls)
+    return None
+
+
+def on_model_error_callback(callback_context, llm_request, error):
+    """ADK on_model_error_callback: record a failed model turn, with the error type."""
+    if tracer.enabled:
+        started = _model_turn_starts.pop(callback_context.invocation_id, None)
+        if started is not None:
+            start, prompt_chars = started
+            tracer.record("model.turn", (time.perf_counter() - start) * 1000,
+                          agent=callback_context.agent_name,
+                          prompt_chars=prompt_chars, prompt_tokens=(prompt_chars + 3) // 4,
+                          error=type(error).__name__)
+    return None
@@ -0,0 +1,188 @@
+"""
+Focus schedule across many free windows (a whole day or week).
+
+create_focus_schedule plans one window starting at minute 0. schedule_windows
+takes free intervals and busy intervals (meetings) on a shared minute
+timeline, cuts the free time into Pomodoro slots with short and long
+breaks, and places the prioritized tasks first-fit: each task goes into the
+earliest slot with room for it, and tasks longer than a slot are split into
+parts over later slots. Slot capacities live in a max segment tree, so each
+placement is O(log slots) however many windows there are.
+
+Minutes are on whatever timeline the caller picks (e.g. minutes since
+Monday 00:00); blocks come back as the usual ScheduledBlock.
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterable, List, Sequence, Tuple
+
+from tools import Task, ScheduledBlock
+
+Interval = Tuple[int, int]
+
+# Shortest slot or task part worth scheduling (same as create_focus_schedule's partial rule)
+MIN_SLOT_MINUTES = 5
+
+
+@dataclass
+class WindowPlan:
+    """Focus blocks, the breaks between them, and tasks that found no room."""
+    blocks: List[ScheduledBlock] = field(default_factory=list)
+    breaks: List[ScheduledBlock] = field(default_factory=list)
+    unscheduled: List[Task] = field(default_factory=list)
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Sorted, non-overlapping union of (start, end) intervals."""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def free_windows(free: Iterable[Interval], busy: Iterable[Interval] = ()) -> List[Interval]:
+    """Free intervals minus busy ones, as sorted disjoint windows."""
+    busy = merge_intervals(busy)
+    windows = []
+    j = 0
+    for start, end in merge_intervals(free):
+        while j < len(busy) and busy[j][1] <= start:
+            j += 1
+        k = j
+        while start < end and k < len(busy) and busy[k][0] < end:
+            if busy[k][0] > start:
+                windows.append((start, busy[k][0]))
+            start = max(start, busy[k][1])
+            k += 1
+        if start < end:
+            windows.append((start, end))
+    return windows
+
+
+def pomodoro_slots(windows: Sequence[Interval], focus_minutes: int = 25, break_minutes: int = 5,
+                   long_break_minutes: int = 15, long_break_every: int = 4):
+    """Cut windows into focus slots with breaks between them.
+
+    Every long_break_every-th break in a window is a long one; the count
+    starts over in each window (a meeting is a break too). Returns
+    (slots, breaks) as lists of (start, end).
+    """
+    slots, breaks = [], []
+    for start, end in windows:
+        t = start
+        count = 0
+        while end - t >= MIN_SLOT_MINUTES:
+            slot_end = min(t + focus_minutes, end)
+            slots.append((t, slot_end))
+            count += 1
+            pause = long_break_minutes if count % long_break_every == 0 else break_minutes
+            if slot_end + pause >= end:
+                break
+            breaks.append((slot_end, slot_end + pause))
+            t = slot_end + pause
+    return slots, breaks
+
+
+class SlotIndex:
+    """Max segment tree over slot capacities for first-fit queries."""
+
+    def __init__(self, capacities: Sequence[int]):
+        self._n = len(capacities)
+        size = 1
+        while size < max(self._n, 1):
+            size *= 2
+        self._size = size
+        tree = [0] * (2 * size)
+        tree[size:size + self._n] = capacities
+        for i in range(size - 1, 0, -1):
+            tree[i] = max(tree[2 * i], tree[2 * i + 1])
+        self._tree = tree
+
+    def capacity(self, i: int) -> int:
+        return self._tree[self._size + i]
+
+    def first_fit(self, need: int, lo: int = 0) -> int:
+        """Index of the first slot at or after lo with at least `need` free, or -1."""
+        if lo >= self._n:
+            return -1
+        return self._descend(1, 0, self._size, need, lo)
+
+    def _descend(self, node: int, left: int, right: int, need: int, lo: int) -> int:
+        tree = self._tree
+        if right <= lo or tree[node] < need:
+            return -1
+        if node >= self._size:
+            return node - self._size
+        mid = (left + right) // 2
+        found = self._descend(2 * node, left, mid, need, lo)
+        if found < 0:
+            found = self._descend(2 * node + 1, mid, right, need, lo)
+        return found
+
+    def take(self, i: int, minutes: int) -> None:
+        node = self._size + i
+        tree = self._tree
+        tree[node] -= minutes
+        node //= 2
+        while node:
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+            node //= 2
+
+
+def split_minutes(minutes: int, focus_minutes: int) -> List[int]:
+    """Split a task into the fewest parts that fit a slot, as evenly as possible
+    (52 min in 25-min slots -> 18, 17, 17)."""
+    n = max(1, -(-minutes // focus_minutes))
+    base, extra = divmod(minutes, n)
+    return [base + 1] * extra + [base] * (n - extra)
+
+
+def schedule_windows(tasks: Iterable[Task], free: Iterable[Interval], busy: Iterable[Interval] = (),
+                     focus_minutes: int = 25, break_minutes: int = 5,
+                     long_break_minutes: int = 15, long_break_every: int = 4) -> WindowPlan:
+    """Place prioritized tasks into Pomodoro slots across the free time.
+
+    Tasks are taken in the given order (run prioritize_tasks first), so the
+    most important ones get the earliest slots; later, shorter tasks fill
+    gaps left in earlier slots. A task longer than a slot is split into
+    "(part i/n)" blocks in slot order. A task that cannot be placed whole
+    goes to unscheduled and takes no slot time.
+    Accepts a List[Task] or a TaskTable.
+    """
+    windows = free_windows(free, busy)
+    slots, breaks = pomodoro_slots(windows, focus_minutes, break_minutes,
+                                   long_break_minutes, long_break_every)
+    index = SlotIndex([end - start for start, end in slots])
+    plan = WindowPlan(breaks=[ScheduledBlock(start, end, "Break") for start, end in breaks])
+
+    for task in tasks:
+        parts = split_minutes(task.estimated_minutes, focus_minutes)
+        placed = []
+        lo = 0
+        for need in parts:
+            i = index.first_fit(need, lo)
+            if i < 0:
+                break
+            placed.append((i, need))
+            index.take(i, need)
+            lo = i + 1
+        if len(placed) < len(parts):
+            for i, need in placed:
+                index.take(i, -need)
+            plan.unscheduled.append(task)
+            continue
+
+        for n, (i, need) in enumerate(placed, 1):
+            start = slots[i][1] - index.capacity(i) - need
+            title = task.title if len(placed) == 1 else f"{task.title} (part {n}/{len(placed)})"
+            plan.blocks.append(ScheduledBlock(start_minute=start, end_minute=start + need,
+                                              task_title=title))
+
+    plan.blocks.sort(key=lambda block: block.start_minute)
+    return plan
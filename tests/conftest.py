@@ -0,0 +1,13 @@
+"""
+Focus Buddy tests; run `python -m pytest tests` from the repository root.
+
+The agent modules live in src/ and import each other by bare name, so that
+directory is put on sys.path here (as benchmarks/__init__.py does).
+"""
+
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
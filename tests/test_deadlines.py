@@ -0,0 +1,69 @@
+"""Deadline resolution and deadline-first ordering."""
+
+from datetime import date, datetime
+
+import pytest
+
+from deadlines import DeadlineResolver, resolve_deadline, urgency_key
+from tools import Task, prioritize_tasks
+
+# A Wednesday morning
+NOW = datetime(2026, 10, 14, 9, 30)
+
+
+@pytest.mark.parametrize("token, due", [
+    ("today", datetime(2026, 10, 14, 17, 0)),
+    ("EOD.", datetime(2026, 10, 14, 17, 0)),
+    ("tonight", datetime(2026, 10, 14, 23, 59)),
+    ("tomorrow", datetime(2026, 10, 15, 17, 0)),
+    ("wednesday", datetime(2026, 10, 14, 17, 0)),
+    ("Fri", datetime(2026, 10, 16, 17, 0)),
+    ("monday", datetime(2026, 10, 19, 17, 0)),
+    ("5pm", datetime(2026, 10, 14, 17, 0)),
+    ("12am", datetime(2026, 10, 14, 0, 0)),
+    ("14:45", datetime(2026, 10, 14, 14, 45)),
+    ("2026-11-02", datetime(2026, 11, 2, 17, 0)),
+    ("12/25", datetime(2026, 12, 25, 17, 0)),
+    ("1/5", datetime(2027, 1, 5, 17, 0)),
+    ("asap", NOW),
+    ("someday", None),
+    ("2/30", None),
+    ("25:00", None),
+    ("", None),
+])
+def test_resolve_deadline(token, due):
+    assert resolve_deadline(token, NOW) == due
+
+
+def test_resolver_memoizes_parsed_tokens():
+    resolver = DeadlineResolver(date(2026, 10, 14))
+    first = resolver.resolve("10/31")
+    assert resolver.resolve("10/31.") is first
+    assert resolver._parsed == 1
+
+
+def test_urgency_key_orders_by_due_time_or_slack():
+    soon = datetime(2026, 10, 14, 10, 30)
+    later = datetime(2026, 10, 14, 11, 0)
+    assert urgency_key(soon, 60, "edf", NOW) < urgency_key(later, 5, "edf", NOW)
+    # 60 min of work due in 60 min has no slack; 5 min due in 90 has 85
+    assert urgency_key(soon, 60, "slack", NOW) == (0, 0.0)
+    assert urgency_key(later, 5, "slack", NOW) == (0, 85 * 60.0)
+    assert urgency_key(later, 200, "slack", NOW) < urgency_key(soon, 60, "slack", NOW)
+    assert urgency_key(None, 5, "edf", NOW) > urgency_key(datetime(2030, 1, 1), 5, "edf", NOW)
+
+
+def test_prioritize_tasks_deadline_orders():
+    tasks = [Task(title="Plain urgent task", estimated_minutes=5),
+             Task(title="Report", deadline="5pm", estimated_minutes=420),
+             Task(title="Call", deadline="2pm", estimated_minutes=15),
+             Task(title="Slides", deadline="friday", estimated_minutes=30)]
+
+    def titles(order):
+        return [t.title for t in prioritize_tasks(list(tasks), order=order, now=NOW)]
+
+    assert titles("score")[0] == "Plain urgent task"
+    assert titles("edf") == ["Call", "Report", "Slides", "Plain urgent task"]
+    assert titles("slack") == ["Report", "Call", "Slides", "Plain urgent task"]
+    with pytest.raises(ValueError):
+        prioritize_tasks(tasks, order="fifo")
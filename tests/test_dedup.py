@@ -0,0 +1,51 @@
+"""Near-duplicate task merging."""
+
+import pytest
+
+import main
+from dedup import duplicate_groups, dedupe_tasks
+from tools import Task
+
+
+@pytest.mark.parametrize("a, b", [
+    ("Write unit tests for auth module", "Write unit tests for billing module"),
+    ("Email Bob about invoice", "Email Rob about invoice"),
+    ("Deploy auth service", "Deploy billing service"),
+    ("Reply to 3 emails", "Reply to 5 emails"),
+    ("Review PR #12", "Review PR #13"),
+])
+def test_different_tasks_are_kept_apart(a, b):
+    assert duplicate_groups([a, b]) == [[0], [1]]
+
+
+@pytest.mark.parametrize("a, b", [
+    ("Fix login bug", "fix the login bug."),
+    ("Update release note", "update release notes!"),
+    ("Prepare Q4 roadmap", "Prepare Q4 raodmap"),
+])
+def test_rewordings_are_merged(a, b):
+    assert duplicate_groups([a, b]) == [[0, 1]]
+
+
+def test_lsh_path_keeps_near_misses_apart():
+    # Enough titles that candidates come from LSH buckets, not all pairs
+    titles = [f"Write unit tests for module {i}" for i in range(100)]
+    titles += ["Email Bob about invoice", "Email Rob about invoice", "email bob about the invoice"]
+    groups = duplicate_groups(titles)
+    assert [100, 102] in groups
+    assert [101] in groups
+
+
+def test_merged_task_keeps_longest_estimate():
+    tasks = [Task(title="Fix login bug", estimated_minutes=10),
+             Task(title="fix the login bug.", estimated_minutes=30)]
+    assert dedupe_tasks(tasks) == [Task(title="Fix login bug", estimated_minutes=30)]
+
+
+def test_dedupe_is_off_unless_configured(monkeypatch):
+    monkeypatch.delenv("FOCUS_BUDDY_DEDUPE", raising=False)
+    assert main.get_dedupe_threshold() == 0
+    monkeypatch.setenv("FOCUS_BUDDY_DEDUPE", "on")
+    assert main.get_dedupe_threshold() == 0.6
+    monkeypatch.setenv("FOCUS_BUDDY_DEDUPE", "0.8")
+    assert main.get_dedupe_threshold() == 0.8
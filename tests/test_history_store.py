@@ -0,0 +1,72 @@
+"""History log, its SQLite index and write backpressure."""
+
+import os
+import time
+
+from history_store import INDEX_NAME, HistoryStore
+from tools import Task, ScheduledBlock
+
+
+class _Clock:
+    def __init__(self):
+        self.now = time.mktime((2026, 10, 5, 9, 0, 0, 0, 0, -1))
+
+    def __call__(self) -> float:
+        self.now += 60
+        return self.now
+
+
+def _record_sessions(store: HistoryStore) -> None:
+    tasks = [Task(title="Write report", estimated_minutes=30), Task(title="Email Sam", estimated_minutes=5)]
+    for n in range(3):
+        store.record_plan("u1", f"s{n}", tasks, [ScheduledBlock(0, 5, "Email Sam")], 25)
+    store.record_completion("u1", "s2", "email sam", 5, actual_minutes=8)
+    store.record_completion("u2", "s9", "Review PRs", 20)
+
+
+def test_queries_see_recorded_plans_and_completions(tmp_path):
+    store = HistoryStore(str(tmp_path), clock=_Clock())
+    _record_sessions(store)
+    store.flush()
+
+    assert store.carried_over("u1") == [{"title": "Write report", "sessions": 3,
+                                         "first_day": "2026-10-05", "last_day": "2026-10-05"}]
+    assert store.estimate_accuracy("u1") == [{"user_id": "u1", "completions": 1, "estimated_minutes": 5,
+                                              "actual_minutes": 8, "ratio": 1.6}]
+    assert store.timed_completions() == [("u1", "email sam", 8)]
+    store.close()
+
+
+def test_index_is_rebuilt_from_the_log(tmp_path):
+    store = HistoryStore(str(tmp_path), clock=_Clock())
+    _record_sessions(store)
+    store.flush()
+    before = (store.carried_over("u1"), store.completions("u1"), store.completions("u2"))
+    store.close()
+
+    os.remove(tmp_path / INDEX_NAME)
+    reopened = HistoryStore(str(tmp_path))
+    assert reopened.completions("u1") == []
+    assert reopened.rebuild_index() == 5
+    assert (reopened.carried_over("u1"), reopened.completions("u1"), reopened.completions("u2")) == before
+    # Rebuilding again replaces the index rather than adding to it
+    assert reopened.rebuild_index() == 5
+    assert len(reopened.completions("u1")) == 1
+    reopened.close()
+
+
+def test_recording_does_not_block_when_the_writer_falls_behind(tmp_path):
+    store = HistoryStore(str(tmp_path), flush_interval=0, max_pending=2)
+    with store._db_lock:
+        # The writer takes the first record and then waits for the index lock
+        store.record_completion("u1", "s1", "Task 0", 5)
+        while store._pending.qsize():
+            time.sleep(0.001)
+        start = time.monotonic()
+        for i in range(1, 6):
+            store.record_completion("u1", "s1", f"Task {i}", 5)
+        assert time.monotonic() - start < 0.5
+        assert store.dropped == 3
+    store.flush()
+    assert len(store.completions("u1")) == 3
+    store.close()
@@ -0,0 +1,68 @@
+"""IncrementalPlanner against re-planning from scratch."""
+
+import random
+
+import pytest
+
+from incremental_planner import IncrementalPlanner, _block_key
+from pipeline import apply_energy
+from tools import Task, ScheduledBlock, create_focus_schedule, prioritize_tasks
+
+
+def _recomputed(pending, available_minutes: int, now: int, energy: str):
+    """The schedule suffix a full re-plan from minute `now` gives."""
+    blocks = create_focus_schedule(apply_energy(prioritize_tasks(list(pending)), energy),
+                                   available_minutes - now)
+    return [ScheduledBlock(b.start_minute + now, b.end_minute + now, b.task_title) for b in blocks]
+
+
+def _apply(schedule, diff):
+    removed = {_block_key(b) for b in diff.removed}
+    return sorted([b for b in schedule if _block_key(b) not in removed] + diff.added,
+                  key=lambda b: b.start_minute)
+
+
+@pytest.mark.parametrize("energy", ["medium", "low"])
+@pytest.mark.parametrize("seed", range(10))
+def test_changes_match_a_full_recompute(seed, energy):
+    rng = random.Random(seed)
+    counter = iter(range(10_000))
+
+    def new_task():
+        return Task(title=f"Task {next(counter)}" + rng.choice(["", " urgent", " review"]),
+                    estimated_minutes=rng.choice((5, 10, 15, 20, 30)),
+                    deadline=rng.choice(["", "", "today", "tomorrow"]))
+
+    pending = [new_task() for _ in range(rng.randint(3, 12))]
+    available = rng.choice((45, 90, 120))
+    planner = IncrementalPlanner(pending, available, energy=energy)
+    assert planner.schedule == _recomputed(pending, available, 0, energy)
+
+    for _ in range(15):
+        before = planner.schedule
+        op = rng.random()
+        if op < 0.4 and pending:
+            task = rng.choice(pending)
+            pending.remove(task)
+            actual = rng.choice((None, 3, 25))
+            diff = planner.complete(task.title, actual)
+        elif op < 0.7:
+            added = [new_task() for _ in range(rng.randint(1, 3))]
+            pending.extend(added)
+            diff = planner.insert_many(added)
+        elif pending:
+            task = rng.choice(pending)
+            diff = planner.update_duration(task.title, rng.choice((5, 10, 40)))
+        else:
+            continue
+
+        assert planner.schedule[len(planner.completed):] == _recomputed(
+            pending, available, planner.now, energy)
+        assert _apply(before, diff) == sorted(planner.schedule, key=lambda b: b.start_minute)
+
+
+def test_completing_an_unknown_task_raises():
+    planner = IncrementalPlanner([Task(title="Review PRs", estimated_minutes=20)], 25)
+    planner.complete("review prs")
+    with pytest.raises(KeyError):
+        planner.complete("Review PRs")
@@ -0,0 +1,99 @@
+"""Session tools in main.py, run without the model."""
+
+import asyncio
+import random
+from types import SimpleNamespace
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    """A fresh history store and duration estimator for the test."""
+    monkeypatch.setenv("FOCUS_BUDDY_HISTORY", str(tmp_path / "history"))
+    main.get_history_store.cache_clear()
+    main.get_duration_estimator.cache_clear()
+    store = main.get_history_store()
+    yield store
+    store.close()
+    main.get_history_store.cache_clear()
+    main.get_duration_estimator.cache_clear()
+
+
+def test_completing_a_task_twice_records_it_once(history):
+    main.plan_locally("- Review PRs 20 min\n- Email Sam 5 min", 60, "u1", "s1")
+
+    first = main.complete_task("u1", "s1", "Review PRs", actual_minutes=30)
+    second = main.complete_task("u1", "s1", "review prs", actual_minutes=30)
+
+    assert first.startswith("Marked 'Review PRs' done")
+    assert second == "'Review PRs' is already marked done."
+    assert len(main.session_store.get("u1", "s1")["completed"]) == 1
+    history.flush()
+    assert len(history.completions("u1")) == 1
+    # Learned once: one more observation is needed before it is trusted
+    assert main.get_duration_estimator().estimate("u1", "Review PRs") is None
+
+
+def test_completing_before_a_plan_exists_is_also_counted_once(history):
+    main.session_store.reset("u2", "s2")
+    memory = main.session_store.get("u2", "s2")
+    memory["tasks"] = main.parse_tasks("- Write report 30 min")
+
+    assert main.complete_task("u2", "s2", "Write report").startswith("Marked")
+    assert main.complete_task("u2", "s2", "Write report") == "'Write report' is already marked done."
+    assert len(memory["completed"]) == 1
+
+
+def _context(user_id: str, session_id: str):
+    """Stand-in for the ToolContext ADK hands to a tool: only .session is used."""
+    return SimpleNamespace(session=SimpleNamespace(user_id=user_id, id=session_id))
+
+
+def test_concurrent_sessions_do_not_share_tasks():
+    rng = random.Random(0)
+
+    async def one_session(n: int):
+        user_id, session_id = f"user-{n % 7}", f"isolation-{n}"
+        ctx = _context(user_id, session_id)
+        main.session_store.reset(user_id, session_id)
+        titles = [f"Task {n}.{i}" for i in range(rng.randint(1, 6))]
+
+        # Yield between the tool calls so the sessions interleave
+        main.parse_tasks_tool("\n".join(f"- {t} 5 min" for t in titles), ctx)
+        await asyncio.sleep(rng.random() / 1000)
+        main.prioritize_tasks_tool(ctx)
+        await asyncio.sleep(rng.random() / 1000)
+        main.create_schedule_tool(ctx, available_minutes=60)
+        await asyncio.sleep(rng.random() / 1000)
+
+        memory = main.session_store.get(user_id, session_id)
+        return (set(titles), {t.title for t in memory["tasks"]},
+                {block.task_title for block in memory["current_focus_plan"]})
+
+    async def run_all():
+        return await asyncio.gather(*(one_session(n) for n in range(200)))
+
+    for titles, tasks, planned in asyncio.run(run_all()):
+        assert tasks == titles
+        assert planned == titles
+
+
+def test_reparsing_drops_the_previous_plan():
+    ctx = _context("u1", "reparse")
+    main.session_store.reset("u1", "reparse")
+    main.parse_tasks_tool("- Review PRs 20 min\n- Email Sam 5 min", ctx)
+    main.prioritize_tasks_tool(ctx)
+    main.create_schedule_tool(ctx, available_minutes=60)
+    main.update_task_minutes("u1", "reparse", "Email Sam", 10)
+
+    main.parse_tasks_tool("- Write docs 30 min", ctx)
+
+    memory = main.session_store.get("u1", "reparse")
+    assert memory["current_focus_plan"] is None
+    assert main.update_task_minutes("u1", "reparse", "Review PRs", 5).startswith("No plan yet")
+    assert main.add_tasks("u1", "reparse", "- Plan sprint 15 min").startswith("No plan yet")
+    main.create_schedule_tool(ctx, available_minutes=60)
+    assert [b.task_title for b in memory["current_focus_plan"]] == ["Write docs"]
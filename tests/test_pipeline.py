@@ -0,0 +1,35 @@
+"""Local planning pipeline and the agent prompt built from it."""
+
+import main
+from pipeline import build_focus_plan, describe_rest, describe_shortlist, shortlist_tasks
+
+BACKLOG = "\n".join(f"- Task number {i} {5 + i % 4 * 5} min" for i in range(30))
+
+
+def test_shortlist_text_plans_only_the_shortlisted_tasks():
+    shortlist = shortlist_tasks(BACKLOG, top_k=5)
+    plan = build_focus_plan(describe_shortlist(shortlist), available_minutes=120)
+
+    assert shortlist.rest_count == 25
+    assert [task.title for task in plan.tasks] == [task.title for task in shortlist.tasks]
+    assert not any("can wait" in block.task_title for block in plan.schedule)
+
+
+def test_agent_prompt_keeps_the_rest_count_out_of_the_task_list():
+    shortlist = shortlist_tasks(BACKLOG, top_k=5)
+    note = describe_rest(shortlist)
+    prompt = main.agent_prompt(describe_shortlist(shortlist), 60, "medium", note)
+
+    # The task list is everything between the opening and closing paragraphs
+    paragraphs = prompt.split("\n\n")
+    task_list = "\n\n".join(paragraphs[1:-1])
+    assert note not in task_list
+    assert note in paragraphs[-1]
+    plan = build_focus_plan(task_list, available_minutes=60)
+    assert [task.title for task in plan.tasks] == [task.title for task in shortlist.tasks]
+
+
+def test_no_rest_sentence_without_a_rest():
+    shortlist = shortlist_tasks(BACKLOG, top_k=0)
+    assert describe_rest(shortlist) == ""
+    assert main.agent_prompt("- Task 5 min", 25).endswith("- Task 5 min\n\nPlease create my focus plan.")
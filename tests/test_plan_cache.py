@@ -0,0 +1,59 @@
+"""Plan cache keys, expiry, eviction and persistence."""
+
+from plan_cache import PlanCache, plan_key
+from tools import Task
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_plan_key_ignores_order_case_and_spacing():
+    a = [Task(title="Review PRs", estimated_minutes=20), Task(title="Email  Sam", deadline="Today")]
+    b = [Task(title="email sam", deadline="today"), Task(title="review prs.", estimated_minutes=20)]
+    assert plan_key(a, 25) == plan_key(b, 25)
+    assert plan_key(a, 25) != plan_key(a, 30)
+    assert plan_key(a, 25) != plan_key(a, 25, energy="low")
+
+
+def test_entries_expire_after_the_ttl():
+    clock = _Clock()
+    cache = PlanCache(ttl_seconds=60, clock=clock)
+    cache.put("k", "plan")
+    clock.now += 60
+    assert cache.get("k") == "plan"
+    clock.now += 1
+    assert cache.get("k") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 1, "size": 0}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PlanCache(max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+    cache.put("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_plans_are_reloaded_from_sqlite(tmp_path):
+    path = str(tmp_path / "plans.db")
+    clock = _Clock()
+    cache = PlanCache(max_entries=2, ttl_seconds=60, path=path, clock=clock)
+    for key in ("a", "b", "c"):
+        cache.put(key, f"plan {key}")
+    cache.close()
+
+    reopened = PlanCache(max_entries=2, ttl_seconds=60, path=path, clock=clock)
+    assert reopened.get("a") is None
+    assert reopened.get("b") == "plan b"
+    assert reopened.get("c") == "plan c"
+    clock.now += 61
+    assert reopened.get("c") is None
+    reopened.close()
@@ -0,0 +1,49 @@
+"""Keyword automaton and priority scores."""
+
+import random
+
+from scoring import KeywordAutomaton, PriorityScorer, default_scorer
+from tools import Task
+
+
+def _naive_scan(keywords, text: str) -> int:
+    found = 0
+    for word, mask in keywords.items():
+        if word and word in text:
+            found |= mask
+    return found
+
+
+def test_automaton_matches_a_substring_scan():
+    rng = random.Random(0)
+    alphabet = "abcs he"
+    for _ in range(200):
+        keywords = {"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))): 1 << rng.randrange(6)
+                    for _ in range(rng.randint(1, 8))}
+        automaton = KeywordAutomaton(keywords)
+        for _ in range(20):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+            assert automaton.scan(text) == _naive_scan(keywords, text), (keywords, text)
+
+
+def test_overlapping_keywords_are_all_found():
+    automaton = KeywordAutomaton({"he": 1, "she": 2, "hers": 4, "his": 8})
+    assert automaton.scan("ushers") == 1 | 2 | 4
+    assert automaton.scan("this") == 8
+
+
+def test_scores_combine_deadline_duration_and_keywords():
+    # urgent deadline 30 + quick win 5 + "important" group 15 (once for two keywords)
+    assert default_scorer.score(Task(title="Urgent critical fix", deadline="today",
+                                     estimated_minutes=5)) == 50.0
+    assert default_scorer.score(Task(title="Review docs", deadline="tomorrow",
+                                     estimated_minutes=15)) == 20.0 + 2.0 + 3.0
+    assert default_scorer.score(Task(title="Write report", deadline="Friday",
+                                     estimated_minutes=60)) == 10.0
+
+
+def test_custom_keyword_groups():
+    scorer = PriorityScorer({"money": (7.5, ("Invoice", "billing")), "people": (1.0, ("hire",))})
+    assert scorer.title_score("Send INVOICE for billing") == 7.5
+    assert scorer.title_score("Hire billing lead") == 8.5
+    assert scorer.title_score("Plan offsite") == 0.0
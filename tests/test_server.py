@@ -0,0 +1,88 @@
+"""HTTP service status codes, served in-process on a free port."""
+
+import asyncio
+import json
+
+import pytest
+
+import main
+import server
+
+
+def request(raw: bytes, patch=None) -> tuple:
+    """Send raw HTTP bytes to a fresh service; (status, JSON body) of the reply."""
+    async def go():
+        service = server.FocusBuddyService(workers=1)
+        listener = await service.start(port=0)
+        try:
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(raw)
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            headers = {}
+            while (line := await reader.readline()).strip():
+                name, _, value = line.decode().partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = json.loads(await reader.readexactly(int(headers["content-length"])))
+            writer.close()
+            return status, body
+        finally:
+            listener.close()
+            service.close()
+    return asyncio.run(go())
+
+
+def post(path: str, body) -> tuple:
+    data = json.dumps(body).encode()
+    return request(f"POST {path} HTTP/1.1\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data)
+
+
+def test_local_plan():
+    status, body = post("/plan", {"tasks": "- Review PRs 20 min", "present": False})
+    assert status == 200
+    assert body["schedule"][0]["task_title"] == "Review PRs"
+
+
+@pytest.mark.parametrize("body", [
+    {"tasks": "- Review PRs", "available_minutes": "soon"},
+    {"tasks": "- Review PRs", "available_minutes": 0},
+    {"tasks": "- Review PRs", "present": "no"},
+    {"tasks": "- Review PRs", "user_id": ["u1"]},
+])
+def test_bad_plan_fields_are_400(body):
+    status, _ = post("/plan", body)
+    assert status == 400
+
+
+def test_bad_adjust_items_are_400_and_change_nothing():
+    post("/plan", {"tasks": "- Review PRs 20 min", "present": False, "session_id": "s-adjust"})
+    status, _ = post("/adjust", {"session_id": "s-adjust",
+                                 "completed": [{"title": "Review PRs"}],
+                                 "updated": [{"title": "Review PRs"}]})
+    assert status == 400
+    assert main.session_store.get("focus_user", "s-adjust")["completed"] == []
+
+
+def test_bad_content_length_is_400():
+    status, _ = request(b"POST /plan HTTP/1.1\r\nContent-Length: lots\r\n\r\n")
+    assert status == 400
+
+
+def test_internal_errors_are_500(monkeypatch):
+    def fail(*args):
+        raise KeyError("task_index")
+    monkeypatch.setattr(main, "plan_locally", fail)
+    status, body = post("/plan", {"tasks": "- Review PRs", "present": False})
+    assert status == 500
+    assert body == {"error": "internal server error"}
+
+
+def test_model_errors_are_502(monkeypatch):
+    async def fail(*args):
+        raise RuntimeError("model unavailable")
+    monkeypatch.setattr(main, "prepare_run", lambda *args: (None, "prompt", None))
+    monkeypatch.setattr(main, "run_prompt", fail)
+    status, body = post("/plan", {"tasks": "- Review PRs", "session_id": "s-model"})
+    assert status == 502
+    assert "model unavailable" in body["error"]
@@ -0,0 +1,84 @@
+"""Session expiry and eviction order."""
+
+import asyncio
+
+import pytest
+
+from session_manager import SUMMARY_PREFIX, SessionManager
+from session_store import SessionStore
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _SessionService:
+    async def get_session(self, **ids):
+        return None
+
+
+class _Runner:
+    app_name = "test"
+    session_service = _SessionService()
+
+
+def test_a_long_run_does_not_shield_idle_sessions_from_expiry():
+    clock = _Clock()
+    manager = SessionManager(SessionStore(), ttl_seconds=10, clock=clock)
+
+    async def scenario():
+        manager.touch("u", "a")
+        async with manager.use(_Runner(), "u", "long"):
+            clock.now = 1
+            manager.touch("u", "b")
+            clock.now = 20
+        clock.now = 25
+        await manager.sweep()
+
+    asyncio.run(scenario())
+    # "a" and "b" have been idle for longer than the TTL; the long run ended at 20
+    assert len(manager) == 1
+    assert manager.stats()["evicted_ttl"] == 2
+    assert manager.stats()["in_use"] == 0
+
+
+def test_compaction_through_the_adk_session_service():
+    pytest.importorskip("google.adk")
+    from google.adk.events import Event
+    from google.adk.sessions import InMemorySessionService
+    from google.genai import types
+
+    class AdkRunner:
+        app_name = "test"
+        session_service = InMemorySessionService()
+
+    runner = AdkRunner()
+    manager = SessionManager(SessionStore(), keep_turns=2)
+    ids = dict(app_name="test", user_id="u", session_id="s")
+
+    async def scenario():
+        service = runner.session_service
+        session = await service.create_session(state={"focus": "write"}, **ids)
+        for turn in range(5):
+            for author, role in (("user", "user"), ("presenter", "model")):
+                await service.append_event(session, Event(
+                    invocation_id=f"i{turn}", author=author,
+                    content=types.Content(role=role, parts=[types.Part(text=f"{author} {turn}")])))
+        async with manager.use(runner, "u", "s"):
+            pass
+        return await service.get_session(**ids)
+
+    session = asyncio.run(scenario())
+
+    texts = [event.content.parts[0].text for event in session.events]
+    assert texts[0].splitlines() == [
+        SUMMARY_PREFIX, "User: user 0", "Assistant: presenter 0", "User: user 1",
+        "Assistant: presenter 1", "User: user 2", "Assistant: presenter 2"]
+    assert texts[1:] == ["user 3", "presenter 3", "user 4", "presenter 4"]
+    assert session.state["focus"] == "write"
+    assert manager.compacted_events == 6
+    assert manager.stats()["resident_bytes"] == len(session.model_dump_json())
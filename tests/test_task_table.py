@@ -0,0 +1,55 @@
+"""TaskTable against the list-based functions in tools.py."""
+
+import random
+from datetime import datetime
+
+import pytest
+
+from task_table import TaskTable
+from tools import Task, create_focus_schedule, prioritize_tasks
+
+TITLES = ("Review PRs", "Fix urgent bug", "Email Sam", "Write docs", "Plan sprint",
+          "Deploy service", "Reply to client asap")
+DEADLINES = ("", "", "today", "tomorrow", "Friday", "2026-10-20", "next week", "3pm", "asap", "10/1")
+
+
+def make_tasks(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [Task(title=rng.choice(TITLES), deadline=rng.choice(DEADLINES),
+                 estimated_minutes=rng.choice((5, 10, 15, 30, 60)))
+            for _ in range(n)]
+
+
+def _rows(tasks):
+    return [(t.title, t.deadline, t.estimated_minutes, t.priority_score) for t in tasks]
+
+
+@pytest.mark.parametrize("order", ["score", "edf", "slack"])
+@pytest.mark.parametrize("seed", range(5))
+def test_prioritized_matches_prioritize_tasks(seed, order):
+    now = datetime(2026, 10, 14, 9, 30)
+    tasks = make_tasks(300, seed)
+    table = TaskTable.from_tasks(tasks)
+    assert (_rows(prioritize_tasks(table, order=order, now=now))
+            == _rows(prioritize_tasks(tasks, order=order, now=now)))
+
+
+def test_schedule_from_a_table_matches_the_list():
+    tasks = make_tasks(50)
+    table = prioritize_tasks(TaskTable.from_tasks(tasks))
+    for strategy in ("greedy", "optimal"):
+        assert (create_focus_schedule(table, 60, strategy=strategy)
+                == create_focus_schedule(prioritize_tasks(tasks), 60, strategy=strategy))
+
+
+def test_argsort_is_stable_and_views_share_columns():
+    table = TaskTable.from_tasks(make_tasks(20))
+    order = table.argsort(table.minutes)
+    expected = sorted(range(len(table)), key=lambda i: table.minutes[i])
+    assert list(order) == expected
+
+    view = table.take(reversed(range(len(table))))
+    assert [row.title for row in view] == [row.title for row in table][::-1]
+    view[0].priority_score = 99.0
+    assert table[len(table) - 1].priority_score == 99.0
+    assert view[2:5].to_tasks() == table.to_tasks()[::-1][2:5]
@@ -0,0 +1,45 @@
+"""Prose and compact tool outputs and the token budget."""
+
+from tool_output import (ToolOutputConfig, format_parsed, format_prioritized, format_schedule,
+                         task_index)
+from tools import Task, ScheduledBlock
+from tracing import estimate_tokens
+
+COMPACT = ToolOutputConfig(compact=True)
+PROSE = ToolOutputConfig()
+
+TASKS = [Task(title="Review PRs", estimated_minutes=20),
+         Task(title="Email Sam", deadline="today", estimated_minutes=5),
+         Task(title="Write docs", estimated_minutes=30)]
+
+
+def test_compact_parsed_lists_every_field():
+    assert format_parsed(TASKS, COMPACT) == (
+        "tasks=3 (n|title|min|due)\n1|Review PRs|20|\n2|Email Sam|5|today\n3|Write docs|30|\n")
+
+
+def test_compact_outputs_refer_to_tasks_by_number():
+    index = task_index(TASKS)
+    prioritized = [TASKS[1], TASKS[0], TASKS[2]]
+    assert format_prioritized(prioritized, index, COMPACT) == "order=2,1,3\n"
+    schedule = [ScheduledBlock(0, 5, "Email Sam"), ScheduledBlock(5, 25, "Review PRs"),
+                ScheduledBlock(25, 30, "Write docs (partial)")]
+    assert format_schedule(schedule, 30, index, COMPACT) == (
+        "plan=30min blocks=3 (start-end|task)\n0-5|#2\n5-25|#1\n25-30|#3|partial\n")
+
+
+def test_compact_is_shorter_than_prose():
+    tasks = [Task(title=f"Task number {i}", estimated_minutes=10) for i in range(50)]
+    assert estimate_tokens(format_parsed(tasks, COMPACT)) < estimate_tokens(format_parsed(tasks, PROSE))
+
+
+def test_token_budget_summarizes_the_tail():
+    tasks = [Task(title=f"Task number {i}", estimated_minutes=10) for i in range(100)]
+    for compact in (False, True):
+        text = format_parsed(tasks, ToolOutputConfig(compact=compact, token_budget=50))
+        lines = text.splitlines()
+        kept = len(lines) - 2
+        assert 0 < kept < 100
+        assert lines[-1] == f"+{100 - kept} more tasks ({(100 - kept) * 10} min total)"
+        header, body = lines[0], lines[1:-1]
+        assert estimate_tokens(header) + sum(estimate_tokens(line) + 1 for line in body) <= 50
@@ -0,0 +1,82 @@
+"""Parsing, prioritizing and scheduling in tools.py."""
+
+import io
+import random
+
+import pytest
+
+from tools import (_BULLET_RE, Task, _parse_line, _parse_line_multipass, create_focus_schedule,
+                   parse_tasks, parse_tasks_iter, prioritize_tasks)
+
+# Pieces of task lines, including ones that make the single scan fall back
+WORDS = ("Review", "PRs", "email", "due", "by", "deadline:", "due:", "Friday", "today",
+         "30min", "1hr", "2 hours", "15 min", "d5minue", "by 3hr", "due 10min", "-", ",", "min")
+
+
+def _multipass(line: str):
+    line = line.strip()
+    bullet = _BULLET_RE.match(line)
+    return _parse_line_multipass(line[bullet.end():] if bullet else line)
+
+
+@pytest.mark.parametrize("line", [
+    "- Review PRs 30min due: Friday",
+    "* Email team, 1hr",
+    "3. Write report deadline today 2 hours",
+    "d5minue something",
+    "Pay rent by 15min",
+    "   ",
+])
+def test_single_pass_parser_matches_the_multipass_parser(line):
+    assert _parse_line(line) == _multipass(line)
+
+
+def test_single_pass_parser_matches_the_multipass_parser_on_random_lines():
+    rng = random.Random(0)
+    for _ in range(5_000):
+        line = rng.choice(("", "- ", "* ", "1. ")) + " ".join(
+            rng.choice(WORDS) for _ in range(rng.randint(1, 7)))
+        assert _parse_line(line) == _multipass(line), line
+
+
+def test_parse_tasks_iter_matches_parse_tasks():
+    text = "- Review PRs 30min\n\n* Email team due: Friday\n3. Plan sprint 1hr\nno time here\n"
+    assert list(parse_tasks_iter(io.StringIO(text))) == parse_tasks(text)
+    assert [t.estimated_minutes for t in parse_tasks(text, lambda title: 7)] == [30, 7, 60, 7]
+
+
+def _total_score(schedule, tasks) -> float:
+    scores = {task.title: task.priority_score for task in tasks}
+    return sum(scores[b.task_title] for b in schedule if not b.task_title.endswith("(partial)"))
+
+
+def test_optimal_keeps_the_critical_task_over_several_chores():
+    tasks = prioritize_tasks(parse_tasks(
+        "- Fix critical prod outage 20 min due today\n"
+        + "\n".join(f"- Chore {i} 5 min" for i in range(5))))
+
+    for strategy in ("greedy", "optimal"):
+        schedule = create_focus_schedule(tasks, 25, strategy=strategy)
+        assert schedule[0].task_title == "Fix critical prod outage"
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_optimal_never_scores_below_greedy(seed):
+    rng = random.Random(seed)
+    tasks = prioritize_tasks([
+        Task(title=f"Task {i}" + rng.choice(["", " urgent", " review"]),
+             estimated_minutes=rng.choice((5, 10, 15, 20, 30, 45)),
+             deadline=rng.choice(["", "", "today", "tomorrow"]))
+        for i in range(rng.randint(1, 15))])
+    minutes = rng.choice((15, 25, 60))
+
+    greedy = create_focus_schedule(tasks, minutes)
+    optimal = create_focus_schedule(tasks, minutes, strategy="optimal")
+
+    assert _total_score(optimal, tasks) >= _total_score(greedy, tasks)
+    top = next((task for task in tasks if task.estimated_minutes <= minutes), None)
+    if top is None:
+        assert optimal == []
+    else:
+        assert optimal[0].task_title == top.title
+        assert optimal[-1].end_minute <= minutes
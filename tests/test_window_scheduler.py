@@ -0,0 +1,69 @@
+"""Multi-window scheduling around busy time."""
+
+import random
+
+import pytest
+
+from tools import Task
+from window_scheduler import (SlotIndex, free_windows, merge_intervals, pomodoro_slots,
+                              schedule_windows, split_minutes)
+
+
+def test_merge_and_subtract_intervals():
+    assert merge_intervals([(50, 60), (0, 10), (5, 20), (20, 30), (40, 40)]) == [(0, 30), (50, 60)]
+    assert free_windows([(0, 480)], [(60, 90), (80, 120), (470, 500)]) == [(0, 60), (120, 470)]
+    assert free_windows([(0, 60), (100, 200)], [(0, 60), (150, 160)]) == [(100, 150), (160, 200)]
+
+
+def test_pomodoro_slots_with_a_long_break():
+    slots, breaks = pomodoro_slots([(0, 130), (200, 212)])
+    assert slots == [(0, 25), (30, 55), (60, 85), (90, 115), (200, 212)]
+    assert breaks == [(25, 30), (55, 60), (85, 90)]
+
+
+def test_split_minutes():
+    assert split_minutes(52, 25) == [18, 17, 17]
+    assert split_minutes(25, 25) == [25]
+    assert split_minutes(3, 25) == [3]
+
+
+def test_slot_index_first_fit_matches_a_linear_scan():
+    rng = random.Random(0)
+    capacities = [rng.randint(0, 25) for _ in range(37)]
+    index = SlotIndex(capacities)
+    for _ in range(500):
+        need, lo = rng.randint(1, 25), rng.randrange(40)
+        expected = next((i for i in range(lo, len(capacities)) if capacities[i] >= need), -1)
+        assert index.first_fit(need, lo) == expected
+        if expected >= 0:
+            index.take(expected, need)
+            capacities[expected] -= need
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_blocks_fit_in_slots_and_every_task_is_accounted_for(seed):
+    rng = random.Random(seed)
+    free = [(day * 1440 + 540, day * 1440 + 1020) for day in range(3)]
+    busy = [(start, start + rng.choice((30, 60)))
+            for start in (day * 1440 + rng.randrange(540, 1000) for day in range(3) for _ in range(2))]
+    tasks = [Task(title=f"Task {i}", estimated_minutes=rng.choice((5, 10, 20, 40, 90, 600)))
+             for i in range(60)]
+
+    plan = schedule_windows(tasks, free, busy)
+    slots, _ = pomodoro_slots(free_windows(free, busy))
+
+    for a, b in zip(plan.blocks, plan.blocks[1:]):
+        assert a.end_minute <= b.start_minute
+    for block in plan.blocks:
+        assert any(start <= block.start_minute and block.end_minute <= end for start, end in slots)
+        assert not any(s < block.end_minute and block.start_minute < e for s, e in busy)
+
+    minutes = {}
+    for block in plan.blocks:
+        title = block.task_title.split(" (part ")[0]
+        minutes[title] = minutes.get(title, 0) + block.end_minute - block.start_minute
+    unscheduled = {task.title for task in plan.unscheduled}
+    for task in tasks:
+        assert (task.title in unscheduled) != (task.title in minutes)
+        if task.title in minutes:
+            assert minutes[task.title] == task.estimated_minutes